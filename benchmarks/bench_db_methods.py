@@ -0,0 +1,70 @@
+"""Latency, query count and peak memory of every db_methods query on synthetic data.
+
+Run with:  python -m pytest benchmarks/bench_db_methods.py -q -s
+Sizes:     DMS_BENCH_SIZES=small,medium,large   (default small,medium)
+Output:    benchmarks/results/db_methods_<commit>.json; DMS_BENCH_OUTPUT=<dir> writes it there instead
+Compare:   python benchmarks/compare.py old.json new.json
+"""
+import pytest
+
+from benchmarks.harness import get_recorder, measure
+from database import db_methods
+from database.db_config import session_scope
+from models.models import Book, Document
+
+
+def pick_project(dataset):
+    """Middle project of the dataset, with its books and a selection of all its documents."""
+    project_id = (dataset["projects"] + 1) // 2
+    with session_scope() as session:
+        books = session.query(Book).filter(Book.project_id == project_id).order_by(Book.id).all()
+        documents = session.query(Document).join(Book).filter(Book.project_id == project_id)\
+            .order_by(Document.id).all()
+    selected = {book.id: {"book_name": book.name, "documents": []} for book in books}
+    for document in documents:
+        selected[document.book_id]["documents"].append(document)
+    return project_id, books, documents, selected
+
+
+CASES = {
+    "get_all_project_names": lambda p: db_methods.get_all_project_names(),
+    "get_project_by_name": lambda p: db_methods.get_project_by_name(f"Project {p['project_id']:05}"),
+    "get_project_by_id": lambda p: db_methods.get_project_by_id(p["project_id"]),
+    "get_books_by_project": lambda p: db_methods.get_books_by_project(p["project_id"]),
+    "get_documents_by_book": lambda p: db_methods.get_documents_by_book(p["book_id"]),
+    "get_project_books": lambda p: db_methods.get_project_books(p["project_id"]),
+    "get_documents_by_books": lambda p: db_methods.get_documents_by_books(p["book_ids"]),
+    "get_sections_by_project": lambda p: db_methods.get_sections_by_project(p["project_id"]),
+    "get_subsections_by_project": lambda p: db_methods.get_subsections_by_project(p["project_id"]),
+    "get_project_details": lambda p: db_methods.get_project_details(p["project_id"], p["selected"]),
+    "get_document_details": lambda p: db_methods.get_document_details(p["project_id"], p["book_id"],
+                                                                      p["document_id"]),
+    "get_document_details_bulk": lambda p: db_methods.get_document_details_bulk(p["project_id"],
+                                                                                p["document_ids"]),
+    "load_project_snapshot": lambda p: db_methods.load_project_snapshot(p["project_id"]).documents_by_id,
+}
+
+
+@pytest.fixture(scope="session")
+def params(dataset):
+    project_id, books, documents, selected = pick_project(dataset)
+    return {
+        "project_id": project_id,
+        "book_id": books[0].id,
+        "book_ids": [book.id for book in books],
+        "document_id": documents[0].id,
+        "document_ids": [document.id for document in documents],
+        "selected": selected,
+    }
+
+
+@pytest.mark.parametrize("name", list(CASES))
+def test_db_method(name, dataset, params):
+    result = measure(lambda: CASES[name](params), engine=dataset["engine"],
+                     repeat=3 if dataset["size"] == "large" else 5)
+    recorder = get_recorder("db_methods")
+    recorder.metadata["database"] = dataset["engine"].dialect.name
+    recorder.add(name, dataset["size"], documents_in_db=dataset["counts"]["documents"],
+                 documents_in_project=len(params["document_ids"]), **result)
+    print(f"\n {dataset['size']:>6} {name:<28} {result['median_ms']:>9.2f} ms "
+          f"{result['queries']:>5} queries {result['peak_kib']:>9.1f} KiB")
@@ -0,0 +1,117 @@
+"""Offscreen construction benchmarks for the heavy dialogs, built from synthetic in-memory data.
+
+Run with:  python -m pytest benchmarks/bench_ui.py -q -s
+Rows:      DMS_UI_BENCH_ROWS=100,1000,10000   (default)
+Output:    benchmarks/results/ui_<commit>.json; DMS_BENCH_OUTPUT=<dir> writes it there instead
+"""
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import gc
+import time
+
+import pytest
+
+pytest.importorskip("PyQt6")
+from PyQt6.QtCore import QObject, QEvent
+from PyQt6.QtWidgets import QApplication, QWidget
+
+from benchmarks.generate_data import generate_snapshot, generate_csv_books
+from benchmarks.harness import current_rss_kib, get_recorder
+
+ROWS = [int(rows) for rows in os.getenv("DMS_UI_BENCH_ROWS", "100,1000,10000").split(",") if rows.strip()]
+FIRST_PAINT_TIMEOUT = 120  # Seconds
+
+
+class PaintWatcher(QObject):
+    """Event filter that notes when a widget receives its first paint event."""
+
+    def __init__(self):
+        super().__init__()
+        self.painted = False
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Type.Paint:
+            self.painted = True
+        return False
+
+
+def build_project_window(rows):
+    from views.OpenProject.project_window import ProjectWindow
+    snapshot = generate_snapshot(documents=rows)
+    return lambda: ProjectWindow(snapshot.id, snapshot.book_data(), snapshot=snapshot)
+
+
+def build_choose_documents(rows):
+    from views.OpenProject.choose_documents import ChooseDocuments
+    snapshot = generate_snapshot(documents=rows)
+    return lambda: ChooseDocuments(snapshot.book_data(), snapshot.id, snapshot=snapshot)
+
+
+def build_choose_sections(rows):
+    from views.OpenProject.choose_sections import ChooseSections
+    snapshot = generate_snapshot(documents=rows)
+    return lambda: ChooseSections(snapshot.book_data(), snapshot.id, snapshot=snapshot)
+
+
+def build_create_project_html(rows):
+    from views.CreateProject.create_projecy_html_window import CreateProjectHtml
+    books_data = generate_csv_books(rows=rows)
+    return lambda: CreateProjectHtml(None, "Synthetic Project", books_data)
+
+
+DIALOGS = {
+    "ProjectWindow": build_project_window,
+    "ChooseDocuments": build_choose_documents,
+    "ChooseSections": build_choose_sections,
+    "CreateProjectHtml": build_create_project_html,
+}
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+def measure_dialog(app, build):
+    """Construction time, time to first paint, widget count and RSS growth of one dialog."""
+    gc.collect()
+    rss_before = current_rss_kib()
+
+    started = time.perf_counter()
+    dialog = build()
+    constructed = time.perf_counter()
+
+    watcher = PaintWatcher()
+    dialog.installEventFilter(watcher)
+    dialog.show()
+    while not watcher.painted and time.perf_counter() - constructed < FIRST_PAINT_TIMEOUT:
+        app.processEvents()
+    painted = time.perf_counter()
+
+    result = {
+        "construct_ms": round((constructed - started) * 1000, 1),
+        "first_paint_ms": round((painted - constructed) * 1000, 1),
+        "total_ms": round((painted - started) * 1000, 1),
+        "painted": watcher.painted,
+        "widgets": len(dialog.findChildren(QWidget)) + 1,
+        "rss_delta_kib": current_rss_kib() - rss_before,
+    }
+
+    dialog.removeEventFilter(watcher)
+    dialog.hide()
+    dialog.deleteLater()
+    app.processEvents()
+    return result
+
+
+@pytest.mark.parametrize("rows", ROWS)
+@pytest.mark.parametrize("name", list(DIALOGS))
+def test_dialog_construction(name, rows, qapp):
+    build = DIALOGS[name](rows)
+    result = measure_dialog(qapp, build)
+    get_recorder("ui").add(name, rows, **result)
+    print(f"\n {name:<18} {rows:>6} rows {result['construct_ms']:>10.1f} ms build "
+          f"{result['first_paint_ms']:>9.1f} ms paint {result['widgets']:>8} widgets "
+          f"{result['rss_delta_kib']:>9} KiB")
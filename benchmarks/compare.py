@@ -0,0 +1,41 @@
+import argparse
+import json
+
+
+def load(path):
+    with open(path) as file:
+        data = json.load(file)
+    return data, {(row["name"], row["size"]): row for row in data["results"]}
+
+
+def compare(old_path, new_path, threshold=1.2, metric="median_ms"):
+    """Print metric changes between two benchmark runs; returns the rows slower than threshold."""
+    old_data, old_rows = load(old_path)
+    new_data, new_rows = load(new_path)
+    print(f" {old_data['commit']} -> {new_data['commit']} ({metric})")
+
+    regressions = []
+    for key in sorted(new_rows):
+        if key not in old_rows:
+            continue
+        old_value, new_value = old_rows[key].get(metric), new_rows[key].get(metric)
+        if not old_value or new_value is None:
+            continue
+        ratio = new_value / old_value
+        flag = "  SLOWER" if ratio > threshold else ""
+        print(f" {key[1]:>6} {key[0]:<32} {old_value:>10} -> {new_value:>10}  x{ratio:.2f}{flag}")
+        if ratio > threshold:
+            regressions.append(key)
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=1.2, help="ratio above which a row is a regression")
+    parser.add_argument("--metric", default="median_ms")
+    args = parser.parse_args()
+
+    if compare(args.old, args.new, args.threshold, args.metric):
+        raise SystemExit(1)
@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+from benchmarks.generate_data import generate_dataset
+from benchmarks.harness import all_recorders
+from database.cache import project_cache
+from database.db_config import SessionLocal, make_engine
+
+# Dataset volumes; pick with DMS_BENCH_SIZES=small,medium,large,project100k
+SIZES = {
+    "small": dict(projects=3, books_per_project=5, documents_per_book=20),
+    "medium": dict(projects=5, books_per_project=20, documents_per_book=100),
+    "large": dict(projects=10, books_per_project=50, documents_per_book=200),
+    "project100k": dict(projects=1, books_per_project=100, documents_per_book=1000),  # One very large project
+}
+SELECTED_SIZES = [size.strip() for size in os.getenv("DMS_BENCH_SIZES", "small,medium").split(",") if size.strip()]
+
+
+def pytest_sessionfinish(session, exitstatus):
+    # One file per suite, so running both suites at once does not overwrite either
+    for recorder in all_recorders():
+        if recorder.results:
+            path = recorder.write(os.getenv("DMS_BENCH_OUTPUT"))
+            print(f"\n Benchmark results written to {path}")
+
+
+@pytest.fixture(scope="session", params=SELECTED_SIZES)
+def dataset(request, tmp_path_factory):
+    """A synthetic database of the requested size, bound to SessionLocal."""
+    size = request.param
+    volumes = SIZES[size]
+    path = tmp_path_factory.mktemp("bench") / f"{size}.sqlite3"
+    engine = make_engine(f"sqlite:///{path}", echo=False)
+    counts = generate_dataset(engine, **volumes)
+
+    previous_bind = SessionLocal.kw.get("bind")
+    SessionLocal.configure(bind=engine)
+    project_cache.enabled = False  # Measure the queries, not the cache
+    yield {"size": size, "engine": engine, "counts": counts, **volumes}
+    SessionLocal.configure(bind=previous_bind)
+    engine.dispose()
@@ -0,0 +1,195 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from types import MappingProxyType
+
+from database.db_config import Base, make_engine
+from database.detail_columns import MILESTONE_COLUMNS
+from database.migrate_db import migrate_milestone_columns
+from database.snapshot import SectionPlacement, DocumentSnapshot, BookSnapshot, ProjectSnapshot
+from models.models import (Project, Book, Document, DocumentDetail,
+                           ProjectSection, ProjectSubSection, SectionRelation)
+
+STATES = ["Draft", "Created", "Released", "Approved", "Archived"]
+RELEASE_TYPES = ["Initial", "Minor", "Major", "Patch"]
+OWNERS = [f"engineer{number:02}" for number in range(40)]
+BATCH_SIZE = 5000
+
+
+def _insert(connection, table, rows):
+    """Insert rows with executemany in fixed-size batches."""
+    for start in range(0, len(rows), BATCH_SIZE):
+        connection.execute(table.insert(), rows[start:start + BATCH_SIZE])
+
+
+def generate_dataset(bind, projects=5, books_per_project=10, documents_per_book=50, milestones=20,
+                     sections=8, subsections_per_section=5, fill_rate=0.7, seed=1234):
+    """Fill an empty schema with synthetic projects, books, documents, sections and details.
+
+    Rows get explicit, sequential IDs, and each document is placed through a tblsection_relation
+    row with the same ID, as the app expects. Returns the number of rows written per table.
+    """
+    rng = random.Random(seed)
+    milestone_columns = MILESTONE_COLUMNS[:milestones]
+    Base.metadata.create_all(bind=bind)
+
+    with bind.begin() as connection:
+        if connection.execute(Project.__table__.select().limit(1)).first():
+            raise RuntimeError("generate_dataset expects an empty database")
+
+        section_rows, subsection_rows = [], []
+        for section_id in range(1, sections + 1):
+            section_rows.append({"section_id": section_id, "section_name": f"Section {section_id}",
+                                 "section_desc": f"Synthetic section {section_id}"})
+            for number in range(subsections_per_section):
+                subsection_rows.append({"subsection_id": len(subsection_rows) + 1, "section_id": section_id,
+                                        "subsection_name": f"Subsection {section_id}.{number + 1}",
+                                        "subsection_desc": None})
+        _insert(connection, ProjectSection.__table__, section_rows)
+        _insert(connection, ProjectSubSection.__table__, subsection_rows)
+
+        counts = {"projects": 0, "books": 0, "documents": 0, "details": 0}
+        document_id = 0
+        book_id = 0
+        for project_id in range(1, projects + 1):
+            _insert(connection, Project.__table__, [{"id": project_id, "name": f"Project {project_id:05}",
+                                                     "description": f"Synthetic project {project_id}"}])
+            counts["projects"] += 1
+
+            book_rows, document_rows, relation_rows, detail_rows = [], [], [], []
+            order = 0
+            for _ in range(books_per_project):
+                book_id += 1
+                book_rows.append({"id": book_id, "name": f"Book {book_id:06}", "description": None,
+                                  "project_id": project_id})
+
+                for _ in range(documents_per_book):
+                    document_id += 1
+                    release_date = date(2020, 1, 1) + timedelta(days=rng.randrange(2000))
+                    document_rows.append({
+                        "id": document_id,
+                        "name": f"DOC-{document_id:08}",
+                        "title": f"Document {document_id} of book {book_id}",
+                        "description": rng.choice(["Specification", "Test report", "Drawing", "Manual", None]),
+                        "owner": rng.choice(OWNERS),
+                        "revision": rng.choice("ABCDEF"),
+                        "state": rng.choice(STATES),
+                        "releasedate": release_date,
+                        "author": rng.choice(OWNERS),
+                        "approveddate": release_date + timedelta(days=rng.randrange(30)),
+                        "createdon": release_date - timedelta(days=rng.randrange(365)),
+                        "releasetype": rng.choice(RELEASE_TYPES),
+                        "book_id": book_id,
+                    })
+
+                    subsection = rng.choice(subsection_rows)
+                    relation_rows.append({"relation_id": document_id, "section_id": subsection["section_id"],
+                                          "subsection_id": subsection["subsection_id"],
+                                          "project_id": project_id, "relation_order": order})
+                    order += 1
+
+                    detail = {"document_id": document_id, "relation_id": document_id,
+                              "project_id": project_id, "active": 1}
+                    for column in MILESTONE_COLUMNS:
+                        detail[column] = None
+                    for column in milestone_columns:
+                        if rng.random() < fill_rate:
+                            detail[column] = (date(2024, 1, 1) + timedelta(days=rng.randrange(700))).isoformat()
+                    detail_rows.append(detail)
+
+            _insert(connection, Book.__table__, book_rows)
+            _insert(connection, Document.__table__, document_rows)
+            _insert(connection, SectionRelation.__table__, relation_rows)
+            _insert(connection, DocumentDetail.__table__, detail_rows)
+            counts["books"] += len(book_rows)
+            counts["documents"] += len(document_rows)
+            counts["details"] += len(detail_rows)
+
+    # The app reads milestones from tblmilestone_value; the wide rows above are what imports deliver
+    counts["milestone values"] = migrate_milestone_columns(bind)
+    return counts
+
+
+def generate_snapshot(documents=1000, books=10, milestones=20, sections=8, subsections_per_section=5,
+                      fill_rate=0.7, seed=1234):
+    """Build a ProjectSnapshot in memory, for benchmarking dialogs without a database."""
+    rng = random.Random(seed)
+    milestone_columns = MILESTONE_COLUMNS[:milestones]
+    subsections = [(f"Section {section}", f"Subsection {section}.{number + 1}")
+                   for section in range(1, sections + 1) for number in range(subsections_per_section)]
+
+    book_documents = {book_id: [] for book_id in range(1, books + 1)}
+    for document_id in range(1, documents + 1):
+        book_id = (document_id - 1) % books + 1
+        section, subsection = rng.choice(subsections)
+        release_date = date(2020, 1, 1) + timedelta(days=rng.randrange(2000))
+
+        values = {}
+        for column in milestone_columns:
+            if rng.random() < fill_rate:
+                values[column] = (date(2024, 1, 1) + timedelta(days=rng.randrange(700))).isoformat()
+
+        book_documents[book_id].append(DocumentSnapshot(
+            id=document_id,
+            name=f"DOC-{document_id:08}",
+            title=f"Document {document_id} of book {book_id}",
+            description=rng.choice(["Specification", "Test report", "Drawing", "Manual", None]),
+            owner=rng.choice(OWNERS),
+            revision=rng.choice("ABCDEF"),
+            state=rng.choice(STATES),
+            releasedate=release_date,
+            author=rng.choice(OWNERS),
+            approveddate=release_date,
+            createdon=release_date,
+            releasetype=rng.choice(RELEASE_TYPES),
+            book_id=book_id,
+            placements=(SectionPlacement(relation_id=document_id, section=section, subsection=subsection,
+                                         relation_order=document_id),),
+            details=(MappingProxyType(values),) if values else (),
+        ))
+
+    return ProjectSnapshot(
+        id=1, name="Synthetic Project", description=None, milestones=tuple(MILESTONE_COLUMNS),
+        books=tuple(BookSnapshot(id=book_id, name=f"Book {book_id:06}", description=None, project_id=1,
+                                 documents=tuple(book_documents[book_id])) for book_id in book_documents)
+    )
+
+
+def generate_csv_books(rows=1000, books=10, columns=8, seed=1234):
+    """Build the books_data list CreateProjectWindow reads from CSV files."""
+    rng = random.Random(seed)
+    headers = ["Document", "Title", "Owner", "State", "Release Date"] + [f"M{number}" for number in range(columns - 5)]
+    books_data = []
+    for book_number in range(books):
+        book_rows = []
+        for row_number in range(book_number, rows, books):
+            book_rows.append([f"DOC-{row_number:08}", f"Document {row_number}", rng.choice(OWNERS),
+                              rng.choice(STATES), "2024-01-01"] + [rng.choice(["", "done", "planned"])
+                                                                 for _ in range(columns - 5)])
+        books_data.append({"name": f"book_{book_number:03}.csv", "headers": headers, "rows": book_rows})
+    return books_data
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fill an empty DMS database with synthetic data.")
+    parser.add_argument("--url", default="sqlite:///dms_synthetic.sqlite3", help="SQLAlchemy database URL")
+    parser.add_argument("--projects", type=int, default=5)
+    parser.add_argument("--books", type=int, default=10, help="books per project")
+    parser.add_argument("--documents", type=int, default=50, help="documents per book")
+    parser.add_argument("--milestones", type=int, default=20, help=f"filled milestone columns (max {len(MILESTONE_COLUMNS)})")
+    parser.add_argument("--sections", type=int, default=8)
+    parser.add_argument("--subsections", type=int, default=5, help="subsections per section")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    row_counts = generate_dataset(make_engine(args.url, echo=False), projects=args.projects,
+                                  books_per_project=args.books, documents_per_book=args.documents,
+                                  milestones=args.milestones, sections=args.sections,
+                                  subsections_per_section=args.subsections, seed=args.seed)
+    print(f" Generated {row_counts} in {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,105 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+
+from database.instrumentation import capture_statements
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def measure(func, engine=None, repeat=5):
+    """Time a call, then run it once more to count queries and peak Python memory."""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    if engine is not None:
+        with capture_statements(engine) as statements:
+            func()
+        queries = len(statements)
+    else:
+        func()
+        queries = None
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "max_ms": round(max(timings), 3),
+        "repeat": repeat,
+        "queries": queries,
+        "peak_kib": round(peak / 1024, 1),
+        "rows": len(result) if hasattr(result, "__len__") else None,
+    }
+
+
+def current_rss_kib():
+    """Resident set size of this process in KiB (Linux /proc, peak RSS elsewhere)."""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+class BenchmarkRecorder:
+    """Collects benchmark results and writes them to one JSON file per run."""
+
+    def __init__(self, suite):
+        self.suite = suite
+        self.results = []
+        self.metadata = {}
+
+    def add(self, name, size, **values):
+        self.results.append({"name": name, "size": size, **values})
+
+    def write(self, directory=None):
+        """Write the results to <directory>/<suite>_<commit>.json (default benchmarks/results)."""
+        commit = git_commit()
+        directory = directory or RESULTS_DIR
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.suite}_{commit}.json")
+        with open(path, "w") as file:
+            json.dump({
+                "suite": self.suite,
+                "commit": commit,
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                **self.metadata,
+                "results": self.results,
+            }, file, indent=2)
+        return path
+
+
+_recorders = {}
+
+
+def get_recorder(suite):
+    """Shared recorder per suite; benchmarks/conftest.py writes them all when the session ends."""
+    if suite not in _recorders:
+        _recorders[suite] = BenchmarkRecorder(suite)
+    return _recorders[suite]
+
+
+def all_recorders():
+    return list(_recorders.values())
@@ -0,0 +1,227 @@
+import dataclasses
+import inspect
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from datetime import date
+from functools import wraps
+
+from sqlalchemy import TextClause, event
+from sqlalchemy.engine import Engine
+
+from .db_config import DB_CACHE, DB_CACHE_ENTRIES, DB_CACHE_MB, DB_CACHE_TTL
+
+SIZE_SAMPLE = 32  # Items measured per container; the rest are assumed to be of the same size
+DICT_ENTRY_BYTES = 100  # Hash table share of one entry in the lookup mappings of a snapshot
+_SCALARS = (str, bytes, int, float, bool, type(None), date)
+
+
+def estimate_size(value):
+    """Approximate bytes held by value and what it contains.
+
+    Large containers are sampled, so a snapshot of 100k documents takes tens of milliseconds
+    rather than seconds. Shared objects such as interned strings are counted for every holder, which
+    errs on the large side.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, _SCALARS):
+        return size
+    if isinstance(value, Mapping):
+        return size + _sampled_size(value.items(), len(value))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + _sampled_size(value, len(value))
+    if dataclasses.is_dataclass(value):
+        for field in dataclasses.fields(value):
+            member = getattr(value, field.name)
+            if field.init:
+                size += estimate_size(member)
+            else:  # Derived lookups: the containers only, their items are counted already
+                size += sys.getsizeof(member) + DICT_ENTRY_BYTES * len(member)
+        return size
+    if hasattr(value, "__dict__"):
+        return size + estimate_size(vars(value))
+    return size
+
+
+def _sampled_size(items, count):
+    if count == 0:
+        return 0
+    if not isinstance(items, (list, tuple)):
+        items = list(items)
+    step = max(1, count // SIZE_SAMPLE)
+    sample = items[::step][:SIZE_SAMPLE]
+    return sum(estimate_size(item) for item in sample) * count // len(sample)
+
+
+class CacheEntry:
+    __slots__ = ("value", "project_id", "expires", "size")
+
+    def __init__(self, value, project_id, expires, size):
+        self.value = value
+        self.project_id = project_id
+        self.expires = expires
+        self.size = size
+
+
+class ProjectCache:
+    """Process-wide LRU cache of db_methods results, keyed by function and arguments.
+
+    Entries expire after ttl seconds, the least recently used are dropped beyond max_entries or
+    once the estimated size of all entries exceeds max_bytes (a single larger result is not
+    cached), and every write the app makes clears the cache (see the engine events below). The
+    generation counter keeps a read that raced with a write from storing what it read before the
+    write.
+    """
+
+    def __init__(self, max_entries=DB_CACHE_ENTRIES, ttl=DB_CACHE_TTL, enabled=DB_CACHE,
+                 max_bytes=int(DB_CACHE_MB * 1024 * 1024)):
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0  # Estimated size of all entries
+        self.ttl = ttl
+        self.enabled = enabled
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """(True, value) for a live entry, (False, None) otherwise."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry.expires < time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return False, None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True, entry.value
+
+    def put(self, key, value, project_id=None, generation=None):
+        size = estimate_size(value)  # Outside the lock; sampling a snapshot takes a moment
+        with self.lock:
+            if generation is not None and generation != self.generation:
+                return  # Read before the last write
+            if key in self.entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return
+            self.entries[key] = CacheEntry(value, project_id, time.monotonic() + self.ttl, size)
+            self.bytes += size
+            while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+
+    def _remove(self, key):
+        self.bytes -= self.entries.pop(key).size
+
+    def invalidate(self, project_id=None):
+        """Drop the entries of one project (and those not tied to a project), or everything."""
+        with self.lock:
+            self.generation += 1
+            if project_id is None:
+                self.entries.clear()
+                self.bytes = 0
+                return
+            for key in [key for key, entry in self.entries.items()
+                        if entry.project_id in (project_id, None)]:
+                self._remove(key)
+
+    def clear(self):
+        self.invalidate()
+        with self.lock:
+            self.hits = self.misses = 0
+
+
+project_cache = ProjectCache()
+
+
+def _freeze(value):
+    """Hashable form of an argument: lists and tuples become tuples, sets frozensets."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    hash(value)  # TypeError for dicts and other unhashable arguments
+    return value
+
+
+def cached_query(copy=None):
+    """Cache a read function in project_cache.
+
+    The function's project_id argument, if it has one, ties the entry to that project. Results
+    must be immutable unless copy is given: it is applied to every result handed out. Calls with
+    unhashable arguments bypass the cache; func.uncached is the original function and
+    func.peek(*args) looks a call up without running it.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def cache_key(args, kwargs):
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+            try:
+                key = (func.__name__, _freeze(tuple(arguments.arguments.values())))
+            except TypeError:
+                return None, None
+            return key, arguments.arguments.get("project_id")
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key, project_id = cache_key(args, kwargs) if project_cache.enabled else (None, None)
+            if key is None:
+                return func(*args, **kwargs)
+
+            found, value = project_cache.get(key)
+            if not found:
+                generation = project_cache.generation
+                value = func(*args, **kwargs)
+                project_cache.put(key, value, project_id, generation)
+            return copy(value) if copy is not None else value
+
+        def peek(*args, **kwargs):
+            """(True, result) if the call is cached, (False, None) otherwise; never queries."""
+            key, _ = cache_key(args, kwargs) if project_cache.enabled else (None, None)
+            found, value = project_cache.get(key) if key is not None else (False, None)
+            return found, (copy(value) if found and copy is not None else value)
+
+        wrapper.uncached = func
+        wrapper.peek = peek
+        return wrapper
+    return decorator
+
+
+# Raw SQL starting with one of these does not change data
+READ_PREFIXES = ("SELECT", "WITH", "EXPLAIN", "PRAGMA", "SHOW", "DESCRIBE", "SAVEPOINT", "RELEASE", "ROLLBACK")
+
+
+def _is_write(statement, context):
+    compiled = context.compiled if context is not None else None
+    if compiled is not None and not isinstance(compiled.statement, TextClause):
+        return context.isinsert or context.isupdate or context.isdelete
+    # text() and exec_driver_sql(): only the SQL itself tells
+    return not statement.lstrip().upper().startswith(READ_PREFIXES)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _invalidate_on_write(conn, cursor, statement, parameters, context, executemany):
+    if _is_write(statement, context):
+        conn.info["cache_dirty"] = True
+        project_cache.invalidate()
+
+
+@event.listens_for(Engine, "commit")
+def _invalidate_on_commit(conn):
+    # Again on commit: another thread may have cached the old rows while the write was uncommitted
+    if conn.info.pop("cache_dirty", False):
+        project_cache.invalidate()
+
+
+@event.listens_for(Engine, "rollback")
+def _invalidate_on_rollback(conn):
+    # The writing connection may have cached rows it then rolled back
+    if conn.info.pop("cache_dirty", False):
+        project_cache.invalidate()
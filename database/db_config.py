@@ -1,26 +1,188 @@
-import mysql.connector
-from sqlalchemy import create_engine
+import logging
+import os
+import threading
+from configparser import ConfigParser
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from sqlalchemy.ext.declarative import declarative_base
 
+from .instrumentation import instrument
+
+logger = logging.getLogger("dms.db")
+
+
+# Settings come from DMS_DB_* environment variables first, then the [database] section of the
+# ini file named by DMS_CONFIG (default: dms.ini in the project root), then the defaults below.
+CONFIG_PATH = os.getenv("DMS_CONFIG", os.path.join(os.path.dirname(os.path.dirname(__file__)), "dms.ini"))
+
+_config = ConfigParser()
+_config.read(CONFIG_PATH)
+
+
+def get_setting(name, default=None):
+    """Read a database setting from the environment or the config file."""
+    value = os.getenv(f"DMS_DB_{name.upper()}")
+    if value is not None:
+        return value
+    return _config.get("database", name.lower(), fallback=default)
+
+
+def get_bool_setting(name, default=False):
+    value = get_setting(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# "mysql" (default) or "sqlite"; a full DMS_DB_URL / url setting overrides both
+DB_BACKEND = get_setting("backend", "mysql").strip().lower()
+DB_PATH = get_setting("path", os.path.join(os.path.dirname(os.path.dirname(__file__)), "dms.sqlite3"))
+
+DB_HOST = get_setting("host", "localhost")
+DB_USER = get_setting("user", "root")
+DB_PASSWORD = get_setting("password", "admin1234")  # The password existing setups were built with
+DB_NAME = get_setting("name", "dms_test")
+
+# Connection pool
+DB_POOL_SIZE = int(get_setting("pool_size", 5))
+DB_MAX_OVERFLOW = int(get_setting("max_overflow", 10))
+DB_POOL_TIMEOUT = int(get_setting("pool_timeout", 30))
+DB_POOL_RECYCLE = int(get_setting("pool_recycle", 1800))  # Seconds, below MySQL's wait_timeout
+DB_POOL_PRE_PING = get_bool_setting("pool_pre_ping", True)
+DB_ECHO = get_bool_setting("echo", False)  # Logs every statement; use the query stats instead
+
+# Query statistics (database/instrumentation.py); queries slower than slow_query_ms are logged
+DB_INSTRUMENT = get_bool_setting("instrument", True)
+DB_SLOW_QUERY_MS = float(get_setting("slow_query_ms", 250))
+
+# Project data cache (database/cache.py): entries live ttl seconds; any write clears it. Least
+# recently used entries go beyond cache_entries entries or cache_mb megabytes
+DB_CACHE = get_bool_setting("cache", True)
+DB_CACHE_ENTRIES = int(get_setting("cache_entries", 32))
+DB_CACHE_TTL = float(get_setting("cache_ttl", 300))
+DB_CACHE_MB = float(get_setting("cache_mb", 256))  # Estimated size of all entries together
+
+# Refreshes of an open project (db_methods.get_project_changes) read rows stamped up to
+# change_overlap_s seconds before the previous refresh again. Rows of a transaction that commits
+# later than that after writing them are missed until the project is opened again
+DB_CHANGE_OVERLAP_S = float(get_setting("change_overlap_s", 5))
 
-DB_HOST = "localhost"
-DB_USER = "root"
-DB_PASSWORD = "admin1234"
-DB_NAME = "dms_test"
+# Connection URL
+if get_setting("url"):
+    DATABASE_URL = get_setting("url")
+elif DB_BACKEND == "sqlite":
+    DATABASE_URL = f"sqlite:///{DB_PATH}"
+else:
+    DATABASE_URL = f"mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}"
+
+
+def is_sqlite_memory(url):
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def make_engine(url=DATABASE_URL, echo=DB_ECHO, instrumented=DB_INSTRUMENT):
+    """Create an engine for MySQL or SQLite with the pool settings that suit the backend."""
+    new_engine = _create_engine(url, echo)
+    if instrumented:
+        instrument(new_engine, slow_query_ms=DB_SLOW_QUERY_MS)
+    return new_engine
+
+
+def _create_engine(url, echo):
+    if make_url(url).get_backend_name() != "sqlite":
+        return create_engine(
+            url,
+            echo=echo,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=DB_POOL_PRE_PING,
+        )
+
+    # Sessions may be used from worker threads, so connections must not be tied to one thread
+    if is_sqlite_memory(url):
+        # One shared connection, otherwise every checkout would see a new empty database
+        sqlite_engine = create_engine(url, echo=echo, connect_args={"check_same_thread": False},
+                                      poolclass=StaticPool)
+    else:
+        sqlite_engine = create_engine(url, echo=echo, connect_args={"check_same_thread": False})
+
+    @event.listens_for(sqlite_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        if not is_sqlite_memory(url):
+            cursor.execute("PRAGMA journal_mode=WAL")  # Readers don't block the writer
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    return sqlite_engine
 
-# Cr MySQL connection URL
-DATABASE_URL = f"mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}"
 
 # Create engine
-engine = create_engine(DATABASE_URL, echo=True)
+engine = make_engine()
 
 
 # Base class for models
 Base = declarative_base()
 
 # Create a configured "Session" class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False keeps returned objects readable after session_scope() commits and closes
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+_current = threading.local()
+
+
+@contextmanager
+def session_scope():
+    """Unit of work: one session, and so one pooled connection, for several queries.
+
+    Nested scopes on the same thread reuse the outer session, so a dialog action can wrap
+    several db_methods calls in one scope. Commits on success, rolls back on error.
+    """
+    session = getattr(_current, "session", None)
+    if session is not None:
+        yield session
+        return
+
+    session = SessionLocal()
+    _current.session = session
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        _current.session = None
+        session.close()
+
 
+def warm_up_pool(connections=None):
+    """Open pooled connections up front so the first clicks skip the connect handshake."""
+    if engine.dialect.name == "sqlite":
+        return 0  # Opening a SQLite file costs next to nothing
+    connections = min(connections or DB_POOL_SIZE, DB_POOL_SIZE)
+    opened = []
+    try:
+        for _ in range(connections):
+            opened.append(engine.connect())
+    except Exception as e:
+        logger.warning("Database warm-up failed after %d connection(s): %s", len(opened), e)
+    finally:
+        for connection in opened:
+            connection.close()  # Returns the connection to the pool
+    return len(opened)
 
 
+def start_pool_warm_up():
+    """Warm up the pool on a background thread so the UI thread never waits for it."""
+    thread = threading.Thread(target=warm_up_pool, name="db-pool-warm-up", daemon=True)
+    thread.start()
+    return thread
@@ -1,118 +1,185 @@
 
-from sqlalchemy import inspect
-from sqlalchemy.orm import Session
-from models.models import Project, Book, Document, DocumentDetail, ProjectSection, ProjectSubSection, SectionRelation
-
-from .db_config import SessionLocal
+from datetime import timedelta
+from types import MappingProxyType
 
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+from models.models import Project, Book, Document, ProjectSection, ProjectSubSection, SectionRelation, \
+    Milestone, MilestoneValue
+
+from .cache import cached_query
+from .db_config import DB_CHANGE_OVERLAP_S, session_scope
+from .detail_columns import DETAIL_COLUMNS, DETAIL_SELECT, detail_row, parse_milestone_date
+from .snapshot import SectionPlacement, DocumentSnapshot, DocumentSummary, BookSnapshot, ProjectSnapshot, \
+    MilestoneConflict, MilestoneSaveResult, ProjectChanges, intern_text, selected_document_ids
+
+# Column-only queries for the read paths, in the field order of the record they fill. Records
+# built from plain rows cost a fraction of the memory of detached ORM instances.
+PROJECT_COLUMNS = (Project.id, Project.name, Project.description)
+BOOK_COLUMNS = (Book.id, Book.name, Book.description, Book.project_id)
+DOCUMENT_COLUMNS = (Document.id, Document.name, Document.title, Document.description, Document.owner,
+                    Document.revision, Document.state, Document.releasedate, Document.author,
+                    Document.approveddate, Document.createdon, Document.releasetype, Document.book_id,
+                    Document.version)
+# The columns ChooseDocuments shows, searches and groups by; the full rows are loaded later
+# for the documents the user keeps
+DOCUMENT_LIST_COLUMNS = (Document.id, Document.book_id, Document.name, Document.title, Document.description,
+                         Document.revision, Document.owner, Document.state)
+
+
+def _project_record(row):
+    return ProjectSnapshot(id=row.id, name=row.name, description=row.description)
+
+
+def _book_record(row, documents=()):
+    return BookSnapshot(id=row.id, name=row.name, description=row.description, project_id=row.project_id,
+                        documents=documents)
+
+
+def _document_record(row, placements=(), details=(), milestone_versions=None):
+    return DocumentSnapshot(
+        id=row.id, name=row.name, title=row.title, description=row.description,
+        owner=intern_text(row.owner), revision=row.revision, state=intern_text(row.state),
+        releasedate=row.releasedate, author=intern_text(row.author), approveddate=row.approveddate,
+        createdon=row.createdon, releasetype=intern_text(row.releasetype), book_id=row.book_id,
+        version=row.version, placements=placements, details=details, milestone_versions=milestone_versions
+    )
+
+
+@cached_query(copy=dict)
 def get_all_project_names():
     """Fetch all project names from the database."""
-    session = SessionLocal()
-    projects = session.query(Project.id, Project.name).all()
-    session.close()
+    with session_scope() as session:
+        projects = session.query(Project.id, Project.name).all()
     return {project.name: project.id for project in projects}  # Extract names from tuples
 
+@cached_query()
 def get_project_by_name(name):
     """Fetch a specific project by name."""
-    session = SessionLocal()
-    project = session.query(Project).filter(Project.name == name).first()
-    session.close()
-    return project
+    with session_scope() as session:
+        project = session.query(*PROJECT_COLUMNS).filter(Project.name == name).first()
+    return _project_record(project) if project else None
 
+@cached_query()
 def get_project_by_id(project_id):
     """Fetch a specific project by its ID."""
-    session = SessionLocal()
-    project = session.query(Project).filter(Project.id == project_id).first()
-    session.close()
-    return project
+    with session_scope() as session:
+        project = session.query(*PROJECT_COLUMNS).filter(Project.id == project_id).first()
+    return _project_record(project) if project else None
 
 
 def get_books_by_project(project_id):
     """Fetches books by project ID"""
-    session = SessionLocal()
-    book_list = session.query(Book).filter(Book.project_id == project_id).all()
-    session.close()
-    return book_list
+    with session_scope() as session:
+        books = session.query(*BOOK_COLUMNS).filter(Book.project_id == project_id).all()
+    return [_book_record(book) for book in books]
 
 def get_documents_by_book(book_id):
     """Fetches documents by books"""
-    session = SessionLocal()
-    document_list = session.query(Document).filter(Document.book_id == book_id).all()
-    session.close()
-    return document_list
+    with session_scope() as session:
+        documents = session.query(*DOCUMENT_COLUMNS).filter(Document.book_id == book_id).all()
+    return [_document_record(document) for document in documents]
+
+
+@cached_query(copy=lambda result: (result[0], list(result[1])))
+def get_project_books(project_id):
+    """Fetch a project and its books (no documents) for the book picker.
+
+    Returns (project, books) as read-only records, or (None, []) if the project does not exist.
+    """
+    with session_scope() as session:
+        project = session.query(*PROJECT_COLUMNS).filter(Project.id == project_id).first()
+        if not project:
+            return None, []
+        books = session.query(*BOOK_COLUMNS).filter(Book.project_id == project_id).order_by(Book.id).all()
+    return _project_record(project), [_book_record(book) for book in books]
+
+
+@cached_query(copy=lambda result: {book_id: list(documents) for book_id, documents in result.items()})
+def get_documents_by_books(book_ids):
+    """Fetch the documents of many books at once, keyed by book ID in the order given.
+
+    One query per DOCUMENT_ID_CHUNK_SIZE books; the DocumentSummary records carry only
+    DOCUMENT_LIST_COLUMNS.
+    """
+    book_ids = list(dict.fromkeys(book_ids))
+    documents = {book_id: [] for book_id in book_ids}
+    with session_scope() as session:
+        for chunk in _chunked(book_ids):
+            rows = (
+                session.query(*DOCUMENT_LIST_COLUMNS)
+                .filter(Document.book_id.in_(chunk))
+                .order_by(Document.id)
+                .all()
+            )
+            for id, book_id, name, title, description, revision, owner, state in rows:
+                documents[book_id].append(DocumentSummary(id, book_id, name, title, description, revision,
+                                                          intern_text(owner), intern_text(state)))
+    return documents
 
 def get_sections_by_project(project_id):
     """Fetches section names by project ID."""
-    session = SessionLocal()
-    try:
-        # Query to join SectionRelation and ProjectSection to get section names
-        sections = session.query(SectionRelation).join(ProjectSection, SectionRelation.section_id == ProjectSection.section_id)\
-            .filter(SectionRelation.project_id == project_id)\
-            .all()
-
-        if sections:
-            section_list = []
-            for section_relation in sections:
-                section_name = section_relation.section.section_name  # Accessing the section name from the related table
-                section_list.append({
-                    "section_id": section_relation.section_id,
-                    "section_name": section_name
-                })
-            return section_list
-        else:
-            print("No sections found for the given project ID.")
+    with session_scope() as session:
+        try:
+            # Query to join SectionRelation and ProjectSection to get section names
+            sections = session.query(SectionRelation.section_id, ProjectSection.section_name)\
+                .join(ProjectSection, SectionRelation.section_id == ProjectSection.section_id)\
+                .filter(SectionRelation.project_id == project_id)\
+                .all()
+
+            if sections:
+                section_list = []
+                for section_relation in sections:
+                    section_list.append({
+                        "section_id": section_relation.section_id,
+                        "section_name": intern_text(section_relation.section_name)
+                    })
+                return section_list
+            else:
+                print("No sections found for the given project ID.")
+                return []
+        except Exception as e:
+            print(f"Error fetching sections: {e}")
             return []
-    except Exception as e:
-        print(f"Error fetching sections: {e}")
-        return []
-    finally:
-        session.close()
 
 def get_subsections_by_project(project_id):
     """Fetches section names by project ID."""
-    session = SessionLocal()
-    try:
-        # Query to join SectionRelation and ProjectSection to get section names
-        subsections = session.query(SectionRelation).join(ProjectSection, SectionRelation.subsection_id == ProjectSection.subsection_id)\
-            .filter(SectionRelation.project_id == project_id)\
-            .all()
-
-        if subsections:
-            subsection_list = []
-            for subsection_relation in subsections:
-                subsection_name = subsection_relation.section.section_name  # Accessing the section name from the related table
-                subsection_list.append({
-                    "section_id": subsection_relation.section_id,
-                    "section_name": subsection_name
-                })
-            return subsection_list
-        else:
-            print("No subsections found for the given project ID.")
+    with session_scope() as session:
+        try:
+            # Query to join SectionRelation and ProjectSubSection to get subsection names
+            subsections = session.query(SectionRelation.section_id, ProjectSubSection.subsection_name)\
+                .join(ProjectSubSection, SectionRelation.subsection_id == ProjectSubSection.subsection_id)\
+                .filter(SectionRelation.project_id == project_id)\
+                .all()
+
+            if subsections:
+                subsection_list = []
+                for subsection_relation in subsections:
+                    subsection_list.append({
+                        "section_id": subsection_relation.section_id,
+                        "section_name": intern_text(subsection_relation.subsection_name)
+                    })
+                return subsection_list
+            else:
+                print("No subsections found for the given project ID.")
+                return []
+        except Exception as e:
+            print(f"Error fetching sections: {e}")
             return []
-    except Exception as e:
-        print(f"Error fetching sections: {e}")
-        return []
-    finally:
-        session.close()
 
 
 
 def get_document_detail_columns():
-    """Fetch all column names from tbldocument_detail dynamically."""
-    inspector = inspect(DocumentDetail)
-    return [column.name for column in inspector.columns]
+    """Fetch all column names from tbldocument_detail (see detail_columns.py)."""
+    return list(DETAIL_COLUMNS)
 
 
 def get_project_details(project_id: int, selected_documents: dict):
     """Fetch details for a project only for selected documents."""
-    session = SessionLocal()
-
-    try:
-        # Prepare a list of document IDs to filter
-        selected_doc_ids = []
-        for book_data in selected_documents.values():
-            for document in book_data["documents"]:
-                selected_doc_ids.append(document.id)  # Use .id because it's a Document object
+    with session_scope() as session:
+        selected_doc_ids = selected_document_ids(selected_documents)
 
         # Fetching Project, Books, Documents, Sections, and Subsections
         query = (
@@ -193,37 +260,350 @@ def get_project_details(project_id: int, selected_documents: dict):
 
         return structured_data
 
-    finally:
-        session.close()
-
 
 
 def get_document_details(project_id: int, book_id: int, document_id: int):
     """Fetch all document details related to a specific project, book, and document."""
-    session = SessionLocal()
-
-    try:
-        document_detail_columns = get_document_detail_columns()
-        document_detail_columns_objs = [getattr(DocumentDetail, col) for col in document_detail_columns]
-
-        query = (
-            session.query(*document_detail_columns_objs)
-            .join(Document, DocumentDetail.document_id == Document.id)
-            .join(Book, Document.book_id == Book.id)
-            .filter(Book.project_id == project_id)
-            .filter(Book.id == book_id)
-            .filter(Document.id == document_id)
+    with session_scope() as session:
+        statement = (
+            DETAIL_SELECT
+            .where(Book.project_id == project_id)
+            .where(Book.id == book_id)
+            .where(Document.id == document_id)
         )
 
-        results = query.all()
+        results = session.execute(statement).all()
 
         document_details = []
         for row in results:
-            row_dict = dict(row._mapping)
-            document_details.append(row_dict)
+            document_details.append(detail_row(row))
 
         return document_details  # Returns a list of document details
 
-    finally:
-        session.close()
 
+
+# Keeps each IN (...) list well below the bound-parameter limits of MySQL and SQLite
+DOCUMENT_ID_CHUNK_SIZE = 500
+
+
+def _chunked(ids):
+    """Split a list of IDs into lists of at most DOCUMENT_ID_CHUNK_SIZE items."""
+    for start in range(0, len(ids), DOCUMENT_ID_CHUNK_SIZE):
+        yield ids[start:start + DOCUMENT_ID_CHUNK_SIZE]
+
+
+def get_document_details_bulk(project_id: int, document_ids):
+    """Fetch document details for many documents at once, keyed by document ID."""
+    with session_scope() as session:
+        document_ids = list(dict.fromkeys(document_ids))  # Drop duplicates, keep order
+        document_details = {document_id: [] for document_id in document_ids}
+
+        for chunk in _chunked(document_ids):
+            statement = DETAIL_SELECT.where(Book.project_id == project_id).where(Document.id.in_(chunk))
+
+            for row in session.execute(statement).all():
+                row_dict = detail_row(row)
+                document_details[row_dict["document_id"]].append(row_dict)
+
+        return document_details  # Returns {document_id: [document details]}
+
+
+def _project_milestones(session, project_id):
+    return tuple(session.execute(
+        select(Milestone.name)
+        .where((Milestone.project_id == project_id) | Milestone.project_id.is_(None))
+        .order_by(Milestone.project_id.is_not(None), Milestone.position, Milestone.milestone_id)
+    ).scalars())
+
+
+# Milestone values with their names and versions; pivoted per document by the readers. A cleared
+# cell keeps its row with value NULL, so its version and updated_at still record the change.
+MILESTONE_VALUE_SELECT = (
+    select(MilestoneValue.document_id, Milestone.name, MilestoneValue.value, MilestoneValue.version)
+    .join(Milestone, Milestone.milestone_id == MilestoneValue.milestone_id)
+)
+
+
+def get_project_milestones(project_id: int):
+    """Milestone names of a project (shared ones first, then its own), in display order."""
+    with session_scope() as session:
+        return _project_milestones(session, project_id)
+
+
+def load_milestone_values(project_id: int, document_ids=None):
+    """Pivot the milestone values of a project into {document_id: {milestone: value}}.
+
+    One query for the whole project, or one per DOCUMENT_ID_CHUNK_SIZE documents. Documents
+    without values are left out.
+    """
+    with session_scope() as session:
+        if document_ids is None:
+            scopes = [None]
+        else:
+            scopes = [MilestoneValue.document_id.in_(chunk) for chunk in _chunked(list(dict.fromkeys(document_ids)))]
+        values = {}
+        for scope in scopes:
+            statement = MILESTONE_VALUE_SELECT.where(MilestoneValue.project_id == project_id)
+            if scope is not None:
+                statement = statement.where(scope)
+            for document_id, name, value, _ in session.execute(statement).all():
+                if value is not None:
+                    values.setdefault(document_id, {})[name] = value
+        return values
+
+
+def add_milestone(project_id: int, name: str):
+    """Add a milestone to a project's dictionary; a row insert, no schema change.
+
+    Returns False if the project already has a milestone of that name.
+    """
+    with session_scope() as session:
+        if name in _project_milestones(session, project_id):
+            return False
+        _milestone_ids(session, project_id, [name])
+    return True
+
+
+def _milestone_ids(session, project_id, names):
+    """{name: milestone_id} for the given names, adding the ones the project does not have yet."""
+    milestone_ids = {}
+    for milestone_id, name, owner in session.execute(
+        select(Milestone.milestone_id, Milestone.name, Milestone.project_id)
+        .where((Milestone.project_id == project_id) | Milestone.project_id.is_(None))
+        .where(Milestone.name.in_(list(names)))
+    ):
+        if owner is not None or name not in milestone_ids:  # The project's own milestone wins
+            milestone_ids[name] = milestone_id
+
+    missing = [name for name in dict.fromkeys(names) if name not in milestone_ids]
+    if missing:
+        position = session.execute(
+            select(func.coalesce(func.max(Milestone.position), -1) + 1).where(Milestone.project_id == project_id)
+        ).scalar()
+        milestones = [Milestone(project_id=project_id, name=name, position=position + offset)
+                      for offset, name in enumerate(missing)]
+        session.add_all(milestones)
+        session.flush()
+        milestone_ids.update((milestone.name, milestone.milestone_id) for milestone in milestones)
+    return milestone_ids
+
+
+# Milestone cells are written with executemany, one statement for updates and one for inserts.
+# Updates compare the version the edit was based on, so a cell someone else saved in between is
+# left alone (optimistic concurrency; no rows stay locked while the user edits).
+_value_table = MilestoneValue.__table__
+_value_cell = (_value_table.c.project_id == bindparam("b_project_id"),
+               _value_table.c.document_id == bindparam("b_document_id"),
+               _value_table.c.milestone_id == bindparam("b_milestone_id"),
+               _value_table.c.version == bindparam("b_version"))
+MILESTONE_VALUE_UPDATE = update(_value_table).where(*_value_cell).values(version=_value_table.c.version + 1)
+
+
+def save_milestone_values(project_id: int, changes):
+    """Write edited milestone cells of a project in one transaction, compare-and-swap style.
+
+    changes holds (document_id, milestone, value, version) for the cells that changed, where
+    version is the one the edit started from (None for a cell that never had a value); an empty
+    value clears the cell. Cells whose version moved since are not written but returned as
+    MilestoneConflict, unless they already hold the same value. Existing cells are updated and
+    new ones inserted with one executemany each, so the number of round trips does not grow with
+    the number of cells.
+
+    Raises StaleDataError, with nothing written, if another save got in between the version check
+    and the writes; saving again then reports the conflicts.
+    """
+    cells = {(document_id, name): (value, version) for document_id, name, value, version in changes}
+    result = MilestoneSaveResult(versions={}, conflicts=[])
+    if not cells:
+        return result
+
+    with session_scope() as session:
+        milestone_ids = _milestone_ids(session, project_id, {name for _, name in cells})
+        current = {}
+        for chunk in _chunked(sorted({document_id for document_id, _ in cells})):
+            for document_id, milestone_id, value, version in session.execute(
+                select(MilestoneValue.document_id, MilestoneValue.milestone_id, MilestoneValue.value,
+                       MilestoneValue.version)
+                .where(MilestoneValue.project_id == project_id, MilestoneValue.document_id.in_(chunk))
+            ):
+                current[(document_id, milestone_id)] = (value, version)
+
+        inserts, updates = [], []
+        for (document_id, name), (value, version) in cells.items():
+            value = value or None
+            their_value, their_version = current.get((document_id, milestone_ids[name]), (None, None))
+            if their_value == value:
+                result.versions[(document_id, name)] = their_version  # Nothing to write
+                continue
+            if their_version != version:
+                result.conflicts.append(MilestoneConflict(document_id, name, value, their_value, their_version))
+                continue
+
+            cell = {"b_project_id": project_id, "b_document_id": document_id,
+                    "b_milestone_id": milestone_ids[name], "b_version": version}
+            if version is not None:  # Clearing a cell updates it too, see MILESTONE_VALUE_SELECT
+                updates.append({**cell, "value": value, "value_date": parse_milestone_date(value)})
+                result.versions[(document_id, name)] = version + 1
+            else:
+                inserts.append({"project_id": project_id, "document_id": document_id,
+                                "milestone_id": milestone_ids[name], "value": value,
+                                "value_date": parse_milestone_date(value), "version": 1})
+                result.versions[(document_id, name)] = 1
+
+        connection = session.connection()
+        # Drivers that cannot count executemany rows leave the race to the next save's version check
+        check_rows = connection.dialect.supports_sane_multi_rowcount
+        if updates:
+            matched = connection.execute(MILESTONE_VALUE_UPDATE, updates).rowcount
+            if check_rows and matched != len(updates):
+                raise StaleDataError(f"{len(updates) - matched} milestone value(s) changed while saving")
+        if inserts:
+            try:
+                connection.execute(insert(_value_table), inserts)
+            except IntegrityError as error:  # Someone filled the same empty cell
+                raise StaleDataError("Milestone values were added while saving") from error
+    return result
+
+
+# Placements of documents with their section names; callers add .where(Book.project_id == ...)
+PLACEMENT_SELECT = (
+    select(Document.id.label("document_id"), SectionRelation.relation_id,
+           ProjectSection.section_name, ProjectSubSection.subsection_name,
+           SectionRelation.relation_order, SectionRelation.version)
+    .join(Book, Document.book_id == Book.id)
+    .join(SectionRelation, SectionRelation.relation_id == Document.id)
+    .join(ProjectSection, ProjectSection.section_id == SectionRelation.section_id)
+    .join(ProjectSubSection, ProjectSubSection.subsection_id == SectionRelation.subsection_id)
+)
+
+
+def _placement_record(row):
+    return SectionPlacement(
+        relation_id=row.relation_id,
+        section=intern_text(row.section_name),
+        subsection=intern_text(row.subsection_name),
+        relation_order=row.relation_order,
+        version=row.version
+    )
+
+
+@cached_query()
+def load_project_snapshot(project_id: int, book_ids=None, document_ids=None):
+    """Load a project with its books, documents, sections and details as one immutable snapshot.
+
+    book_ids and document_ids optionally narrow the snapshot; everything is fetched with a few
+    set-based queries in a single session. Returns None if the project does not exist.
+    """
+    with session_scope() as session:
+        # The database clock, read with the project row, marks what the snapshot already contains
+        project = session.query(*PROJECT_COLUMNS, func.now().label("as_of")).filter(Project.id == project_id).first()
+        if not project:
+            return None
+
+        book_query = session.query(*BOOK_COLUMNS).filter(Book.project_id == project_id)
+        if book_ids is not None:
+            book_ids = list(dict.fromkeys(book_ids))
+            book_query = book_query.filter(Book.id.in_(book_ids))
+        books = book_query.order_by(Book.id).all()
+        book_id_set = {book.id for book in books}
+
+        # One scope per IN chunk when documents are preselected, otherwise the whole project
+        if document_ids is None:
+            document_scopes = [Book.id.in_(list(book_id_set))] if book_ids is not None else [None]
+        else:
+            document_scopes = [Document.id.in_(chunk) for chunk in _chunked(list(dict.fromkeys(document_ids)))]
+
+        def scoped(statement):
+            for scope in document_scopes:
+                scoped_statement = statement.where(Book.project_id == project_id)
+                if scope is not None:
+                    scoped_statement = scoped_statement.where(scope)
+                yield from session.execute(scoped_statement).all()
+
+        documents = {}
+        for row in scoped(select(*DOCUMENT_COLUMNS).join(Book, Document.book_id == Book.id)):
+            if row.book_id in book_id_set:
+                documents[row.id] = row
+
+        placements = {document_id: [] for document_id in documents}
+        for row in scoped(PLACEMENT_SELECT):
+            if row.document_id in placements:
+                placements[row.document_id].append(_placement_record(row))
+
+        # Milestone values pivoted into one {milestone: value} mapping per document
+        values = {}
+        versions = {}
+        for document_id, name, value, version in scoped(
+            MILESTONE_VALUE_SELECT
+            .join(Document, MilestoneValue.document_id == Document.id)
+            .join(Book, Document.book_id == Book.id)
+            .where(MilestoneValue.project_id == project_id)
+        ):
+            if document_id in documents:
+                versions.setdefault(document_id, {})[name] = version
+                if value is not None:
+                    values.setdefault(document_id, {})[name] = value
+        details = {document_id: (MappingProxyType(values[document_id]),) if document_id in values else ()
+                   for document_id in documents}
+
+        documents_by_book = {book.id: [] for book in books}
+        for document_id, document in sorted(documents.items()):
+            documents_by_book[document.book_id].append(_document_record(
+                document,
+                placements=tuple(placements[document_id]),
+                details=details[document_id],
+                milestone_versions=MappingProxyType(versions[document_id]) if document_id in versions else None
+            ))
+
+        return ProjectSnapshot(
+            id=project.id,
+            name=project.name,
+            description=project.description,
+            books=tuple(_book_record(book, tuple(documents_by_book[book.id])) for book in books),
+            milestones=_project_milestones(session, project_id),
+            as_of=project.as_of
+        )
+
+
+# A row is stamped when it is written, not when its transaction commits, so rows stamped this long
+# before `since` are read again. A transaction that commits later than that after writing is missed
+# by refreshes; it shows up once the project is loaded again (see DB_CHANGE_OVERLAP_S)
+CHANGE_OVERLAP = timedelta(seconds=DB_CHANGE_OVERLAP_S)
+
+
+def get_project_changes(project_id: int, since=None):
+    """Rows of a project written since `since`, for patching an open view; not cached.
+
+    since is the as_of of the ProjectSnapshot or of the previous call; None returns everything.
+    Rows can be reported again by the next call (see CHANGE_OVERLAP), so applying them has to be
+    idempotent, e.g. by comparing versions. Rows committed more than CHANGE_OVERLAP after they
+    were written are not reported at all. Uses the updated_at indexes of tbldocuments,
+    tblsection_relation and tblmilestone_value.
+    """
+    with session_scope() as session:
+        as_of = session.execute(select(func.now())).scalar()  # Before the reads: later writes come next time
+        since = since - CHANGE_OVERLAP if since is not None else None
+
+        def changed(statement, column):
+            statement = statement.where(Book.project_id == project_id)
+            return session.execute(statement if since is None else statement.where(column >= since)).all()
+
+        documents = tuple(_document_record(row) for row in changed(
+            select(*DOCUMENT_COLUMNS).join(Book, Document.book_id == Book.id), Document.updated_at))
+        placements = {}
+        for row in changed(PLACEMENT_SELECT, SectionRelation.updated_at):
+            placements.setdefault(row.document_id, []).append(_placement_record(row))
+        milestone_values = tuple(tuple(row) for row in changed(
+            MILESTONE_VALUE_SELECT
+            .join(Document, MilestoneValue.document_id == Document.id)
+            .join(Book, Document.book_id == Book.id)
+            .where(MilestoneValue.project_id == project_id),
+            MilestoneValue.updated_at))
+
+        return ProjectChanges(
+            as_of=as_of,
+            documents=documents,
+            placements={document_id: tuple(rows) for document_id, rows in placements.items()},
+            milestone_values=milestone_values,
+            milestones=_project_milestones(session, project_id)
+        )
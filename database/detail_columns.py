@@ -0,0 +1,42 @@
+"""Registry of the tbldocument_detail columns, computed once at import.
+
+Readers share these instead of reflecting DocumentDetail and rebuilding column lists per call.
+Milestone values now live in tblmilestone_value; the wide milestone columns are read only by
+the legacy detail functions and by the migration (database/migrate_db.py).
+"""
+from datetime import date
+
+from sqlalchemy import select
+
+from models.models import Book, Document, DocumentDetail
+
+# Every column, in table order; detail rows are dicts with these keys
+DETAIL_COLUMNS = tuple(column.name for column in DocumentDetail.__table__.columns)
+# Keys and bookkeeping columns; everything else is a milestone
+DETAIL_METADATA_COLUMNS = frozenset({"document_detail_id", "document_id", "relation_id", "project_id", "active",
+                                     "version", "updated_at"})
+# Also the milestones every project starts with, in this order
+MILESTONE_COLUMNS = tuple(name for name in DETAIL_COLUMNS if name not in DETAIL_METADATA_COLUMNS)
+DETAIL_COLUMN_ATTRIBUTES = tuple(getattr(DocumentDetail, name) for name in DETAIL_COLUMNS)
+
+# Detail rows with their document and book joined in; callers add .where(Book.project_id == ...)
+DETAIL_SELECT = (
+    select(*DETAIL_COLUMN_ATTRIBUTES)
+    .join(Document, DocumentDetail.document_id == Document.id)
+    .join(Book, Document.book_id == Book.id)
+)
+
+
+def detail_row(row):
+    """A DETAIL_SELECT result row as a {column: value} dict."""
+    return dict(zip(DETAIL_COLUMNS, row))
+
+
+def parse_milestone_date(value):
+    """The date a milestone value holds (YYYY-MM-DD), or None for free text."""
+    if not isinstance(value, str):
+        return None
+    try:
+        return date.fromisoformat(value.strip())
+    except ValueError:
+        return None
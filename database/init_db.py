@@ -1,5 +1,8 @@
-from .db_config import engine, Base, SessionLocal
-import mysql.connector
+import sys
+from datetime import date
+
+from .db_config import engine, Base, SessionLocal, session_scope
+from .migrate_db import ensure_default_milestones, migrate_milestone_columns
 
 from sqlalchemy.orm import Session
 from sqlalchemy import select, join
@@ -80,12 +83,77 @@ def get_project_details(project_id: int):
 
 # Example Usage
 # books = get_books_by_project(1)
-# def init_db():
-#     """Creates database tables if they don't exist."""
-#     print(" Checking if tables exist...")
-#     Base.metadata.create_all(bind=engine)
-#     print(" Tables created (if missing).")
-#
-# #  Run this manually when needed
-# if __name__ == "__main__":
-#     init_db()
+def init_db(bind=engine):
+    """Creates database tables (and their indexes) if they don't exist, and the default milestones."""
+    print(" Checking if tables exist...")
+    Base.metadata.create_all(bind=bind)
+    print(" Tables created (if missing).")
+    with bind.begin() as connection:
+        ensure_default_milestones(connection)
+
+
+def seed_db():
+    """Fills an empty database with a small demo project, e.g. for a local SQLite copy."""
+    with session_scope() as session:
+        if session.query(Project.id).first():
+            print(" Database already has projects, skipping seed.")
+            return False
+
+        project = Project(name="Demo Project", description="Sample data created by init_db --seed")
+        session.add(project)
+        session.flush()
+
+        subsections = []
+        for section_name, subsection_names in (("Hardware", ("Boards", "Enclosure")),
+                                               ("Software", ("Firmware", "Tools"))):
+            section = ProjectSection(section_name=section_name)
+            session.add(section)
+            session.flush()
+            for subsection_name in subsection_names:
+                subsection = ProjectSubSection(section_id=section.section_id, subsection_name=subsection_name)
+                session.add(subsection)
+                subsections.append(subsection)
+        session.flush()
+
+        order = 0
+        for book_number in (1, 2):
+            book = Book(name=f"Book {book_number}", description=f"Demo book {book_number}", project_id=project.id)
+            session.add(book)
+            session.flush()
+            for document_number in range(1, 5):
+                document = Document(
+                    name=f"DOC-{book_number}{document_number:03}",
+                    title=f"Demo document {book_number}.{document_number}",
+                    description="Demo document",
+                    owner="demo",
+                    revision="A",
+                    state=("Draft", "Released", "Approved", "Created")[document_number % 4],
+                    releasedate=date(2025, 1, document_number),
+                    author="demo",
+                    releasetype="Initial",
+                    book_id=book.id,
+                )
+                session.add(document)
+                session.flush()
+
+                # Documents are placed through tblsection_relation rows sharing the document's ID
+                subsection = subsections[order % len(subsections)]
+                relation = SectionRelation(relation_id=document.id, section_id=subsection.section_id,
+                                           subsection_id=subsection.subsection_id, project_id=project.id,
+                                           relation_order=order)
+                session.add(relation)
+                session.flush()
+                session.add(DocumentDetail(document_id=document.id, relation_id=relation.relation_id,
+                                           project_id=project.id, active=1, M0="done", FDR1="planned"))
+                order += 1
+
+    migrate_milestone_columns()
+    print(" Demo project created.")
+    return True
+
+
+#  Run this manually when needed: python -m database.init_db [--seed]
+if __name__ == "__main__":
+    init_db()
+    if "--seed" in sys.argv:
+        seed_db()
@@ -0,0 +1,279 @@
+import contextlib
+import logging
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+
+import sqlalchemy
+from sqlalchemy import event
+
+logger = logging.getLogger("dms.sql")
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket takes everything slower
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+RECENT_QUERIES = 500  # Individual queries kept for inspection
+SLOWEST_QUERIES = 10  # Slowest queries kept per scope
+DEFAULT_SCOPE = "app"
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Frames from these files are skipped when looking for the code that issued a query
+_SKIPPED_FILES = (
+    os.path.dirname(sqlalchemy.__file__),
+    os.path.abspath(__file__),
+    os.path.join(_ROOT, "database", "db_config.py"),
+    contextlib.__file__,
+    "<sqlalchemy generated",  # Wrappers SQLAlchemy compiles at import time
+)
+
+
+def call_site():
+    """First frame outside SQLAlchemy and the database plumbing, as "path:line in function"."""
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_code.co_filename.startswith(_SKIPPED_FILES):
+        frame = frame.f_back
+    if frame is None:
+        return "unknown"
+    filename = frame.f_code.co_filename
+    if filename.startswith(_ROOT):
+        filename = os.path.relpath(filename, _ROOT)
+    return f"{filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+
+
+class QueryRecord:
+    __slots__ = ("statement", "duration_ms", "rows", "call_site", "scope", "stats")
+
+    def __init__(self, statement, duration_ms, call_site, scope, stats):
+        self.statement = statement
+        self.duration_ms = duration_ms
+        self.rows = 0
+        self.call_site = call_site
+        self.scope = scope
+        self.stats = stats
+
+    def add_rows(self, count):
+        with query_stats.lock:
+            self.rows += count
+            self.stats.rows += count
+            self.stats.by_call_site[self.call_site][2] += count
+
+
+class ScopeStats:
+    """Totals and latency histogram for the queries of one scope (usually one dialog)."""
+
+    def __init__(self, name):
+        self.name = name
+        self.queries = 0
+        self.total_ms = 0.0
+        self.rows = 0
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        self.by_call_site = {}  # call site: [queries, total_ms, rows]
+        self.slowest = []  # QueryRecords, slowest first
+
+    def add(self, record):
+        self.queries += 1
+        self.total_ms += record.duration_ms
+        self.histogram[bisect_left(HISTOGRAM_BOUNDS_MS, record.duration_ms)] += 1
+        self.by_call_site.setdefault(record.call_site, [0, 0.0, 0])
+        site = self.by_call_site[record.call_site]
+        site[0] += 1
+        site[1] += record.duration_ms
+        if len(self.slowest) < SLOWEST_QUERIES or record.duration_ms > self.slowest[-1].duration_ms:
+            self.slowest.append(record)
+            self.slowest.sort(key=lambda query: query.duration_ms, reverse=True)
+            del self.slowest[SLOWEST_QUERIES:]
+
+    def summary(self):
+        labels = [f"<={bound}ms" for bound in HISTOGRAM_BOUNDS_MS] + [f">{HISTOGRAM_BOUNDS_MS[-1]}ms"]
+        return {
+            "scope": self.name,
+            "queries": self.queries,
+            "total_ms": round(self.total_ms, 3),
+            "rows": self.rows,
+            "histogram": {label: count for label, count in zip(labels, self.histogram) if count},
+            "call_sites": {
+                site: {"queries": queries, "total_ms": round(total_ms, 3), "rows": rows}
+                for site, (queries, total_ms, rows)
+                in sorted(self.by_call_site.items(), key=lambda item: item[1][1], reverse=True)
+            },
+            "slowest": [{"ms": round(query.duration_ms, 3), "rows": query.rows, "call_site": query.call_site,
+                         "statement": " ".join(query.statement.split())[:300]} for query in self.slowest],
+        }
+
+
+class QueryStats:
+    """Process-wide query statistics, filled by the engine events installed by instrument()."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.slow_query_ms = None  # None disables the slow-query log
+        self.scopes = {}
+        self.recent = deque(maxlen=RECENT_QUERIES)
+
+    def record(self, statement, duration_ms, site, scope):
+        with self.lock:
+            if scope not in self.scopes:
+                self.scopes[scope] = ScopeStats(scope)
+            stats = self.scopes[scope]
+            record = QueryRecord(statement, duration_ms, site, scope, stats)
+            stats.add(record)
+            self.recent.append(record)
+        if self.slow_query_ms is not None and duration_ms >= self.slow_query_ms:
+            logger.warning("Slow query (%.1f ms) from %s [%s]: %s", duration_ms, site, scope,
+                           " ".join(statement.split())[:1000])
+        return record
+
+    def summary(self, scope=None):
+        """Summary of one scope, or of every scope merged when scope is None."""
+        with self.lock:
+            if scope is not None:
+                return (self.scopes.get(scope) or ScopeStats(scope)).summary()
+            merged = ScopeStats("all")
+            for stats in self.scopes.values():
+                merged.queries += stats.queries
+                merged.total_ms += stats.total_ms
+                merged.rows += stats.rows
+                merged.histogram = [a + b for a, b in zip(merged.histogram, stats.histogram)]
+                for site, (queries, total_ms, rows) in stats.by_call_site.items():
+                    totals = merged.by_call_site.setdefault(site, [0, 0.0, 0])
+                    totals[0] += queries
+                    totals[1] += total_ms
+                    totals[2] += rows
+                merged.slowest.extend(stats.slowest)
+            merged.slowest = sorted(merged.slowest, key=lambda query: query.duration_ms,
+                                    reverse=True)[:SLOWEST_QUERIES]
+            return merged.summary()
+
+    def scope_names(self):
+        with self.lock:
+            return list(self.scopes)
+
+    def reset(self, scope=None):
+        with self.lock:
+            if scope is None:
+                self.scopes.clear()
+                self.recent.clear()
+            else:
+                self.scopes.pop(scope, None)
+
+
+query_stats = QueryStats()
+_scope = threading.local()
+
+
+def current_scope():
+    stack = getattr(_scope, "stack", None)
+    return stack[-1] if stack else DEFAULT_SCOPE
+
+
+@contextmanager
+def query_scope(name):
+    """Attribute the queries run on this thread inside the block to name (e.g. a dialog class)."""
+    if not hasattr(_scope, "stack"):
+        _scope.stack = []
+    _scope.stack.append(name)
+    try:
+        yield query_stats
+    finally:
+        _scope.stack.pop()
+
+
+class CountingCursor:
+    """Wraps a DBAPI cursor so the rows SQLAlchemy fetches are added to the query's record."""
+
+    def __init__(self, cursor, record):
+        self._cursor = cursor
+        self._record = record
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._record.add_rows(1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._record.add_rows(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._record.add_rows(len(rows))
+        return rows
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._record.add_rows(1)
+            yield row
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration_ms = (time.perf_counter() - conn.info["query_started"].pop()) * 1000
+    record = query_stats.record(statement, duration_ms, call_site(), current_scope())
+    if context is not None and cursor.description is not None:
+        context.cursor = CountingCursor(cursor, record)  # Rows are counted as the result is fetched
+    elif cursor.rowcount is not None and cursor.rowcount > 0:
+        record.add_rows(cursor.rowcount)  # Rows written by INSERT/UPDATE/DELETE
+
+
+def _handle_error(context):
+    """A statement that raised never reaches after_cursor_execute; drop its start time."""
+    connection = context.connection
+    if connection is not None and context.execution_context is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+
+def instrument(engine, slow_query_ms=None):
+    """Record latency, rows and call site of every statement run on engine into query_stats."""
+    if slow_query_ms is not None:
+        query_stats.slow_query_ms = slow_query_ms
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+    return query_stats
+
+
+@contextmanager
+def capture_statements(engine, with_parameters=False):
+    """Collect the SQL statements executed on engine while the block runs, as (statement, parameters)
+    pairs if with_parameters; used by query budgets in the tests and by the benchmarks."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters) if with_parameters else statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def format_summary(scope=None):
+    """Readable multi-line summary for logs and the console."""
+    summary = query_stats.summary(scope)
+    lines = [f"{summary['scope']}: {summary['queries']} queries, {summary['total_ms']:.1f} ms, "
+             f"{summary['rows']} rows"]
+    if summary["histogram"]:
+        lines.append("  latency: " + ", ".join(f"{label} {count}" for label, count in summary["histogram"].items()))
+    for site, totals in list(summary["call_sites"].items())[:10]:
+        lines.append(f"  {totals['queries']:>5} queries {totals['total_ms']:>9.1f} ms {totals['rows']:>7} rows  {site}")
+    return "\n".join(lines)
+
+
+def dump_summary(scope=None):
+    """Log the summary of one scope, or of every scope when scope is None."""
+    names = [scope] if scope is not None else query_stats.scope_names()
+    for name in names:
+        logger.info(format_summary(name))
@@ -0,0 +1,175 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import Column, func, inspect, insert, select, text, update
+from sqlalchemy.schema import CreateColumn
+
+from database.db_config import engine, Base
+from database.detail_columns import MILESTONE_COLUMNS, parse_milestone_date
+from models.models import DocumentDetail, Milestone, MilestoneValue
+
+MIGRATION_BATCH_SIZE = 5000
+
+
+def _index_names(bind, inspector, table_name):
+    """Names of a table's indexes, including expression indexes reflection skips on SQLite and MySQL."""
+    if bind.dialect.name == "sqlite":
+        query = "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table"
+    elif bind.dialect.name == "mysql":
+        query = ("SELECT DISTINCT index_name FROM information_schema.statistics"
+                 " WHERE table_schema = DATABASE() AND table_name = :table")
+    else:
+        return {index["name"] for index in inspector.get_indexes(table_name)}
+    with bind.connect() as connection:
+        return set(connection.execute(text(query), {"table": table_name}).scalars())
+
+
+def create_missing_indexes(bind=engine):
+    """Creates the indexes declared in models.py that are missing from an existing database.
+
+    Safe to run repeatedly: indexes that already exist are left alone.
+    """
+    inspector = inspect(bind)
+    created = []
+
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            print(f" Table {table.name} does not exist, skipping.")
+            continue
+
+        existing = _index_names(bind, inspector, table.name)
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if index.name in existing:
+                continue
+            index.create(bind=bind)
+            created.append(index.name)
+            print(f" Created index {index.name} on {table.name}.")
+
+    return created
+
+
+def _default_allowed_in_add_column(column, dialect):
+    """Whether ALTER TABLE ... ADD COLUMN accepts the column's server default on dialect.
+
+    SQLite only takes constant defaults there, not expressions such as CURRENT_TIMESTAMP.
+    """
+    default = column.server_default
+    return default is None or isinstance(default.arg, str) or dialect.name != "sqlite"
+
+
+def add_missing_columns(bind=engine):
+    """Adds the columns declared in models.py that are missing from existing tables.
+
+    Only columns an existing row can get a value for are added: nullable ones or ones with a
+    server default, such as the version columns. A default the database cannot add a column with
+    (e.g. updated_at's CURRENT_TIMESTAMP on SQLite) is written into the existing rows instead, and
+    the column stays nullable there; the models fill it on every insert and update. Returns the
+    added columns as "table.column".
+    """
+    added = []
+
+    with bind.begin() as connection:
+        inspector = inspect(connection)
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not (column.nullable or column.server_default is not None):
+                    continue
+                if _default_allowed_in_add_column(column, bind.dialect):
+                    definition = CreateColumn(column).compile(dialect=bind.dialect)
+                    connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {definition}"))
+                else:
+                    plain = Column(column.name, column.type, nullable=True)
+                    definition = CreateColumn(plain).compile(dialect=bind.dialect)
+                    connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {definition}"))
+                    connection.execute(update(table).values({column.name: column.server_default.arg}))
+                added.append(f"{table.name}.{column.name}")
+                print(f" Added column {column.name} to {table.name}.")
+
+    return added
+
+
+def ensure_default_milestones(connection):
+    """Adds the milestones every project has (the old tbldocument_detail columns) if missing.
+
+    Returns {name: milestone_id} of the default milestones.
+    """
+    existing = dict(connection.execute(
+        select(Milestone.name, Milestone.milestone_id).where(Milestone.project_id.is_(None))
+    ).all())
+    missing = [{"project_id": None, "name": name, "position": position}
+               for position, name in enumerate(MILESTONE_COLUMNS) if name not in existing]
+    if missing:
+        connection.execute(insert(Milestone), missing)
+        existing = dict(connection.execute(
+            select(Milestone.name, Milestone.milestone_id).where(Milestone.project_id.is_(None))
+        ).all())
+    return existing
+
+
+def migrate_milestone_columns(bind=engine, batch_size=MIGRATION_BATCH_SIZE):
+    """Copies the milestone columns of tbldocument_detail into tblmilestone_value.
+
+    Only cells without a tblmilestone_value row are copied, so this is safe to run repeatedly
+    and picks up wide rows imported later, while values edited (or cleared) in the app are left
+    alone. Empty cells are not copied, and when a document has several detail rows in a project
+    the first one with a value wins, as the UI showed it. Returns the number of values written.
+    """
+    Base.metadata.create_all(bind=bind, tables=[Milestone.__table__, MilestoneValue.__table__])
+    milestone_columns = [getattr(DocumentDetail, name) for name in MILESTONE_COLUMNS]
+    written = 0
+
+    with bind.begin() as connection:
+        milestone_ids = ensure_default_milestones(connection)
+        column_ids = [milestone_ids[name] for name in MILESTONE_COLUMNS]
+
+        # Read in ranges of document IDs: MySQL cannot insert while a streamed result is open
+        last_document_id = connection.execute(select(func.max(DocumentDetail.document_id))).scalar() or 0
+        for start in range(0, last_document_id, batch_size):
+            rows = connection.execute(
+                select(DocumentDetail.document_id, DocumentDetail.project_id, *milestone_columns)
+                .where(DocumentDetail.document_id > start, DocumentDetail.document_id <= start + batch_size)
+                .order_by(DocumentDetail.document_id, DocumentDetail.project_id, DocumentDetail.document_detail_id)
+            ).all()
+
+            # Cells already in tblmilestone_value, filled here or in the app
+            seen = set(connection.execute(
+                select(MilestoneValue.document_id, MilestoneValue.project_id, MilestoneValue.milestone_id)
+                .where(MilestoneValue.document_id > start, MilestoneValue.document_id <= start + batch_size)
+            ).all())
+            values = []
+            for row in rows:
+                document_id, project_id = row[0], row[1]
+                for milestone_id, value in zip(column_ids, row[2:]):
+                    if value is None or value == "" or (document_id, project_id, milestone_id) in seen:
+                        continue
+                    seen.add((document_id, project_id, milestone_id))
+                    values.append({"document_id": document_id, "project_id": project_id,
+                                   "milestone_id": milestone_id, "value": value,
+                                   "value_date": parse_milestone_date(value)})
+            if values:
+                connection.execute(insert(MilestoneValue), values)
+                written += len(values)
+
+    return written
+
+
+def upgrade_database(bind=engine):
+    """Brings an existing database up to models.py: columns first, so the indexes on them
+    (e.g. the *_updated ones on updated_at) can be created, then the milestone values."""
+    print(" Checking columns...")
+    added_columns = add_missing_columns(bind)
+    print(f" Done, {len(added_columns)} column(s) added.")
+    print(" Checking indexes...")
+    created_indexes = create_missing_indexes(bind)
+    print(f" Done, {len(created_indexes)} index(es) created.")
+    print(" Moving milestone values to tblmilestone_value...")
+    print(f" Done, {migrate_milestone_columns(bind)} value(s) copied.")
+
+
+#  Run this manually after pulling schema changes
+if __name__ == "__main__":
+    upgrade_database()
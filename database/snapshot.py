@@ -0,0 +1,174 @@
+import sys
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from types import MappingProxyType
+from typing import NamedTuple, Optional
+
+
+def intern_text(value):
+    """Share one copy of repeated strings (states, owners, release types) between records."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(frozen=True, slots=True)
+class SectionPlacement:
+    """Where a document sits in the project: section, subsection and order."""
+    relation_id: int
+    section: str
+    subsection: str
+    relation_order: int
+    version: int = 1  # tblsection_relation.version, for compare-and-swap updates
+
+
+@dataclass(frozen=True, slots=True)
+class DocumentSnapshot:
+    """Read-only copy of a tbldocuments row with its placements and detail rows."""
+    id: int
+    name: str
+    title: Optional[str]
+    description: Optional[str]
+    owner: Optional[str]
+    revision: Optional[str]
+    state: Optional[str]
+    releasedate: Optional[date]
+    author: Optional[str]
+    approveddate: Optional[date]
+    createdon: Optional[date]
+    releasetype: Optional[str]
+    book_id: int
+    version: int = 1  # tbldocuments.version, for compare-and-swap updates
+    placements: tuple = ()
+    details: tuple = ()  # One MappingProxyType {milestone: value} if the document has milestone values
+    milestone_versions: Optional[MappingProxyType] = None  # {milestone: version} of those values
+
+
+class MilestoneConflict(NamedTuple):
+    """A milestone cell someone else changed since it was loaded; it was not saved."""
+    document_id: int
+    milestone: str
+    value: Optional[str]  # The value that was not saved
+    their_value: Optional[str]  # What the database holds now; None if the cell was cleared
+    their_version: Optional[int]
+
+
+class MilestoneSaveResult(NamedTuple):
+    """Outcome of save_milestone_values."""
+    versions: dict  # {(document_id, milestone): version now in the database, None if cleared}
+    conflicts: list  # MilestoneConflict per cell that was left alone
+
+
+class ProjectChanges(NamedTuple):
+    """Rows of a project changed since a point in time, see db_methods.get_project_changes."""
+    as_of: datetime  # Database time of this read; pass it as since to the next call
+    documents: tuple  # DocumentSnapshot per changed tbldocuments row, without placements or details
+    placements: dict  # {document_id: (SectionPlacement, ...)} of changed tblsection_relation rows
+    milestone_values: tuple  # (document_id, milestone, value, version); value None for a cleared cell
+    milestones: tuple  # All milestone names of the project, as in ProjectSnapshot.milestones
+
+
+class DocumentSummary(NamedTuple):
+    """The tbldocuments columns the document picker lists, searches and groups by.
+
+    A named tuple rather than a dataclass: whole projects of these are built at once, and a
+    tuple is about four times cheaper to construct.
+    """
+    id: int
+    book_id: int
+    name: str
+    title: Optional[str]
+    description: Optional[str]
+    revision: Optional[str]
+    owner: Optional[str]
+    state: Optional[str]
+
+
+@dataclass(frozen=True, slots=True)
+class BookSnapshot:
+    """Read-only copy of a tblbooks row with its documents."""
+    id: int
+    name: str
+    description: Optional[str]
+    project_id: int
+    documents: tuple = ()
+
+
+@dataclass(frozen=True, slots=True)
+class ProjectSnapshot:
+    """Immutable project graph: project -> books -> documents -> placements and details."""
+    id: int
+    name: str
+    description: Optional[str]
+    books: tuple = ()
+    milestones: tuple = ()  # Milestone names of the project, in display order
+    as_of: Optional[datetime] = None  # Database time of the load; get_project_changes(since=as_of) follows up
+    books_by_id: MappingProxyType = field(init=False, repr=False, compare=False)
+    documents_by_id: MappingProxyType = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "books_by_id", MappingProxyType({book.id: book for book in self.books}))
+        object.__setattr__(self, "documents_by_id", MappingProxyType(
+            {document.id: document for book in self.books for document in book.documents}
+        ))
+
+    def book_data(self, book_ids=None):
+        """Build the {book_id: {"book_name", "documents"}} mapping used by ChooseDocuments."""
+        books = self.books if book_ids is None else [self.books_by_id[book_id] for book_id in book_ids
+                                                     if book_id in self.books_by_id]
+        return {book.id: {"book_name": book.name, "documents": list(book.documents)} for book in books}
+
+    def project_details(self, document_ids):
+        """Same structure as db_methods.get_project_details, with "details" attached to each document."""
+        rows = []
+        for document_id in dict.fromkeys(document_ids):
+            document = self.documents_by_id.get(document_id)
+            if document is None:
+                continue
+            for placement in document.placements:
+                rows.append((placement.relation_order, document, placement))
+        rows.sort(key=lambda row: row[0])
+
+        books_data = {}
+        for _, document, placement in rows:
+            book = self.books_by_id[document.book_id]
+            if book.id not in books_data:
+                books_data[book.id] = {
+                    "book_name": book.name,
+                    "documents": []
+                }
+
+            books_data[book.id]["documents"].append({
+                "document_id": document.id,
+                "version": document.version,
+                "title": document.title,
+                "doc": document.name,
+                "cur_rev": document.revision,
+                "description": document.description,
+                "state": document.state,
+                "owner": document.owner,
+                "release_date": document.releasedate,
+                "author": document.author,
+                "approved_date": document.approveddate,
+                "release_type": document.releasetype,
+                "section": placement.section,
+                "subsection": placement.subsection,
+                "relation_order": placement.relation_order,
+                "details": [dict(detail) for detail in document.details],
+                "milestone_versions": dict(document.milestone_versions or {})
+            })
+
+        return {
+            "project": {"project_name": self.name},
+            "books": books_data,
+        }
+
+
+def selected_document_ids(selected_documents: dict):
+    """Extract document IDs from a {book_id: {"documents": [...]}} selection of objects or dicts."""
+    document_ids = []
+    for book_data in selected_documents.values():
+        for document in book_data["documents"]:
+            if isinstance(document, dict):
+                document_ids.append(document["document_id"])
+            else:
+                document_ids.append(document.id)
+    return document_ids
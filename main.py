@@ -1,6 +1,7 @@
 import sys
 from PyQt6.QtWidgets import QApplication
 from views.main_window import MainWindow
+from database.db_config import start_pool_warm_up
 
 import os
 
@@ -19,6 +20,9 @@ if __name__ == "__main__":
     app = QApplication(sys.argv)
     load_stylesheet(app)
 
+    # Open database connections in the background while the UI starts
+    start_pool_warm_up()
+
     window = MainWindow()
     window.show()
 
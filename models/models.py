@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, DateTime, Text, Index, func
 from sqlalchemy.orm import relationship
 from database.db_config import Base  # Import `Base`
 
@@ -10,6 +10,10 @@ class Project(Base):
     name = Column(String(500), nullable=False)
     description = Column(String(1000), nullable=True)
 
+    __table_args__ = (
+        Index("ix_tblproject_name", "name", mysql_length=255),
+    )
+
     # A project has many books
     books = relationship("Book", back_populates="project", cascade="all, delete-orphan")
     section_relations = relationship("SectionRelation", back_populates="project", cascade="all, delete-orphan")
@@ -24,6 +28,10 @@ class Book(Base):
     description = Column(String(1000), nullable=True)
     project_id = Column(Integer, ForeignKey('tblproject.id', ondelete='CASCADE', onupdate='CASCADE'))
 
+    __table_args__ = (
+        Index("ix_tblbooks_project_id", "project_id"),
+    )
+
     # Relationships
     project = relationship("Project", back_populates="books")
     documents = relationship("Document", back_populates="book", cascade="all, delete-orphan")
@@ -46,6 +54,16 @@ class Document(Base):
     createdon = Column(Date)
     releasetype = Column(String(255))
     book_id = Column(Integer, ForeignKey('tblbooks.id', ondelete='CASCADE', onupdate='CASCADE'))
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Bumped on every update
+    updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now(),
+                        server_default=func.now())  # Database clock; read by get_project_changes
+
+    __table_args__ = (
+        Index("ix_tbldocuments_book_id", "book_id"),
+        Index("ix_tbldocuments_book_updated", "book_id", "updated_at"),
+    )
+    # Optimistic concurrency: updates compare the version and fail with StaleDataError if it moved
+    __mapper_args__ = {"version_id_col": version}
 
     # Relationships
     book = relationship("Book", back_populates="documents")
@@ -61,6 +79,9 @@ class DocumentDetail(Base):
     relation_id = Column(Integer, ForeignKey('tblsection_relation.relation_id', ondelete='CASCADE', onupdate='CASCADE'), nullable=True)
     project_id = Column(Integer,ForeignKey('tblproject.id', ondelete='CASCADE', onupdate='CASCADE'), nullable=False)
     active = Column(Integer, nullable=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Bumped on every update
+    updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now(),
+                        server_default=func.now())  # Database clock; read by get_project_changes
 
     # Text fields (Optional fields)
     M0 = Column(Text, nullable=True)
@@ -84,12 +105,67 @@ class DocumentDetail(Base):
     SW3337 = Column(Text, nullable=True)
     SW33377 = Column(Text, nullable=True)
     SW33396 = Column(String(255), nullable=True)
+
+    __table_args__ = (
+        Index("ix_tbldocument_detail_document_project", "document_id", "project_id"),
+        Index("ix_tbldocument_detail_relation_id", "relation_id"),
+        Index("ix_tbldocument_detail_project_id", "project_id"),
+    )
+    __mapper_args__ = {"version_id_col": version}
+
     # Relationships
     document = relationship("Document", back_populates="document_details")
     section_relation = relationship("SectionRelation", back_populates="document_details")
     project = relationship("Project", back_populates="document_details")  # <-- Proper relationship
 
 
+class Milestone(Base):
+    """Milestone dictionary: the milestone columns projects show, in display order."""
+    __tablename__ = 'tblmilestone'
+
+    milestone_id = Column(Integer, primary_key=True, autoincrement=True)
+    # NULL for the milestones every project has; added milestones belong to one project
+    project_id = Column(Integer, ForeignKey('tblproject.id', ondelete='CASCADE', onupdate='CASCADE'), nullable=True)
+    name = Column(String(255), nullable=False)
+    position = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_tblmilestone_project_name", "project_id", "name", unique=True),
+        # The index above counts NULLs as distinct; here project 0 stands in for the default milestones
+        Index("ix_tblmilestone_scope_name", func.coalesce(project_id, 0), "name", unique=True),
+    )
+
+    # Relationships
+    values = relationship("MilestoneValue", back_populates="milestone", cascade="all, delete-orphan")
+
+
+class MilestoneValue(Base):
+    """One milestone value of a document; replaces the milestone columns of tbldocument_detail."""
+    __tablename__ = 'tblmilestone_value'
+
+    milestone_value_id = Column(Integer, primary_key=True, autoincrement=True)
+    document_id = Column(Integer, ForeignKey('tbldocuments.id', ondelete='CASCADE', onupdate='CASCADE'), nullable=False)
+    project_id = Column(Integer, ForeignKey('tblproject.id', ondelete='CASCADE', onupdate='CASCADE'), nullable=False)
+    milestone_id = Column(Integer, ForeignKey('tblmilestone.milestone_id', ondelete='CASCADE', onupdate='CASCADE'),
+                          nullable=False)
+    value = Column(Text, nullable=True)
+    value_date = Column(Date, nullable=True)  # The value as a date, when it is one
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Bumped on every update
+    updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now(),
+                        server_default=func.now())  # Database clock; read by get_project_changes
+
+    __table_args__ = (
+        Index("ix_tblmilestone_value_project_milestone", "project_id", "milestone_id"),
+        Index("ix_tblmilestone_value_project_updated", "project_id", "updated_at"),
+        Index("ix_tblmilestone_value_document_project_milestone", "document_id", "project_id", "milestone_id",
+              unique=True),
+    )
+    __mapper_args__ = {"version_id_col": version}
+
+    # Relationships
+    milestone = relationship("Milestone", back_populates="values")
+
+
 class ProjectSection(Base):
     """Sections within the project."""
     __tablename__ = 'tblproject_section'
@@ -111,6 +187,10 @@ class ProjectSubSection(Base):
     subsection_name = Column(String(255), nullable=False)
     subsection_desc = Column(Text, nullable=True)
 
+    __table_args__ = (
+        Index("ix_tblproject_subsection_section_id", "section_id"),
+    )
+
     # Relationships
     section = relationship("ProjectSection", back_populates="subsections")
 
@@ -124,6 +204,17 @@ class SectionRelation(Base):
     subsection_id = Column(Integer, ForeignKey('tblproject_subsection.subsection_id', ondelete='CASCADE', onupdate='CASCADE'))
     project_id = Column(Integer, ForeignKey('tblproject.id', ondelete='CASCADE', onupdate='CASCADE'))
     relation_order = Column(Integer, nullable=False)
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Bumped on every update
+    updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now(),
+                        server_default=func.now())  # Database clock; read by get_project_changes
+
+    __table_args__ = (
+        Index("ix_tblsection_relation_project_order", "project_id", "relation_order"),
+        Index("ix_tblsection_relation_project_updated", "project_id", "updated_at"),
+        Index("ix_tblsection_relation_section_id", "section_id"),
+        Index("ix_tblsection_relation_subsection_id", "subsection_id"),
+    )
+    __mapper_args__ = {"version_id_col": version}
 
     # Relationships
     project = relationship("Project")
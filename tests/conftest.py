@@ -0,0 +1,110 @@
+import os
+from contextlib import contextmanager
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+
+from database.cache import project_cache
+from database.db_config import Base, SessionLocal, make_engine
+from database.db_methods import get_books_by_project, get_documents_by_book
+from database.instrumentation import capture_statements
+from database.migrate_db import migrate_milestone_columns
+from models.models import (Project, Book, Document, DocumentDetail,
+                           ProjectSection, ProjectSubSection, SectionRelation)
+
+
+@pytest.fixture
+def db_engine():
+    """In-memory SQLite database bound to the app's SessionLocal for the duration of a test."""
+    engine = make_engine("sqlite://", echo=False)
+    Base.metadata.create_all(bind=engine)
+    previous_bind = SessionLocal.kw.get("bind")
+    SessionLocal.configure(bind=engine)
+    project_cache.clear()  # Entries of an earlier test's database
+    yield engine
+    SessionLocal.configure(bind=previous_bind)
+    project_cache.clear()
+    engine.dispose()
+
+
+@pytest.fixture
+def query_log(db_engine):
+    """List collecting every SQL statement executed against the test database."""
+    with capture_statements(db_engine) as statements:
+        yield statements
+
+
+@pytest.fixture
+def max_queries(db_engine):
+    """Context manager failing the test if the block runs more than limit SQL statements.
+
+        with max_queries(5):
+            ChooseBooks(project_id)
+    """
+    @contextmanager
+    def guard(limit):
+        with capture_statements(db_engine) as statements:
+            yield statements
+        assert len(statements) <= limit, (
+            f"{len(statements)} queries, expected at most {limit}:\n" +
+            "\n".join(f"  {' '.join(statement.split())[:200]}" for statement in statements)
+        )
+
+    return guard
+
+
+@pytest.fixture
+def seed_project(db_engine):
+    """Factory creating a project with the given number of books and documents per book."""
+    def seed(name="Test Project", books=2, documents_per_book=3):
+        session = SessionLocal()
+        try:
+            project = Project(name=name, description=f"{name} description")
+            section = ProjectSection(section_name=f"{name} Section")
+            session.add_all([project, section])
+            session.flush()
+            subsection = ProjectSubSection(section_id=section.section_id, subsection_name=f"{name} Subsection")
+            session.add(subsection)
+            session.flush()
+
+            order = 0
+            for book_index in range(books):
+                book = Book(name=f"Book {book_index}", project_id=project.id)
+                session.add(book)
+                session.flush()
+                for document_index in range(documents_per_book):
+                    document = Document(name=f"DOC-{book_index}-{document_index}",
+                                        title=f"Title {book_index}-{document_index}",
+                                        state="Released", owner="owner", book_id=book.id)
+                    session.add(document)
+                    session.flush()
+                    # get_project_details joins tblsection_relation.relation_id on tbldocuments.id
+                    relation = SectionRelation(relation_id=document.id, section_id=section.section_id,
+                                               subsection_id=subsection.subsection_id,
+                                               project_id=project.id, relation_order=order)
+                    session.add(relation)
+                    session.flush()
+                    session.add(DocumentDetail(document_id=document.id, relation_id=relation.relation_id,
+                                               project_id=project.id, M0=f"m0-{document.id}"))
+                    order += 1
+
+            session.commit()
+        finally:
+            session.close()
+        migrate_milestone_columns(db_engine)  # The app reads milestones from tblmilestone_value
+        return project.id
+
+    return seed
+
+
+@pytest.fixture
+def select_all_documents(db_engine):
+    """Build the selected_documents mapping ChooseDocuments hands to ProjectWindow."""
+    def select(project_id):
+        return {
+            book.id: {"book_name": book.name, "documents": get_documents_by_book(book.id)}
+            for book in get_books_by_project(project_id)
+        }
+
+    return select
@@ -0,0 +1,78 @@
+import threading
+
+import pytest
+
+pytest.importorskip("PyQt6")
+from PyQt6.QtWidgets import QApplication
+
+from views.worker import run_in_background, wait_for_background_tasks
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+def test_result_is_delivered_on_the_gui_thread(qapp):
+    results = []
+    run_in_background(lambda: threading.current_thread() is threading.main_thread(),
+                      on_result=lambda worker_on_main: results.append(
+                          (worker_on_main, threading.current_thread() is threading.main_thread())))
+    wait_for_background_tasks()
+    assert results == [(False, True)]
+
+
+def test_cancelled_task_result_is_discarded(qapp):
+    started, release = threading.Event(), threading.Event()
+    results = []
+
+    def slow_query():
+        started.set()
+        release.wait(5)
+        return "late"
+
+    task = run_in_background(slow_query, on_result=results.append)
+    started.wait(5)
+    task.cancel()  # Query already running: its result must be dropped
+    release.set()
+    wait_for_background_tasks()
+    assert results == []
+
+
+def test_failures_without_on_error_are_logged(qapp, caplog):
+    def failing_query():
+        raise ConnectionError("server gone")
+
+    with caplog.at_level("ERROR", logger="dms.ui"):
+        run_in_background(failing_query, on_result=lambda result: None)
+        wait_for_background_tasks()
+    assert "failing_query failed: server gone" in caplog.text
+
+
+def test_choose_books_loads_in_background_and_back_cancels(qapp, seed_project):
+    from views.OpenProject.choose_books import ChooseBooks
+    project_id = seed_project(books=3, documents_per_book=2)
+
+    dialog = ChooseBooks(project_id)
+    assert not dialog.next_btn.isEnabled()
+    wait_for_background_tasks()
+    assert dialog.next_btn.isEnabled()
+    assert [book.name for book in dialog.books] == ["Book 0", "Book 1", "Book 2"]
+    assert dialog.project_table.rowCount() == 3
+
+    dialog = ChooseBooks(project_id)
+    dialog.reject()
+    wait_for_background_tasks()
+    assert dialog.project is None
+    assert dialog.project_table.rowCount() == 0
+
+
+def test_choose_sections_loads_when_no_snapshot_is_passed(qapp, seed_project, select_all_documents):
+    from views.OpenProject.choose_sections import ChooseSections
+    project_id = seed_project(books=2, documents_per_book=2)
+
+    dialog = ChooseSections(select_all_documents(project_id), project_id)
+    assert dialog.document_model.rowCount() == 0
+    wait_for_background_tasks()
+    assert dialog.document_model.rowCount() == 4
+    assert dialog.next_btn.isEnabled()
@@ -0,0 +1,74 @@
+import pytest
+
+from database.db_methods import get_document_details, get_document_details_bulk
+
+
+def test_bulk_details_match_single_document_lookup(seed_project, select_all_documents):
+    project_id = seed_project(books=2, documents_per_book=3)
+    selected = select_all_documents(project_id)
+    document_ids = [doc.id for book in selected.values() for doc in book["documents"]]
+
+    details = get_document_details_bulk(project_id, document_ids)
+
+    assert list(details) == document_ids
+    for book_id, book in selected.items():
+        for doc in book["documents"]:
+            assert details[doc.id] == get_document_details(project_id, book_id, doc.id)
+
+
+def test_bulk_details_ignore_other_projects(seed_project, select_all_documents):
+    project_id = seed_project(name="First")
+    other_project_id = seed_project(name="Second")
+    other_ids = [doc.id for book in select_all_documents(other_project_id).values() for doc in book["documents"]]
+
+    details = get_document_details_bulk(project_id, other_ids)
+
+    assert all(rows == [] for rows in details.values())
+
+
+def test_bulk_details_chunk_large_selections(seed_project, select_all_documents, query_log, monkeypatch):
+    monkeypatch.setattr("database.db_methods.DOCUMENT_ID_CHUNK_SIZE", 4)
+    project_id = seed_project(books=2, documents_per_book=5)
+    document_ids = [doc.id for book in select_all_documents(project_id).values() for doc in book["documents"]]
+    query_log.clear()
+
+    details = get_document_details_bulk(project_id, document_ids)
+
+    assert len(query_log) == 3
+    assert sum(len(rows) for rows in details.values()) == len(document_ids)
+
+
+def test_project_window_query_count_is_independent_of_document_count(seed_project, select_all_documents, query_log):
+    pytest.importorskip("PyQt6")
+    from PyQt6.QtWidgets import QApplication
+    from views.OpenProject.project_window import ProjectWindow
+    from views.worker import wait_for_background_tasks
+
+    app = QApplication.instance() or QApplication([])
+
+    counts = []
+    for documents_per_book in (2, 20):
+        project_id = seed_project(name=f"Project {documents_per_book}", documents_per_book=documents_per_book)
+        selected = select_all_documents(project_id)
+        query_log.clear()
+        window = ProjectWindow(project_id, selected)
+        wait_for_background_tasks()
+        counts.append(len(query_log))
+        window.deleteLater()
+
+    assert counts[0] == counts[1] > 0
+
+
+def test_detail_column_registry(seed_project, select_all_documents):
+    from sqlalchemy import inspect
+    from database.detail_columns import DETAIL_COLUMNS, MILESTONE_COLUMNS
+    from models.models import DocumentDetail
+
+    assert DETAIL_COLUMNS == tuple(column.name for column in inspect(DocumentDetail).columns)
+    assert "M0" in MILESTONE_COLUMNS and "document_id" not in MILESTONE_COLUMNS
+
+    project_id = seed_project(books=1, documents_per_book=1)
+    document = select_all_documents(project_id)
+    document_id = next(iter(document.values()))["documents"][0].id
+    details = get_document_details_bulk(project_id, [document_id])[document_id]
+    assert tuple(details[0]) == DETAIL_COLUMNS
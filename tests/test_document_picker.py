@@ -0,0 +1,136 @@
+import pytest
+
+pytest.importorskip("PyQt6")
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication
+
+from database.db_methods import load_project_snapshot
+from views.OpenProject.checkable_table import CheckableTableModel, SearchIndex
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+def make_model(count):
+    return CheckableTableModel(["Document"], [(f"DOC-{row}",) for row in range(count)], list(range(count)))
+
+
+def test_check_state_round_trip(qapp):
+    model = make_model(5)
+    index = model.index(2, model.check_column)
+
+    assert model.flags(index) & Qt.ItemFlag.ItemIsUserCheckable
+    assert model.data(index, Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Unchecked
+    assert model.setData(index, Qt.CheckState.Checked.value, Qt.ItemDataRole.CheckStateRole)
+    assert model.data(index, Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+    assert model.checked_items() == [2]
+
+
+def test_select_all_emits_one_data_changed(qapp):
+    model = make_model(20000)
+    changes = []
+    model.dataChanged.connect(lambda top_left, bottom_right, roles: changes.append((top_left.row(),
+                                                                                      bottom_right.row())))
+    model.set_all_checked(True)
+    assert changes == [(0, 19999)]
+    assert len(model.checked_rows()) == 20000
+
+    model.set_all_checked(False)
+    assert len(changes) == 2
+    assert model.checked_rows() == []
+
+
+def test_search_index_prefix_and_substring():
+    index = SearchIndex(["Alpha", "beta", "ALPHABET", None, "gamma alpha"])
+
+    assert sorted(index.prefix_rows("alp")) == [0, 2]
+    assert index.prefix_rows("") == [3, 0, 2, 1, 4]
+    assert index.substring_rows("alpha") == [0, 2, 4]
+    assert index.substring_rows("alphab") == [2]
+    assert index.substring_rows("eta") == [1]
+
+
+def test_filtered_rows_keep_source_check_state(qapp):
+    model = make_model(6)
+    model.set_visible_rows([1, 3, 5])
+    assert model.rowCount() == 3
+    assert model.data(model.index(1, 0)) == "DOC-3"
+
+    model.setData(model.index(2, model.check_column), Qt.CheckState.Checked, Qt.ItemDataRole.CheckStateRole)
+    model.set_visible_rows(None)
+    assert model.rowCount() == 6
+    assert model.checked_rows() == [5]
+
+
+def book_data(snapshot):
+    return {book.id: {"book_name": book.name, "documents": list(book.documents)} for book in snapshot.books}
+
+
+def test_choose_documents_returns_checked_ids(qapp, seed_project):
+    from views.OpenProject.choose_documents import ChooseDocuments
+    snapshot = load_project_snapshot(seed_project(books=2, documents_per_book=3))
+    dialog = ChooseDocuments(book_data(snapshot), snapshot.id, snapshot=snapshot)
+
+    dialog.document_model.set_rows_checked([0, 4])
+    first, fifth = dialog.document_model.items[0], dialog.document_model.items[4]
+    assert dialog.selected_document_ids() == [first.id, fifth.id]
+
+    dialog.select_all_documents()
+    assert dialog.selected_document_ids() == list(snapshot.documents_by_id)
+
+
+def test_choose_sections_proceeds_with_checked_documents(qapp, seed_project, monkeypatch):
+    from views.OpenProject import choose_sections
+    opened = []
+    monkeypatch.setattr(choose_sections.ProjectWindow, "exec", lambda window: opened.append(window))
+
+    snapshot = load_project_snapshot(seed_project(books=2, documents_per_book=3))
+    dialog = choose_sections.ChooseSections(book_data(snapshot), snapshot.id, snapshot=snapshot)
+    dialog.document_model.set_rows_checked([1])
+    dialog.proceed()
+
+    checked = dialog.document_model.items[1]
+    assert len(opened) == 1
+    assert [document["document_id"] for book in dialog.selected.values() for document in book["documents"]] \
+        == [checked["document_id"]]
+
+
+def test_filtered_documents_keep_table_order_and_book_labels(qapp, seed_project):
+    from database.db_config import session_scope
+    from models.models import Document
+    from views.OpenProject.choose_documents import ChooseDocuments
+    project_id = seed_project(books=2, documents_per_book=3)
+    with session_scope() as session:  # Titles sort in reverse table order
+        for document in session.query(Document):
+            document.title = f"Title {100 - document.id}"
+    snapshot = load_project_snapshot(project_id)
+    dialog = ChooseDocuments(book_data(snapshot), snapshot.id, snapshot=snapshot)
+    model = dialog.document_model
+    unfiltered = [(model.data(model.index(row, 0)), model.data(model.index(row, 1))) for row in range(6)]
+
+    dialog.search_input.setText("title")
+    dialog.apply_filters()
+
+    assert [(model.data(model.index(row, 0)), model.data(model.index(row, 1)))
+            for row in range(model.rowCount())] == unfiltered
+    assert [label for label, _ in unfiltered] == ["Book 0", "", "", "Book 1", "", ""]
+
+
+def test_choose_documents_filters_by_title_prefix_and_state(qapp, seed_project):
+    from views.OpenProject.choose_documents import ChooseDocuments
+    snapshot = load_project_snapshot(seed_project(books=2, documents_per_book=3))
+    dialog = ChooseDocuments(book_data(snapshot), snapshot.id, snapshot=snapshot)
+
+    dialog.search_input.setText("TITLE 1-")
+    assert dialog.filter_timer.isActive()
+    dialog.apply_filters()
+    assert [dialog.document_model.data(dialog.document_model.index(row, 1))
+            for row in range(dialog.document_model.rowCount())] == ["DOC-1-0", "DOC-1-1", "DOC-1-2"]
+
+    dialog.release_state_combo.setCurrentText("Draft")
+    assert dialog.document_model.rowCount() == 0
+    dialog.search_input.setText("")
+    dialog.release_state_combo.setCurrentText("All States")
+    assert dialog.document_model.rowCount() == 6
@@ -0,0 +1,347 @@
+import pytest
+
+pytest.importorskip("PyQt6")
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication
+
+from views.OpenProject.document_table import DocumentTableModel, DocumentTableView, BASE_HEADERS
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+def make_documents(count):
+    return [{"doc": f"DOC-{number}", "title": f"Title {number}", "state": "Draft", "owner": "owner",
+             "release_date": None, "details": [{"M0": f"2024-01-0{number % 9 + 1}"}]}
+            for number in range(count)]
+
+
+def names(model):
+    return [document["doc"] for document in model.documents]
+
+
+def test_model_exposes_documents_and_milestones(qapp):
+    model = DocumentTableModel(make_documents(3), ["M0"])
+    assert model.rowCount() == 3
+    assert model.columnCount() == len(BASE_HEADERS) + 1
+    assert model.data(model.index(1, 0)) == "DOC-1"
+    assert model.data(model.index(1, len(BASE_HEADERS))) == "2024-01-02"
+    assert not model.flags(model.index(0, 0)) & Qt.ItemFlag.ItemIsEditable
+    assert model.setData(model.index(0, len(BASE_HEADERS)), "done")
+    assert model.milestone_values[0]["M0"] == "done"
+
+
+def test_model_tracks_only_changed_cells(qapp):
+    documents = make_documents(2)
+    documents[0]["document_id"] = 10
+    documents[0]["milestone_versions"] = {"M0": 4}
+    model = DocumentTableModel(documents, ["M0"])
+    cell = model.index(0, len(BASE_HEADERS))
+
+    assert not model.setData(cell, "2024-01-01")  # Same value
+    assert model.pending_changes() == []
+    model.setData(cell, "done")
+    model.setData(model.index(1, len(BASE_HEADERS)), "done")  # No document_id: not saved
+    assert model.pending_changes() == [(10, "M0", "done", 4)]
+    model.setData(cell, "2024-01-01")
+    assert model.pending_changes() == []
+
+    model.setData(cell, "done")
+    model.setData(cell, "later")
+    model.mark_saved([(10, "M0", "done", 4)], {(10, "M0"): 5})  # Edited again while saving
+    assert model.pending_changes() == [(10, "M0", "later", 5)]
+    model.mark_saved(model.pending_changes(), {})  # A conflict: stays dirty
+    assert model.pending_changes() == [(10, "M0", "later", 5)]
+    model.mark_saved(model.pending_changes(), {(10, "M0"): 6})
+    assert model.changes == {} and documents[0]["milestone_versions"] == {"M0": 6}
+
+
+def test_move_remove_and_append_rows(qapp):
+    model = DocumentTableModel(make_documents(4), ["M0"])
+    model.move_row(0, 3)
+    assert names(model) == ["DOC-1", "DOC-2", "DOC-0", "DOC-3"]
+    model.move_row(3, 0)
+    assert names(model) == ["DOC-3", "DOC-1", "DOC-2", "DOC-0"]
+    assert model.milestone_values[0]["M0"] == "2024-01-04"
+
+    model.remove_rows([1, 2])
+    assert names(model) == ["DOC-3", "DOC-0"]
+    model.append_documents(make_documents(1))
+    assert names(model) == ["DOC-3", "DOC-0", "DOC-0"]
+    assert len(model.milestone_values) == 3
+
+
+def test_drop_reorders_rows_and_moves_them_between_tables(qapp):
+    first, second = DocumentTableModel(make_documents(3), ["M0"]), DocumentTableModel(make_documents(2), ["M0"])
+    for number, document in enumerate(second.documents):
+        document["doc"] = f"OTHER-{number}"
+
+    first.dropMimeData(first.mimeData([first.index(2, 0)]), Qt.DropAction.MoveAction, 0, 0, first.index(-1, -1))
+    assert names(first) == ["DOC-2", "DOC-0", "DOC-1"]
+
+    data = second.mimeData([second.index(0, 0), second.index(1, 1)])
+    first.dropMimeData(data, Qt.DropAction.MoveAction, 1, 0, first.index(-1, -1))
+    assert names(first) == ["DOC-2", "OTHER-0", "OTHER-1", "DOC-0", "DOC-1"]
+    assert first.milestone_values[1]["M0"] == "2024-01-01"
+    assert names(second) == []
+
+
+def test_removed_rows_take_their_unsaved_changes_along(qapp):
+    first, second = DocumentTableModel(make_documents(3), ["M0"]), DocumentTableModel([], ["M0"])
+    for number, document in enumerate(first.documents):
+        document["document_id"] = number + 1
+        first.setData(first.index(number, len(BASE_HEADERS)), f"edit-{number}")
+
+    first.remove_rows([0])
+    assert [change[:3] for change in first.pending_changes()] == [(2, "M0", "edit-1"), (3, "M0", "edit-2")]
+
+    second.dropMimeData(first.mimeData([first.index(0, 0)]), Qt.DropAction.MoveAction, 0, 0, second.index(-1, -1))
+    assert [change[:3] for change in first.pending_changes()] == [(3, "M0", "edit-2")]
+    assert [change[:3] for change in second.pending_changes()] == [(2, "M0", "edit-1")]
+
+
+def test_add_milestone_column_resizes_view(qapp):
+    model = DocumentTableModel(make_documents(2), [])
+    view = DocumentTableView(model)
+    width = view.minimumWidth()
+    assert model.add_milestone_column("FDR1")
+    assert not model.add_milestone_column("FDR1")
+    assert model.headers()[-1] == "FDR1"
+    assert view.minimumWidth() > width
+
+
+def test_project_window_builds_one_table_per_subsection(qapp, db_engine, seed_project, select_all_documents):
+    from views.OpenProject.project_window import ProjectWindow
+    from views.worker import wait_for_background_tasks
+    project_id = seed_project(books=2, documents_per_book=5)
+    window = ProjectWindow(project_id, select_all_documents(project_id))
+    assert window.document_tables == []  # Still loading
+    wait_for_background_tasks()
+    assert len(window.document_tables) == 1
+    assert window.document_tables[0].model().rowCount() == 10
+
+
+def test_project_window_saves_edited_cells(qapp, db_engine, seed_project, select_all_documents):
+    from database.db_methods import load_milestone_values
+    from views.OpenProject.project_window import ProjectWindow
+    from views.worker import wait_for_background_tasks
+    project_id = seed_project(books=1, documents_per_book=3)
+    window = ProjectWindow(project_id, select_all_documents(project_id))
+    wait_for_background_tasks()
+    model = window.document_tables[0].model()
+    column = len(BASE_HEADERS) + model.milestone_keys.index("FDR1")
+
+    for row in range(model.rowCount()):
+        model.setData(model.index(row, column), f"fdr-{row}")
+    assert window.save_timer.isActive()
+    window.save_changes()
+    wait_for_background_tasks()
+    qapp.processEvents()
+
+    assert model.changes == {} and window.save_task is None
+    values = load_milestone_values(project_id)
+    assert sorted(value["FDR1"] for value in values.values()) == ["fdr-0", "fdr-1", "fdr-2"]
+
+    model.setData(model.index(0, column), "")
+    window.reject()  # Unsaved edits are written on close
+    assert "FDR1" not in load_milestone_values(project_id)[model.documents[0]["document_id"]]
+
+
+@pytest.mark.parametrize("keep_mine", [False, True])
+def test_project_window_reports_conflicting_saves(qapp, db_engine, seed_project, select_all_documents, keep_mine):
+    from database.db_methods import load_milestone_values, save_milestone_values
+    from views.OpenProject.project_window import ProjectWindow
+    from views.worker import wait_for_background_tasks
+    project_id = seed_project(books=1, documents_per_book=1)
+    window = ProjectWindow(project_id, select_all_documents(project_id))
+    wait_for_background_tasks()
+    model = window.document_tables[0].model()
+    document_id = model.documents[0]["document_id"]
+    save_milestone_values(project_id, [(document_id, "M0", "theirs", 1)])  # Another user
+
+    asked = []
+    window.ask_keep_mine = lambda conflicts: asked.extend(conflicts) or keep_mine
+    model.setData(model.index(0, len(BASE_HEADERS) + model.milestone_keys.index("M0")), "mine")
+    window.save_changes()
+    wait_for_background_tasks()
+    qapp.processEvents()
+
+    assert [(conflict.value, conflict.their_value) for conflict in asked] == [("mine", "theirs")]
+    if keep_mine:
+        assert model.pending_changes() == [(document_id, "M0", "mine", 2)]
+        window.reject()
+        assert load_milestone_values(project_id)[document_id]["M0"] == "mine"
+    else:
+        assert model.pending_changes() == []
+        assert model.milestone_values[0]["M0"] == "theirs"
+
+
+def test_save_on_close_succeeds_on_the_last_attempt(qapp, db_engine, seed_project, select_all_documents, monkeypatch):
+    from sqlalchemy.orm.exc import StaleDataError
+    from database.db_methods import load_milestone_values, save_milestone_values
+    from views.OpenProject import project_window
+    from views.worker import wait_for_background_tasks
+    project_id = seed_project(books=1, documents_per_book=1)
+    window = project_window.ProjectWindow(project_id, select_all_documents(project_id))
+    wait_for_background_tasks()
+    model = window.document_tables[0].model()
+    model.setData(model.index(0, len(BASE_HEADERS)), "mine")
+
+    attempts = []
+    def flaky_save(*args):
+        attempts.append(args)
+        if len(attempts) < project_window.SAVE_ATTEMPTS:
+            raise StaleDataError("Someone saved in between")
+        return save_milestone_values(*args)
+    warnings = []
+    monkeypatch.setattr(project_window, "save_milestone_values", flaky_save)
+    monkeypatch.setattr(project_window.QMessageBox, "warning", lambda *args: warnings.append(args))
+
+    assert window.save_pending_changes()
+    assert len(attempts) == project_window.SAVE_ATTEMPTS and warnings == []
+    assert load_milestone_values(project_id)[model.documents[0]["document_id"]][model.milestone_keys[0]] == "mine"
+
+
+def test_close_waits_for_the_running_save(qapp, db_engine, seed_project, select_all_documents, monkeypatch):
+    import time
+    from database.db_methods import load_milestone_values, save_milestone_values
+    from views.OpenProject import project_window
+    from views.worker import wait_for_background_tasks
+    project_id = seed_project(books=1, documents_per_book=1)
+    window = project_window.ProjectWindow(project_id, select_all_documents(project_id))
+    wait_for_background_tasks()
+    model = window.document_tables[0].model()
+    model.setData(model.index(0, len(BASE_HEADERS)), "mine")
+
+    saves = []
+    def slow_save(*args):
+        saves.append(args)
+        time.sleep(0.2)
+        return save_milestone_values(*args)
+    monkeypatch.setattr(project_window, "save_milestone_values", slow_save)
+    window.save_changes()
+    window.reject()
+
+    assert len(saves) == 1 and model.pending_changes() == []
+    assert load_milestone_values(project_id)[model.documents[0]["document_id"]][model.milestone_keys[0]] == "mine"
+
+
+def test_failed_refresh_is_logged(qapp, db_engine, seed_project, select_all_documents, caplog):
+    from views.OpenProject.project_window import ProjectWindow
+    from views.worker import wait_for_background_tasks
+    project_id = seed_project(books=1, documents_per_book=1)
+    window = ProjectWindow(project_id, select_all_documents(project_id))
+    wait_for_background_tasks()
+    window.refresh_task = object()
+
+    with caplog.at_level("WARNING", logger="dms.ui"):
+        window.refresh_failed(ConnectionError("server gone"))
+    assert window.refresh_task is None
+    assert "server gone" in caplog.text
+
+
+def test_project_window_patches_rows_on_refresh(qapp, db_engine, seed_project, select_all_documents, query_log):
+    from database.db_config import session_scope
+    from database.db_methods import add_milestone, get_project_changes, save_milestone_values
+    from models.models import Document, ProjectSubSection, SectionRelation
+    from views.OpenProject.project_window import ProjectWindow
+    from views.worker import wait_for_background_tasks
+    project_id = seed_project(books=1, documents_per_book=3)
+    window = ProjectWindow(project_id, select_all_documents(project_id))
+    wait_for_background_tasks()
+    table = window.document_tables[0]
+    model = table.model()
+    first, second, third = [document["document_id"] for document in model.documents]
+
+    # Someone else edits the project; a second subsection table is already on screen
+    with session_scope() as session:
+        relation = session.get(SectionRelation, third)
+        subsection = ProjectSubSection(section_id=relation.section_id, subsection_name="Moved")
+        session.add(subsection)
+        session.flush()
+        relation.subsection_id = subsection.subsection_id
+        session.get(Document, first).title = "Renamed"
+    save_milestone_values(project_id, [(second, "M0", "theirs", 1)])
+    add_milestone(project_id, "Customer review")
+    other = window.create_document_table([], list(model.milestone_keys))
+    section = model.documents[0]["section"]
+    window.subsection_tables[(section, "Moved")] = other
+
+    model.setData(model.index(0, len(BASE_HEADERS)), "mine")  # Unsaved edit: kept
+    query_log.clear()
+    window.refresh()
+    wait_for_background_tasks()
+    qapp.processEvents()
+
+    assert len(query_log) == 5
+    assert window.document_tables[0] is table  # Patched, not rebuilt
+    assert [document["document_id"] for document in model.documents] == [first, second]
+    assert model.documents[0]["title"] == "Renamed" and model.data(model.index(0, 1)) == "Renamed"
+    assert model.milestone_values[0]["M0"] == "mine"
+    assert model.milestone_values[1]["M0"] == "theirs"
+    assert model.headers()[-1] == "Customer review"
+    assert [document["document_id"] for document in other.model().documents] == [third]
+    assert other.model().milestone_values[0]["M0"] == f"m0-{third}"
+
+    window.apply_changes(get_project_changes(project_id, window.changes_since))  # Reported again: no-op
+    assert [document["document_id"] for document in model.documents] == [first, second]
+    assert model.milestone_values[1]["M0"] == "theirs" and len(other.model().documents) == 1
+    window.reject()
+
+
+def test_refresh_applies_every_placement_and_reaches_added_subsections(
+        qapp, db_engine, seed_project, select_all_documents, monkeypatch):
+    from database.snapshot import ProjectChanges, SectionPlacement
+    from views.OpenProject import project_window
+    from views.worker import wait_for_background_tasks
+    project_id = seed_project(books=1, documents_per_book=2)
+    window = project_window.ProjectWindow(project_id, select_all_documents(project_id))
+    wait_for_background_tasks()
+    model = window.document_tables[0].model()
+    first, second = [document["document_id"] for document in model.documents]
+    section, subsection = model.documents[0]["section"], model.documents[0]["subsection"]
+    monkeypatch.setattr(project_window.QInputDialog, "getText", lambda *args: ("Added", True))
+    window.add_subsection(section)
+    added = window.subsection_tables[(section, "Added")].model()
+
+    placements = (SectionPlacement(first, section, subsection, 5), SectionPlacement(first, section, "Added", 0))
+    window.apply_changes(ProjectChanges(window.changes_since, (), {first: placements}, (), ()))
+
+    assert [document["document_id"] for document in model.documents] == [second, first]
+    assert [document["document_id"] for document in added.documents] == [first]
+    assert added.documents[0]["subsection"] == "Added" and added.milestone_values[0] == model.milestone_values[1]
+
+
+def test_added_subsection_shows_the_project_milestones(qapp, db_engine, seed_project, select_all_documents,
+                                                        monkeypatch):
+    from views.OpenProject import project_window
+    from views.worker import wait_for_background_tasks
+    project_id = seed_project(books=1, documents_per_book=1)
+    window = project_window.ProjectWindow(project_id, select_all_documents(project_id))
+    wait_for_background_tasks()
+    model = window.document_tables[0].model()
+    model.add_milestone_column("Customer review")
+    monkeypatch.setattr(project_window.QInputDialog, "getText", lambda *args: ("Added", True))
+    window.add_subsection(model.documents[0]["section"])
+
+    added = window.document_tables[-1].model()
+    assert added is not model and added.headers() == model.headers()
+
+
+def test_added_milestone_is_saved_by_a_task_the_window_keeps(qapp, db_engine, seed_project, select_all_documents,
+                                                            monkeypatch):
+    from database.db_methods import get_project_milestones
+    from views.OpenProject import project_window
+    from views.worker import wait_for_background_tasks
+    project_id = seed_project(books=1, documents_per_book=1)
+    window = project_window.ProjectWindow(project_id, select_all_documents(project_id))
+    wait_for_background_tasks()
+    monkeypatch.setattr(project_window.QInputDialog, "getText", lambda *args: ("Customer review", True))
+
+    window.add_milestone(window.document_tables[0])
+    assert len(window.milestone_tasks) == 1
+    wait_for_background_tasks()
+    assert window.milestone_tasks == set()
+    assert get_project_milestones(project_id)[-1] == "Customer review"
@@ -0,0 +1,64 @@
+import logging
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from database.db_methods import get_all_project_names, get_books_by_project, load_project_snapshot
+from database.instrumentation import query_stats, query_scope, format_summary
+
+
+@pytest.fixture
+def stats(db_engine):
+    query_stats.reset()
+    yield query_stats
+    query_stats.reset()
+
+
+def test_queries_are_recorded_per_scope_with_rows_and_call_sites(seed_project, stats):
+    project_id = seed_project(books=3, documents_per_book=2)
+
+    with query_scope("ChooseBooks"):
+        get_books_by_project(project_id)
+        get_all_project_names()
+
+    summary = stats.summary("ChooseBooks")
+    assert summary["queries"] == 2
+    assert summary["rows"] == 3 + 1
+    assert sum(summary["histogram"].values()) == 2
+    sites = list(summary["call_sites"])
+    assert any(site.startswith("database/db_methods.py:") and site.endswith("get_books_by_project")
+               for site in sites)
+    assert "ChooseBooks: 2 queries" in format_summary("ChooseBooks")
+    assert stats.summary("ProjectWindow")["queries"] == 0
+
+
+def test_background_tasks_report_to_the_scope_that_started_them(seed_project, stats):
+    pytest.importorskip("PyQt6")
+    from PyQt6.QtWidgets import QApplication
+    from views.worker import run_in_background, wait_for_background_tasks
+    app = QApplication.instance() or QApplication([])
+
+    project_id = seed_project()
+    with query_scope("ProjectWindow"):
+        run_in_background(load_project_snapshot, project_id, on_result=lambda snapshot: None)
+    wait_for_background_tasks()
+
+    assert stats.summary("ProjectWindow")["queries"] == 6
+
+
+def test_slow_queries_are_logged(seed_project, stats, caplog, monkeypatch):
+    monkeypatch.setattr(stats, "slow_query_ms", 0)
+    with caplog.at_level(logging.WARNING, logger="dms.sql"):
+        get_all_project_names()
+    assert "Slow query" in caplog.text
+    assert "get_all_project_names" in caplog.text
+
+
+def test_failed_statements_do_not_leave_their_start_time_behind(db_engine, stats):
+    with db_engine.connect() as connection:
+        with pytest.raises(OperationalError):
+            connection.execute(text("SELECT * FROM no_such_table"))
+        assert connection.info.get("query_started") == []
+        connection.execute(text("SELECT 1"))
+        assert connection.info["query_started"] == []
@@ -0,0 +1,245 @@
+import pytest
+from sqlalchemy import MetaData, Table, event, select, text
+from sqlalchemy.orm.exc import StaleDataError
+
+from database.db_config import Base, make_engine, session_scope
+from database.db_methods import add_milestone, get_project_milestones, load_milestone_values, load_project_snapshot, \
+    save_milestone_values
+from database.detail_columns import MILESTONE_COLUMNS, parse_milestone_date
+from database.migrate_db import add_missing_columns, migrate_milestone_columns
+from database.snapshot import MilestoneConflict
+from models.models import Document, DocumentDetail, MilestoneValue
+
+
+def test_migration_copies_filled_cells_only(seed_project, db_engine):
+    project_id = seed_project(books=1, documents_per_book=2)
+
+    with session_scope() as session:
+        values = session.execute(select(MilestoneValue.document_id, MilestoneValue.value)).all()
+        document_ids = sorted(session.execute(select(DocumentDetail.document_id)).scalars())
+    assert sorted(values) == [(document_id, f"m0-{document_id}") for document_id in document_ids]
+
+    assert migrate_milestone_columns(db_engine) == 0  # Already migrated cells are skipped
+    assert load_milestone_values(project_id) == {document_id: {"M0": f"m0-{document_id}"}
+                                                 for document_id in document_ids}
+
+
+def test_migration_picks_up_cells_imported_later(seed_project, db_engine):
+    project_id = seed_project(books=1, documents_per_book=2)
+    first, second = sorted(load_milestone_values(project_id))
+    save_milestone_values(project_id, [(first, "M0", "edited", 1)])
+    with session_scope() as session:  # A later import of wide rows
+        for detail in session.query(DocumentDetail):
+            detail.M0, detail.FDR1 = "imported", "imported"
+
+    assert migrate_milestone_columns(db_engine) == 2
+    assert load_milestone_values(project_id) == {
+        first: {"M0": "edited", "FDR1": "imported"},
+        second: {"M0": f"m0-{second}", "FDR1": "imported"},
+    }
+
+
+def test_project_milestones_and_pivot(seed_project):
+    project_id = seed_project(books=2, documents_per_book=2)
+    other_id = seed_project(name="Other", books=1, documents_per_book=1)
+
+    assert get_project_milestones(project_id) == tuple(MILESTONE_COLUMNS)
+    assert add_milestone(project_id, "Customer review")
+    assert not add_milestone(project_id, "Customer review")
+    assert not add_milestone(project_id, "M0")
+    assert get_project_milestones(project_id)[-1] == "Customer review"
+    assert "Customer review" not in get_project_milestones(other_id)
+
+    snapshot = load_project_snapshot(project_id)
+    assert snapshot.milestones[-1] == "Customer review"
+    document = snapshot.books[0].documents[0]
+    assert dict(document.details[0]) == {"M0": f"m0-{document.id}"}
+    assert set(load_milestone_values(project_id, [document.id])) == {document.id}
+
+
+def test_parse_milestone_date():
+    assert parse_milestone_date(" 2024-03-01 ").isoformat() == "2024-03-01"
+    assert parse_milestone_date("planned") is None
+    assert parse_milestone_date(None) is None
+
+
+def test_save_writes_edited_cells_in_batches(seed_project, max_queries):
+    project_id = seed_project(books=2, documents_per_book=500)
+    document_ids = sorted(load_milestone_values(project_id))
+    changes = [(document_id, "M0", "2025-01-01", 1) for document_id in document_ids]  # Updates
+    changes += [(document_id, name, "planned", None) for document_id in document_ids for name in ("M1", "FDR1")]
+
+    with max_queries(5):  # Milestone IDs, existing cells per 500 documents, one UPDATE, one INSERT
+        result = save_milestone_values(project_id, changes)
+    assert result.conflicts == [] and len(result.versions) == 3000
+    assert result.versions[(document_ids[0], "M0")] == 2 and result.versions[(document_ids[0], "M1")] == 1
+
+    values = load_milestone_values(project_id)
+    assert values[document_ids[0]] == {"M0": "2025-01-01", "M1": "planned", "FDR1": "planned"}
+    with session_scope() as session:
+        dates = set(session.execute(select(MilestoneValue.value_date)).scalars())
+    assert dates == {parse_milestone_date("2025-01-01"), None}
+
+
+def test_save_clears_cells_and_adds_unknown_milestones(seed_project):
+    project_id = seed_project(books=1, documents_per_book=2)
+    first, second = sorted(load_milestone_values(project_id))
+
+    result = save_milestone_values(project_id, [(first, "M0", "", 1), (second, "Customer review", "ok", None),
+                                                (second, "M1", "", None)])
+    assert result.versions == {(first, "M0"): 2, (second, "Customer review"): 1, (second, "M1"): None}
+    assert load_milestone_values(project_id) == {second: {"M0": f"m0-{second}", "Customer review": "ok"}}
+    assert get_project_milestones(project_id)[-1] == "Customer review"
+    assert save_milestone_values(project_id, []) == ({}, [])
+
+
+def test_save_reports_cells_changed_by_someone_else(seed_project):
+    project_id = seed_project(books=1, documents_per_book=3)
+    first, second, third = sorted(load_milestone_values(project_id))
+    save_milestone_values(project_id, [(first, "M0", "theirs", 1), (second, "M1", "theirs", None),
+                                       (third, "M0", "same", 1)])
+
+    # Edits based on what was loaded before the save above
+    result = save_milestone_values(project_id, [(first, "M0", "mine", 1), (second, "M1", "mine", None),
+                                                (third, "M0", "same", 1), (third, "M1", "new", None)])
+
+    assert sorted(result.conflicts) == [MilestoneConflict(first, "M0", "mine", "theirs", 2),
+                                        MilestoneConflict(second, "M1", "mine", "theirs", 1)]
+    assert result.versions == {(third, "M0"): 2, (third, "M1"): 1}  # Same value: nothing to overwrite
+    values = load_milestone_values(project_id)
+    assert values[first]["M0"] == "theirs" and values[second]["M1"] == "theirs"
+
+    # Keeping mine: save again based on their version
+    assert save_milestone_values(project_id, [(first, "M0", "mine", 2)]).versions == {(first, "M0"): 3}
+
+
+def test_save_fails_as_a_whole_when_a_version_moves_while_saving(seed_project, db_engine):
+    project_id = seed_project(books=1, documents_per_book=2)
+    first, second = sorted(load_milestone_values(project_id))
+
+    def concurrent_save(conn, cursor, statement, parameters, context, executemany):
+        if executemany and statement.startswith("UPDATE"):  # Between the version check and the writes
+            cursor.execute("UPDATE tblmilestone_value SET version = version + 1 WHERE document_id = ?", (second,))
+
+    event.listen(db_engine, "before_cursor_execute", concurrent_save)
+    try:
+        with pytest.raises(StaleDataError):
+            save_milestone_values(project_id, [(first, "M0", "a", 1), (second, "M0", "b", 1)])
+    finally:
+        event.remove(db_engine, "before_cursor_execute", concurrent_save)
+    assert load_milestone_values(project_id)[first]["M0"] == f"m0-{first}"
+
+
+def test_orm_updates_compare_versions(seed_project):
+    seed_project(books=1, documents_per_book=1)
+    with session_scope() as session:
+        document = session.query(Document).one()
+        assert document.version == 1
+        session.execute(text("UPDATE tbldocuments SET version = 5 WHERE id = :id"), {"id": document.id})
+        document.state = "Draft"
+        with pytest.raises(StaleDataError):
+            session.flush()
+        session.rollback()
+
+
+def test_add_missing_columns(db_engine):
+    with db_engine.begin() as connection:
+        connection.exec_driver_sql("DROP TABLE tblbooks")
+        connection.exec_driver_sql("CREATE TABLE tblbooks (id INTEGER PRIMARY KEY, name VARCHAR(500) NOT NULL)")
+    assert add_missing_columns(db_engine) == ["tblbooks.description", "tblbooks.project_id"]
+    assert add_missing_columns(db_engine) == []
+
+
+def create_baseline_schema(engine):
+    """The tables as they were before the version and updated_at columns and the milestone tables."""
+    metadata = MetaData()
+    for table in Base.metadata.sorted_tables:
+        if table.name not in ("tblmilestone", "tblmilestone_value"):
+            Table(table.name, metadata,
+                  *(column._copy() for column in table.columns if column.name not in ("version", "updated_at")))
+    metadata.create_all(engine)
+
+
+def test_add_missing_columns_to_a_baseline_database():
+    engine = make_engine("sqlite://", echo=False)
+    create_baseline_schema(engine)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("INSERT INTO tbldocuments (id, name) VALUES (1, 'DOC-1')")
+
+    assert sorted(add_missing_columns(engine)) == [
+        f"{table}.{column}" for table in ("tbldocument_detail", "tbldocuments", "tblsection_relation")
+        for column in ("updated_at", "version")]
+    with engine.connect() as connection:
+        version, updated_at = connection.exec_driver_sql("SELECT version, updated_at FROM tbldocuments").one()
+    assert version == 1 and updated_at is not None
+    assert add_missing_columns(engine) == []
+    engine.dispose()
+
+
+def test_upgrade_a_baseline_database():
+    from database.cache import project_cache
+    from database.db_config import SessionLocal
+    from database.db_methods import get_project_changes
+    from database.migrate_db import upgrade_database
+    engine = make_engine("sqlite://", echo=False)
+    create_baseline_schema(engine)
+    with engine.begin() as connection:
+        for statement in (
+                "INSERT INTO tblproject (id, name) VALUES (1, 'Old Project')",
+                "INSERT INTO tblbooks (id, name, project_id) VALUES (1, 'Book', 1)",
+                "INSERT INTO tbldocuments (id, name, title, book_id) VALUES (1, 'DOC-1', 'Old', 1)",
+                "INSERT INTO tblproject_section (section_id, section_name) VALUES (1, 'Section')",
+                "INSERT INTO tblproject_subsection (subsection_id, section_id, subsection_name) VALUES (1, 1, 'Sub')",
+                "INSERT INTO tblsection_relation (relation_id, section_id, subsection_id, project_id, relation_order)"
+                " VALUES (1, 1, 1, 1, 0)",
+                "INSERT INTO tbldocument_detail (document_id, relation_id, project_id, M0) VALUES (1, 1, 1, 'done')"):
+            connection.exec_driver_sql(statement)
+    previous_bind = SessionLocal.kw.get("bind")
+    SessionLocal.configure(bind=engine)
+    try:
+        upgrade_database(engine)
+        with engine.connect() as connection:
+            indexes = {row[0] for row in connection.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE '%_updated'")}
+        assert indexes == {"ix_tbldocuments_book_updated", "ix_tblsection_relation_project_updated",
+                           "ix_tblmilestone_value_project_updated"}
+
+        changes = get_project_changes(1)
+        assert [(document.title, document.version) for document in changes.documents] == [("Old", 1)]
+        assert [row[1:3] for row in changes.milestone_values] == [("M0", "done")]
+        with session_scope() as session:
+            session.get(Document, 1).title = "New"
+        assert [document.title for document in get_project_changes(1, changes.as_of).documents] == ["New"]
+    finally:
+        SessionLocal.configure(bind=previous_bind)
+        project_cache.clear()
+        engine.dispose()
+
+
+def test_default_milestone_names_are_unique(db_engine):
+    from sqlalchemy.exc import IntegrityError
+    from database.migrate_db import create_missing_indexes, ensure_default_milestones
+    from models.models import Milestone
+    with db_engine.begin() as connection:
+        ensure_default_milestones(connection)
+    assert create_missing_indexes(db_engine) == []  # The expression index is found, not created again
+
+    with pytest.raises(IntegrityError), db_engine.begin() as connection:
+        connection.execute(Milestone.__table__.insert(), {"project_id": None, "name": "M0", "position": 99})
+
+
+def test_init_db_creates_the_default_milestones():
+    from database.cache import project_cache
+    from database.db_config import SessionLocal, make_engine
+    from database.init_db import init_db
+    engine = make_engine("sqlite://", echo=False)
+    previous_bind = SessionLocal.kw.get("bind")
+    SessionLocal.configure(bind=engine)
+    try:
+        init_db(engine)
+        init_db(engine)  # Again: nothing added twice
+        assert get_project_milestones(1) == tuple(MILESTONE_COLUMNS)
+    finally:
+        SessionLocal.configure(bind=previous_bind)
+        project_cache.clear()
+        engine.dispose()
@@ -0,0 +1,39 @@
+import pytest
+
+pytest.importorskip("PyQt6")
+from PyQt6.QtWidgets import QApplication
+
+from database.cache import project_cache
+from database.instrumentation import query_stats
+from views.worker import wait_for_background_tasks
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+def test_dialog_hud_shows_its_own_queries_and_build_time(qapp, seed_project):
+    from views.OpenProject.choose_books import ChooseBooks
+    project_id = seed_project(books=3, documents_per_book=4)
+
+    ChooseBooks(project_id)  # Earlier dialog of the same class: not counted below
+    wait_for_background_tasks()
+    project_cache.clear()
+
+    dialog = ChooseBooks(project_id)
+    wait_for_background_tasks()
+    hud = dialog.perf_hud
+    assert not hud.isVisible()
+
+    stats = hud.stats()
+    assert stats["queries"] == 2
+    assert stats["rows"] == 1 + 3
+    assert stats["db_ms"] > 0
+    assert stats["widgets"] > 0
+    assert dialog.construction_ms > 0
+    assert dialog.loaded_ms >= dialog.construction_ms
+
+    hud.set_active(True)
+    assert "queries         2" in hud.text()
+    assert "ChooseBooks" in query_stats.scope_names()
@@ -0,0 +1,102 @@
+import pytest
+
+pytest.importorskip("PyQt6")
+from PyQt6.QtWidgets import QApplication, QDialog
+
+from database.db_methods import load_project_snapshot
+from views.prefetch import Prefetcher
+from views.worker import wait_for_background_tasks
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def no_exec(monkeypatch):
+    opened = []
+    monkeypatch.setattr(QDialog, "exec", lambda dialog: opened.append(dialog))
+    return opened
+
+
+def test_highlighted_project_is_prefetched_for_choose_books(qapp, seed_project, max_queries, no_exec):
+    from views.OpenProject.open_project import OpenProjectWindow
+    seed_project(books=3, documents_per_book=2)
+    dialog = OpenProjectWindow()
+    wait_for_background_tasks()
+    dialog.search_input.setText("Test Project")
+    dialog.select_first_match()
+    wait_for_background_tasks()
+
+    with max_queries(0):
+        dialog.open_project_window()
+        wait_for_background_tasks()
+        choose_books = dialog.project_dialog
+        choose_books.select_all_books()
+        choose_books.prefetch_timer.stop()  # Only the document lists prefetched above are used
+        choose_books.collect_selected_books_to_new_page()
+    assert no_exec[-1].document_model.rowCount() == 6
+
+
+def test_checked_books_are_prefetched_for_the_next_dialogs(qapp, seed_project, max_queries, no_exec):
+    from views.OpenProject.choose_books import ChooseBooks
+    project_id = seed_project(books=3, documents_per_book=2)
+    dialog = ChooseBooks(project_id)
+    wait_for_background_tasks()
+
+    dialog.checkboxes[0].setChecked(True)
+    dialog.prefetch_checked_books()
+    dialog.checkboxes[2].setChecked(True)
+    dialog.prefetch_checked_books()  # Replaces the prefetch of the first book alone
+    wait_for_background_tasks()
+    assert list(dialog.prefetcher.results) == ["books"]
+
+    with max_queries(0):
+        dialog.collect_selected_books_to_new_page()
+        choose_documents = no_exec.pop()
+        choose_documents.select_all_documents()
+        choose_documents.collect_selected_documents()
+    assert [book.name for book in choose_documents.snapshot.books] == ["Book 0", "Book 2"]
+    assert sum(table.model().rowCount() for table in no_exec.pop().document_tables) == 4
+
+
+def test_next_waits_for_a_pending_prefetch(qapp, seed_project):
+    project_id = seed_project()
+    prefetcher = Prefetcher()
+    delivered = []
+
+    prefetcher.prefetch("books", load_project_snapshot, project_id, book_ids=[1])
+    prefetcher.prefetch("books", load_project_snapshot, project_id, book_ids=[1])  # Already pending
+    assert len(prefetcher.tasks) == 1
+    assert prefetcher.join("books", load_project_snapshot, project_id, book_ids=[1], on_result=delivered.append)
+    assert not prefetcher.join("books", load_project_snapshot, project_id, book_ids=[2], on_result=delivered.append)
+    wait_for_background_tasks()
+    assert [snapshot.id for snapshot in delivered] == [project_id]
+
+
+def test_newer_selection_cancels_the_previous_prefetch(qapp, seed_project):
+    project_id = seed_project()
+    prefetcher = Prefetcher()
+
+    prefetcher.prefetch("books", load_project_snapshot, project_id, book_ids=[1])
+    first = prefetcher.tasks["books"][1]
+    prefetcher.prefetch("books", load_project_snapshot, project_id, book_ids=[2])
+    assert first.cancelled
+    prefetcher.cancel()
+    wait_for_background_tasks()
+    assert prefetcher.tasks == {} and prefetcher.results == {}
+
+
+def test_failed_prefetch_is_logged_and_joiners_load_themselves(qapp, caplog):
+    def unreachable(project_id):
+        raise ConnectionError("server gone")
+
+    prefetcher = Prefetcher()
+    results = []
+    with caplog.at_level("WARNING", logger="dms.ui"):
+        prefetcher.prefetch("project", unreachable, 1)
+        assert prefetcher.join("project", unreachable, 1, on_result=results.append)
+        wait_for_background_tasks()
+    assert results == [None]
+    assert "Prefetch project failed" in caplog.text and "server gone" in caplog.text
@@ -0,0 +1,44 @@
+import pstats
+
+import pytest
+
+from views import profiling
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILES_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_profile_block_is_a_no_op_by_default(profile_dir, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_MODES", set())
+    with profiling.profile_block("Nothing"):
+        sum(range(1000))
+    assert list(profile_dir.iterdir()) == []
+
+
+def test_cpu_and_memory_profiles_are_written(profile_dir, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_MODES", {"cpu", "mem"})
+
+    with profiling.profile_block("Outer"):
+        with profiling.profile_block("Inner"):  # Nested blocks fall under the outer profile
+            data = [str(number) * 10 for number in range(20000)]
+
+    files = {path.name.split("_", 1)[1]: path for path in profile_dir.iterdir()}
+    assert sorted(files) == ["Outer.mem.txt", "Outer.prof"]
+    assert pstats.Stats(str(files["Outer.prof"])).total_calls > 0
+    assert "peak" in files["Outer.mem.txt"].read_text()
+    assert len(data) == 20000
+
+
+def test_dialog_constructors_are_profiled(profile_dir, monkeypatch):
+    pytest.importorskip("PyQt6")
+    from PyQt6.QtWidgets import QApplication
+    from views.OpenProject.choose_documents import ChooseDocuments
+    app = QApplication.instance() or QApplication([])
+
+    monkeypatch.setattr(profiling, "PROFILE_MODES", {"cpu"})
+    ChooseDocuments({}, 1)
+
+    assert [path.name.split("_", 1)[1] for path in profile_dir.iterdir()] == ["ChooseDocuments.__init__.prof"]
@@ -0,0 +1,129 @@
+import time
+import tracemalloc
+
+from database.cache import ProjectCache, cached_query, estimate_size, project_cache
+from database.db_config import session_scope
+from database.db_methods import get_all_project_names, get_project_books, get_documents_by_books, \
+    load_project_snapshot
+from models.models import Document
+
+
+def test_reopening_a_project_costs_no_queries(seed_project, max_queries):
+    project_id = seed_project(books=2, documents_per_book=3)
+
+    def open_project():
+        names = get_all_project_names()
+        project, books = get_project_books(names["Test Project"])
+        documents = get_documents_by_books([book.id for book in books])
+        document_ids = [document.id for rows in documents.values() for document in rows]
+        return load_project_snapshot(project_id, document_ids=document_ids)
+
+    first = open_project()
+    with max_queries(0):
+        assert open_project() is first
+    assert project_cache.hits == 4
+
+
+def test_writes_invalidate_the_cache(seed_project, max_queries):
+    project_id = seed_project(books=1, documents_per_book=2)
+    before = load_project_snapshot(project_id)
+    with session_scope() as session:
+        session.query(Document).filter(Document.id == before.books[0].documents[0].id).update({"state": "Draft"})
+
+    with max_queries(6):
+        after = load_project_snapshot(project_id)
+    assert after.books[0].documents[0].state == "Draft"
+
+
+def test_mutable_results_are_copied(seed_project):
+    seed_project()
+    get_all_project_names()["Other"] = 99
+    assert "Other" not in get_all_project_names()
+
+
+def test_lru_bound_and_ttl(monkeypatch):
+    cache = ProjectCache(max_entries=2, ttl=10)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == (True, 1)  # "b" is now the least recently used
+    cache.put("c", 3)
+    assert cache.get("b") == (False, None)
+    assert list(cache.entries) == ["a", "c"]
+
+    now = time.monotonic()
+    monkeypatch.setattr("database.cache.time.monotonic", lambda: now + 11)
+    assert cache.get("a") == (False, None)
+
+
+def test_size_bound_evicts_by_estimated_bytes():
+    cache = ProjectCache(max_entries=10, ttl=10, max_bytes=10_000)
+    cache.put("a", "x" * 4000)
+    cache.put("b", "x" * 4000)
+    cache.put("c", "x" * 4000)  # Over 10 kB: "a" goes
+    assert list(cache.entries) == ["b", "c"]
+    assert cache.bytes == sum(entry.size for entry in cache.entries.values())
+
+    cache.put("huge", "x" * 20_000)  # Larger than the whole cache: not kept
+    assert "huge" not in cache.entries and list(cache.entries) == ["b", "c"]
+    cache.invalidate()
+    assert cache.bytes == 0
+
+
+def test_snapshot_size_estimate_is_close_to_allocated_memory(seed_project):
+    project_id = seed_project(books=4, documents_per_book=100)
+    load_project_snapshot.uncached(project_id)  # Warm up interned strings and statement caches
+    tracemalloc.start()
+    try:
+        snapshot = load_project_snapshot.uncached(project_id)
+        allocated = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert allocated / 2 < estimate_size(snapshot) < allocated * 3
+
+
+def test_invalidate_one_project_and_stale_reads():
+    cache = ProjectCache()
+    cache.put("project 1", 1, project_id=1)
+    cache.put("project 2", 2, project_id=2)
+    cache.put("names", {}, project_id=None)
+    generation = cache.generation
+    cache.invalidate(1)
+    assert list(cache.entries) == ["project 2"]
+
+    cache.put("project 1", "read before the write", project_id=1, generation=generation)
+    assert cache.get("project 1") == (False, None)
+
+
+def test_unhashable_arguments_bypass_the_cache(monkeypatch):
+    calls = []
+
+    @cached_query()
+    def lookup(project_id, selection):
+        calls.append(project_id)
+        return project_id
+
+    monkeypatch.setattr(project_cache, "enabled", True)
+    project_cache.clear()
+    lookup(1, {"books": []})
+    lookup(1, {"books": []})
+    lookup(1, [1, 2])
+    lookup(1, [1, 2])
+    assert calls == [1, 1, 1]
+    project_cache.clear()
+
+
+def test_only_writes_clear_the_cache(seed_project, db_engine, monkeypatch):
+    from sqlalchemy import select, text
+    monkeypatch.setattr(project_cache, "enabled", True)
+    project_id = seed_project()
+    load_project_snapshot(project_id)
+
+    with db_engine.connect() as connection:
+        connection.execute(text("WITH ids AS (SELECT id FROM tbldocuments) SELECT count(*) FROM ids"))
+        connection.exec_driver_sql("EXPLAIN QUERY PLAN SELECT * FROM tbldocuments")
+        connection.execute(select(Document.id).limit(1))
+    assert load_project_snapshot.peek(project_id)[0]
+
+    with session_scope() as session:
+        session.execute(text("UPDATE tbldocuments SET state = 'Draft'"))
+    assert not load_project_snapshot.peek(project_id)[0]
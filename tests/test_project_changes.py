@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import text, update
+
+from database import db_methods
+from database.db_config import session_scope
+from database.db_methods import get_project_changes, load_milestone_values, load_project_snapshot, \
+    save_milestone_values
+from models.models import Document, SectionRelation
+
+LONG_AGO = "2000-01-01 00:00:00"
+SINCE = datetime(2020, 1, 1)
+
+
+def age_rows():
+    """Stamp every row as written long ago, so only what a test changes counts as new."""
+    with session_scope() as session:
+        for table in ("tbldocuments", "tblsection_relation", "tblmilestone_value"):
+            session.execute(text(f"UPDATE {table} SET updated_at = :stamp"), {"stamp": LONG_AGO})
+
+
+def test_changes_since_a_point_in_time(seed_project, query_log):
+    project_id = seed_project(books=2, documents_per_book=2)
+    first, second, third, _ = sorted(load_milestone_values(project_id))
+    assert load_project_snapshot(project_id).as_of is not None
+    age_rows()
+
+    with session_scope() as session:
+        session.get(Document, first).title = "Renamed"
+        session.get(SectionRelation, second).relation_order = 10
+    save_milestone_values(project_id, [(third, "M0", "", 1), (third, "FDR1", "planned", None)])
+
+    query_log.clear()
+    changes = get_project_changes(project_id, SINCE)
+    assert len(query_log) == 5  # Clock, documents, placements, milestone values, milestone names
+
+    assert [(document.id, document.title, document.version) for document in changes.documents] == \
+        [(first, "Renamed", 2)]
+    assert list(changes.placements) == [second] and changes.placements[second][0].relation_order == 10
+    assert sorted(changes.milestone_values, key=str) == [(third, "FDR1", "planned", 1), (third, "M0", None, 2)]
+    assert changes.as_of >= SINCE
+
+    everything = get_project_changes(project_id)
+    assert len(everything.documents) == 4 and len(everything.placements) == 4
+
+
+def test_changes_of_other_projects_are_not_reported(seed_project):
+    project_id = seed_project(books=1, documents_per_book=1)
+    other_id = seed_project(name="Other", books=1, documents_per_book=1)
+    age_rows()
+    other_document = next(iter(load_milestone_values(other_id)))
+    save_milestone_values(other_id, [(other_document, "M0", "changed", 1)])
+
+    changes = get_project_changes(project_id, SINCE)
+    assert changes.documents == () and changes.placements == {} and changes.milestone_values == ()
+
+
+def test_rows_committed_late_are_reported_within_the_overlap(seed_project, monkeypatch):
+    project_id = seed_project(books=1, documents_per_book=2)
+    first, second = sorted(load_milestone_values(project_id))
+    age_rows()
+    with session_scope() as session:  # Written before SINCE, committed after it
+        for document_id, seconds in ((first, 3), (second, 10)):
+            session.execute(update(Document).where(Document.id == document_id)
+                            .values(updated_at=SINCE - timedelta(seconds=seconds)))
+
+    monkeypatch.setattr(db_methods, "CHANGE_OVERLAP", timedelta(seconds=5))
+    assert [document.id for document in get_project_changes(project_id, SINCE).documents] == [first]
+    monkeypatch.setattr(db_methods, "CHANGE_OVERLAP", timedelta(seconds=15))
+    assert sorted(document.id for document in get_project_changes(project_id, SINCE).documents) == [first, second]
@@ -0,0 +1,75 @@
+import pytest
+
+pytest.importorskip("PyQt6")
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication
+
+from database.db_config import session_scope
+from models.models import Project
+from views.OpenProject.checkable_table import SearchIndex
+from views.worker import wait_for_background_tasks
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def many_projects(db_engine):
+    with session_scope() as session:
+        session.add_all([Project(name=f"Project {number:04}", description=f"Number {number}")
+                         for number in range(3000)])
+
+
+def listed(dialog):
+    return [dialog.project_list.item(row).text() for row in range(dialog.project_list.count())]
+
+
+def test_prefix_rows_limit():
+    index = SearchIndex(["b", "a2", "a1", "c", "a3"])
+    assert index.prefix_rows("a", limit=2) == [2, 1]
+    assert index.prefix_rows("", limit=3) == [2, 1, 4]
+
+
+def test_typing_lists_top_matches_and_selection_carries_the_id(qapp, many_projects, query_log):
+    from views.OpenProject.open_project import OpenProjectWindow, PROJECT_MATCH_LIMIT
+    dialog = OpenProjectWindow()
+    wait_for_background_tasks()
+    assert dialog.project_list.count() == PROJECT_MATCH_LIMIT
+
+    dialog.search_input.setText("project 12")
+    assert dialog.search_timer.isActive()  # Debounced
+    dialog.show_matches()
+    assert listed(dialog)[:3] == ["Project 1200", "Project 1201", "Project 1202"]
+    assert dialog.project_list.count() == PROJECT_MATCH_LIMIT
+
+    dialog.search_input.setText("Project 1234")
+    dialog.select_first_match()
+    wait_for_background_tasks()
+    project_id = dialog.project_list.currentItem().data(Qt.ItemDataRole.UserRole)
+    assert dialog.selected_project_id == project_id
+    assert dialog.project_details.text() == " Project 1234\n Number 1234"
+    assert not any("tblproject.name =" in statement for statement in query_log)  # Looked up by ID
+
+    dialog.search_input.setText("Project 9")
+    dialog.show_matches()
+    assert dialog.project_list.count() == 0
+    assert dialog.selected_project_id is None
+    dialog.reject()
+
+
+def test_failed_project_load_is_shown_and_unlocks_the_search_box(qapp, db_engine, monkeypatch):
+    from views.OpenProject import open_project
+
+    def unreachable():
+        raise ConnectionError("server gone")
+
+    monkeypatch.setattr(open_project, "get_all_project_names", unreachable)
+    dialog = open_project.OpenProjectWindow()
+    assert not dialog.search_input.isEnabled()
+    wait_for_background_tasks()
+
+    assert dialog.search_input.isEnabled() and dialog.projects_task is None
+    assert listed(dialog) == ["Could not load the projects: server gone"]
+    dialog.reject()
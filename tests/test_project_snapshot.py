@@ -0,0 +1,92 @@
+import dataclasses
+
+import pytest
+
+from database.db_methods import get_project_details, load_milestone_values, load_project_snapshot
+from database.snapshot import selected_document_ids
+
+
+def test_snapshot_matches_per_step_queries(seed_project, select_all_documents):
+    project_id = seed_project(books=2, documents_per_book=3)
+    selected = select_all_documents(project_id)
+    document_ids = selected_document_ids(selected)
+
+    expected = get_project_details(project_id, selected)
+    values = load_milestone_values(project_id, document_ids)
+    for book in expected["books"].values():
+        for document in book["documents"]:
+            document_id = document["document_id"]
+            document["details"] = [values[document_id]] if document_id in values else []
+            document["milestone_versions"] = dict.fromkeys(values.get(document_id, ()), 1)
+            document["version"] = 1
+
+    snapshot = load_project_snapshot(project_id)
+
+    assert snapshot.project_details(document_ids) == expected
+    assert [book.id for book in snapshot.books] == list(selected)
+
+
+def test_snapshot_query_count_is_independent_of_size(seed_project, query_log):
+    counts = []
+    for documents_per_book in (2, 30):
+        project_id = seed_project(name=f"Project {documents_per_book}", books=3, documents_per_book=documents_per_book)
+        query_log.clear()
+        load_project_snapshot(project_id)
+        counts.append(len(query_log))
+
+    assert counts[0] == counts[1] <= 6
+
+
+def test_snapshot_can_be_narrowed_to_books_and_documents(seed_project):
+    project_id = seed_project(books=3, documents_per_book=2)
+    full = load_project_snapshot(project_id)
+    first_book = full.books[0]
+
+    by_book = load_project_snapshot(project_id, book_ids=[first_book.id])
+    by_document = load_project_snapshot(project_id, document_ids=[first_book.documents[0].id])
+
+    assert [book.id for book in by_book.books] == [first_book.id]
+    assert by_book.books[0].documents == first_book.documents
+    assert list(by_document.documents_by_id) == [first_book.documents[0].id]
+
+
+def test_snapshot_is_immutable(seed_project):
+    snapshot = load_project_snapshot(seed_project())
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        snapshot.name = "changed"
+    with pytest.raises(TypeError):
+        snapshot.books[0].documents[0].details[0]["M0"] = "changed"
+    assert load_project_snapshot(-1) is None
+
+
+def test_project_window_reads_from_snapshot_without_queries(seed_project, query_log):
+    pytest.importorskip("PyQt6")
+    from PyQt6.QtWidgets import QApplication
+    from views.OpenProject.project_window import ProjectWindow
+
+    app = QApplication.instance() or QApplication([])
+    snapshot = load_project_snapshot(seed_project())
+    query_log.clear()
+
+    window = ProjectWindow(snapshot.id, snapshot.book_data(), snapshot=snapshot)
+
+    assert query_log == []
+    window.deleteLater()
+
+
+def test_read_paths_return_compact_records(seed_project):
+    from database import db_methods
+    from database.snapshot import BookSnapshot, DocumentSnapshot, DocumentSummary
+    project_id = seed_project(books=2, documents_per_book=2)
+
+    books = db_methods.get_books_by_project(project_id)
+    documents = db_methods.get_documents_by_book(books[0].id)
+    summaries = db_methods.get_documents_by_books([book.id for book in books])[books[1].id]
+
+    assert all(type(book) is BookSnapshot and not hasattr(book, "__dict__") for book in books)
+    assert all(type(document) is DocumentSnapshot and not hasattr(document, "__dict__") for document in documents)
+    assert all(type(summary) is DocumentSummary for summary in summaries)
+    assert db_methods.get_project_by_id(project_id).name == db_methods.get_project_by_name("Test Project").name
+    # Repeated values share one string object
+    assert documents[0].state is documents[1].state is summaries[0].state
@@ -0,0 +1,108 @@
+"""Walk a project through every OpenProject dialog and check the number of SQL statements.
+
+The budget must hold for a tiny and a large project alike, so a query issued per book or per
+document (an N+1 loop) fails here.
+"""
+import pytest
+
+pytest.importorskip("PyQt6")
+from PyQt6.QtWidgets import QApplication
+
+from views.worker import wait_for_background_tasks
+
+SIZES = [(1, 2), (6, 15)]  # (books, documents per book)
+SNAPSHOT_QUERIES = 6  # project, books, documents, placements, milestone values, milestone names
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def no_exec(monkeypatch):
+    """Record the dialogs that would be opened instead of running their event loops."""
+    opened = []
+    from PyQt6.QtWidgets import QDialog
+    monkeypatch.setattr(QDialog, "exec", lambda dialog: opened.append(dialog))
+    return opened
+
+
+@pytest.mark.parametrize("books, documents_per_book", SIZES)
+def test_open_project_window(qapp, seed_project, max_queries, books, documents_per_book):
+    from views.OpenProject.open_project import OpenProjectWindow
+    seed_project(name="Other", books=books, documents_per_book=documents_per_book)
+    seed_project(books=books, documents_per_book=documents_per_book)
+
+    with max_queries(5):  # Names, the highlighted project, and the prefetch of its books and documents
+        dialog = OpenProjectWindow()
+        wait_for_background_tasks()
+        dialog.search_input.setText("Test Project")
+        dialog.select_first_match()
+        wait_for_background_tasks()
+    assert dialog.selected_project_id is not None
+
+
+@pytest.mark.parametrize("books, documents_per_book", SIZES)
+def test_open_project_through_every_dialog(qapp, seed_project, max_queries, no_exec, books, documents_per_book):
+    from views.OpenProject.choose_books import ChooseBooks
+    project_id = seed_project(books=books, documents_per_book=documents_per_book)
+
+    with max_queries(2):
+        choose_books = ChooseBooks(project_id)
+        wait_for_background_tasks()
+
+    with max_queries(1):  # The documents of all checked books together
+        choose_books.select_all_books()
+        choose_books.collect_selected_books_to_new_page()
+        wait_for_background_tasks()
+        choose_documents = no_exec.pop()
+
+    with max_queries(SNAPSHOT_QUERIES):  # Full rows and details of the kept documents only
+        choose_documents.select_all_documents()
+        choose_documents.collect_selected_documents()
+        project_window = no_exec.pop()
+        wait_for_background_tasks()
+    assert sum(table.model().rowCount() for table in project_window.document_tables) == books * documents_per_book
+
+
+@pytest.mark.parametrize("books, documents_per_book", SIZES)
+def test_dialogs_opened_without_snapshot(qapp, seed_project, select_all_documents, max_queries,
+                                         books, documents_per_book):
+    from views.OpenProject.choose_sections import ChooseSections
+    from views.OpenProject.project_window import ProjectWindow
+    project_id = seed_project(books=books, documents_per_book=documents_per_book)
+    selected = select_all_documents(project_id)
+
+    with max_queries(SNAPSHOT_QUERIES):
+        ChooseSections(selected, project_id)
+        wait_for_background_tasks()
+    with max_queries(SNAPSHOT_QUERIES):
+        ProjectWindow(project_id, selected)
+        wait_for_background_tasks()
+
+
+def test_guard_reports_the_statements(seed_project, max_queries):
+    from database.db_methods import get_documents_by_book, get_books_by_project
+    project_id = seed_project(books=3)
+
+    with pytest.raises(AssertionError, match="4 queries, expected at most 2"):
+        with max_queries(2):
+            for book in get_books_by_project(project_id):  # The N+1 loop the guard exists to catch
+                get_documents_by_book(book.id)
+
+
+def test_documents_of_many_books_in_one_query_per_chunk(seed_project, max_queries, monkeypatch):
+    from database import db_methods
+    project_id = seed_project(books=5, documents_per_book=3)
+    book_ids = [book.id for book in db_methods.get_books_by_project(project_id)]
+
+    with max_queries(1):
+        documents = db_methods.get_documents_by_books(book_ids[::-1] + [-1])
+    assert list(documents) == book_ids[::-1] + [-1]
+    assert [len(rows) for rows in documents.values()] == [3, 3, 3, 3, 3, 0]
+    assert all(row.book_id == book_id for book_id, rows in documents.items() for row in rows)
+
+    monkeypatch.setattr(db_methods, "DOCUMENT_ID_CHUNK_SIZE", 2)
+    with max_queries(3):
+        assert db_methods.get_documents_by_books(book_ids) == {book_id: documents[book_id] for book_id in book_ids}
@@ -0,0 +1,78 @@
+from sqlalchemy import inspect
+
+from database import db_methods
+from database.migrate_db import create_missing_indexes
+from database.db_config import Base
+from database.instrumentation import capture_statements
+
+# Functions that list a whole table on purpose
+FULL_SCAN_ALLOWED = {"get_all_project_names"}
+
+
+def full_scans(connection, statement, parameters):
+    """Return the plan lines of a statement that read a whole table."""
+    if connection.dialect.name == "sqlite":
+        plan = [row[3] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+        # "SCAN tbl" reads every row; "SCAN (subquery-1)" / "SCAN CONSTANT ROW" only walk IN (...) lists
+        return [line for line in plan if line.startswith("SCAN tbl")]
+    plan = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).mappings().all()
+    return [f"{row['table']}: {row['type']}" for row in plan if row["type"] == "ALL"]
+
+
+def select_statements(engine, call):
+    """The SELECT statements run by call, with their parameters."""
+    with capture_statements(engine, with_parameters=True) as statements:
+        call()
+    return [(statement, parameters) for statement, parameters in statements
+            if statement.lstrip().upper().startswith("SELECT")]
+
+
+def test_db_methods_do_not_scan_whole_tables(db_engine, seed_project, select_all_documents):
+    project_id = seed_project(books=2, documents_per_book=3)
+    seed_project(name="Other Project")
+    selected = select_all_documents(project_id)
+    book_id = next(iter(selected))
+    document_id = selected[book_id]["documents"][0].id
+
+    calls = {
+        "get_all_project_names": lambda: db_methods.get_all_project_names(),
+        "get_project_by_name": lambda: db_methods.get_project_by_name("Test Project"),
+        "get_project_by_id": lambda: db_methods.get_project_by_id(project_id),
+        "get_books_by_project": lambda: db_methods.get_books_by_project(project_id),
+        "get_documents_by_book": lambda: db_methods.get_documents_by_book(book_id),
+        "get_sections_by_project": lambda: db_methods.get_sections_by_project(project_id),
+        "get_subsections_by_project": lambda: db_methods.get_subsections_by_project(project_id),
+        "get_project_details": lambda: db_methods.get_project_details(project_id, selected),
+        "get_document_details": lambda: db_methods.get_document_details(project_id, book_id, document_id),
+        "get_document_details_bulk": lambda: db_methods.get_document_details_bulk(project_id, [document_id]),
+        "load_project_snapshot": lambda: db_methods.load_project_snapshot(project_id),
+        "load_project_snapshot(book_ids)": lambda: db_methods.load_project_snapshot(project_id, book_ids=[book_id]),
+        "load_project_snapshot(document_ids)":
+            lambda: db_methods.load_project_snapshot(project_id, document_ids=[document_id]),
+    }
+
+    offenders = {}
+    for name, call in calls.items():
+        statements = select_statements(db_engine, call)
+        assert statements, f"{name} issued no SELECT"
+        if name in FULL_SCAN_ALLOWED:
+            continue
+        with db_engine.connect() as connection:
+            for statement, parameters in statements:
+                scans = full_scans(connection, statement, parameters)
+                if scans:
+                    offenders.setdefault(name, []).extend(scans)
+
+    assert offenders == {}
+
+
+def test_index_migration_is_idempotent(db_engine):
+    index = next(index for index in Base.metadata.tables["tblsection_relation"].indexes
+                 if index.name == "ix_tblsection_relation_project_order")
+    index.drop(bind=db_engine)
+
+    assert create_missing_indexes(db_engine) == ["ix_tblsection_relation_project_order"]
+    assert create_missing_indexes(db_engine) == []
+    assert "ix_tblsection_relation_project_order" in {
+        existing["name"] for existing in inspect(db_engine).get_indexes("tblsection_relation")
+    }
@@ -0,0 +1,44 @@
+import pytest
+from sqlalchemy import event
+
+from database.db_config import session_scope
+from database.db_methods import get_all_project_names, get_project_by_id, get_books_by_project
+from models.models import Project
+
+
+def test_nested_calls_share_one_connection(db_engine, seed_project):
+    project_id = seed_project()
+    checkouts = []
+    event.listen(db_engine, "checkout", lambda *args: checkouts.append(1))
+
+    with session_scope():
+        get_all_project_names()
+        project = get_project_by_id(project_id)
+        books = get_books_by_project(project_id)
+
+    assert len(checkouts) == 1
+    assert project.name == "Test Project"  # Still readable after the scope has closed
+    assert len(books) == 2
+
+
+def test_scope_rolls_back_on_error(db_engine):
+    with pytest.raises(RuntimeError):
+        with session_scope() as session:
+            session.add(Project(name="Never saved"))
+            session.flush()
+            raise RuntimeError("boom")
+
+    assert get_all_project_names() == {}
+
+
+def test_failed_pool_warm_up_is_logged(monkeypatch, caplog):
+    from types import SimpleNamespace
+    from database import db_config
+
+    def refuse():
+        raise ConnectionError("server gone")
+
+    monkeypatch.setattr(db_config, "engine", SimpleNamespace(dialect=SimpleNamespace(name="mysql"), connect=refuse))
+    with caplog.at_level("WARNING", logger="dms.db"):
+        assert db_config.warm_up_pool(2) == 0
+    assert "Database warm-up failed after 0 connection(s): server gone" in caplog.text
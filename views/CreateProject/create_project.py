@@ -6,11 +6,14 @@ import csv
 from PyQt6.QtWidgets import QListWidgetItem
 
 from views.CreateProject.create_projecy_html_window import CreateProjectHtml
+from views.perf_hud import measured_init
+from views.profiling import profile_block
 
 
 class CreateProjectWindow(QDialog):
     """Window for creating a new project"""
 
+    @measured_init
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Create Project")
@@ -186,32 +189,37 @@ class CreateProjectWindow(QDialog):
         project_name = self.project_name_label.text().strip()
         books_data = []  # List to store structured book data
 
-        for i in range(len(self.book_paths)):  # Retrieve stored file paths
-            file_path = self.book_paths[i]
-
-            if not os.path.exists(file_path):  #  Ensure file exists before opening
-                print(f"Error: File not found - {file_path}")
-                QMessageBox.warning(self, "File Not Found", f"Could not find: {file_path}")
-                continue
-
-            book_info = {"name": os.path.basename(file_path), "headers": [], "rows": []}
-
-            # Read CSV files and store structured data
-            if file_path.lower().endswith('.csv'):
-                try:
-                    with open(file_path, "r", encoding="utf-8") as file:
-                        csv_reader = csv.reader(file)
-                        headers = next(csv_reader, None)  # Extract headers (first row)
-
-                        if headers:
-                            book_info["headers"] = headers  # Save headers
-                            book_info["rows"] = [row for row in csv_reader]  # Read data
-                        else:
-                            print( f"Warning: No headers found in {file_path}. Skipping file.")
-                except Exception as e:
-                    print(f" Error reading {file_path}: {e}")
-
-            books_data.append(book_info)
+        missing = []  # Reported after parsing, so the profile does not include the message boxes
+        with profile_block("CreateProjectWindow.load_csv"):
+            for i in range(len(self.book_paths)):  # Retrieve stored file paths
+                file_path = self.book_paths[i]
+
+                if not os.path.exists(file_path):  #  Ensure file exists before opening
+                    print(f"Error: File not found - {file_path}")
+                    missing.append(file_path)
+                    continue
+
+                book_info = {"name": os.path.basename(file_path), "headers": [], "rows": []}
+
+                # Read CSV files and store structured data
+                if file_path.lower().endswith('.csv'):
+                    try:
+                        with open(file_path, "r", encoding="utf-8") as file:
+                            csv_reader = csv.reader(file)
+                            headers = next(csv_reader, None)  # Extract headers (first row)
+
+                            if headers:
+                                book_info["headers"] = headers  # Save headers
+                                book_info["rows"] = [row for row in csv_reader]  # Read data
+                            else:
+                                print( f"Warning: No headers found in {file_path}. Skipping file.")
+                    except Exception as e:
+                        print(f" Error reading {file_path}: {e}")
+
+                books_data.append(book_info)
+
+        for file_path in missing:
+            QMessageBox.warning(self, "File Not Found", f"Could not find: {file_path}")
 
         if not books_data:
             QMessageBox.warning(self, "No Books Added", "Please add at least one book before continuing.")
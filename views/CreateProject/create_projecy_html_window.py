@@ -3,6 +3,7 @@ import csv
 import os
 from PyQt6.QtWidgets import QHeaderView, QToolButton, QMenu, QFileDialog, QMessageBox
 from views.CreateProject.book_reorder_dialog import BookReorderDialog
+from views.perf_hud import measured_init
 
 
 class GroupView(QtWidgets.QTreeView):
@@ -210,6 +211,7 @@ class GroupModel(QtGui.QStandardItemModel):
 class CreateProjectHtml(QtWidgets.QDialog):
     """Main Window for Managing Book Data"""
 
+    @measured_init
     def __init__(self, parent=None, project_name="", books_data=None):
         super().__init__(parent)
         self.setWindowTitle(f"Create HTML for {project_name}")
@@ -0,0 +1,163 @@
+from bisect import bisect_left
+
+from PyQt6.QtWidgets import QTableView, QHeaderView, QAbstractItemView
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+ROW_HEIGHT = 40
+FILTER_DELAY_MS = 150  # Wait this long after the last keystroke before filtering
+CHECKED = 1
+UNCHECKED = 0
+
+
+class CheckableTableModel(QAbstractTableModel):
+    """Read-only rows with a trailing "Select" checkbox column.
+
+    Checked state lives in a bytearray with one byte per row, so selecting or clearing every row is
+    a single fill followed by one dataChanged, however many rows there are.
+
+    Filtering swaps in the list of rows to show and resets the model once. A QSortFilterProxyModel
+    would call back into Python for every row on each filter change. Row numbers passed to and
+    returned by the selection methods always refer to the full, unfiltered list.
+    """
+
+    def __init__(self, headers, rows, items, parent=None):
+        super().__init__(parent)
+        self.headers = list(headers) + ["Select"]
+        self.rows = rows  # Display tuples, one per row
+        self.items = items  # Document behind each row
+        self.checked = bytearray(len(rows))
+        self.check_column = len(headers)
+        self.visible_rows = None  # None shows every row
+
+    def set_rows(self, rows, items):
+        """Replace every row, e.g. once a background load finishes; the check state is cleared."""
+        self.beginResetModel()
+        self.rows = rows
+        self.items = items
+        self.checked = bytearray(len(rows))
+        self.visible_rows = None
+        self.endResetModel()
+
+    def source_row(self, row):
+        return row if self.visible_rows is None else self.visible_rows[row]
+
+    def set_visible_rows(self, rows):
+        self.beginResetModel()
+        self.visible_rows = None if rows is None else list(rows)
+        self.endResetModel()
+
+    # --- Qt model interface ---
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.rows) if self.visible_rows is None else len(self.visible_rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if index.column() == self.check_column:
+            if role == Qt.ItemDataRole.CheckStateRole:
+                return Qt.CheckState.Checked if self.checked[self.source_row(index.row())] else Qt.CheckState.Unchecked
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.rows[self.source_row(index.row())][index.column()]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.column() == self.check_column:
+            flags |= Qt.ItemFlag.ItemIsUserCheckable
+        return flags
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.CheckStateRole or index.column() != self.check_column:
+            return False
+        checked = value in (Qt.CheckState.Checked, Qt.CheckState.Checked.value)
+        self.checked[self.source_row(index.row())] = CHECKED if checked else UNCHECKED
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+        return True
+
+    # --- Bulk selection ---
+    def set_all_checked(self, checked):
+        self.checked[:] = bytes([CHECKED if checked else UNCHECKED]) * len(self.checked)
+        self.emit_check_state_changed()
+
+    def set_rows_checked(self, rows, checked=True):
+        for row in rows:
+            self.checked[row] = CHECKED if checked else UNCHECKED
+        self.emit_check_state_changed()
+
+    def emit_check_state_changed(self):
+        """One dataChanged covering the whole Select column."""
+        if self.rowCount():
+            self.dataChanged.emit(self.index(0, self.check_column),
+                                  self.index(self.rowCount() - 1, self.check_column),
+                                  [Qt.ItemDataRole.CheckStateRole])
+
+    def checked_rows(self):
+        return [row for row, flag in enumerate(self.checked) if flag]
+
+    def checked_items(self):
+        return [self.items[row] for row in self.checked_rows()]
+
+
+class SearchIndex:
+    """Lowercase search keys for every row, built once when the dialog opens.
+
+    Prefix lookups bisect a sorted copy of the keys. Substring lookups scan the keys, and when the
+    new text extends the previous one only the rows that matched last time are scanned again.
+    """
+
+    def __init__(self, keys):
+        self.keys = [(key or "").strip().lower() for key in keys]
+        self.sorted_keys = sorted((key, row) for row, key in enumerate(self.keys))
+        self.last_text = None
+        self.last_rows = None
+
+    def prefix_rows(self, text, limit=None):
+        """Rows whose key starts with text, in key order; at most limit of them if given."""
+        text = text.strip().lower()
+        start = bisect_left(self.sorted_keys, (text, -1))
+        sorted_keys = self.sorted_keys
+        rows = []
+        for position in range(start, len(sorted_keys)):
+            key, row = sorted_keys[position]
+            if not key.startswith(text) or len(rows) == limit:
+                break
+            rows.append(row)
+        return rows
+
+    def substring_rows(self, text):
+        text = text.strip().lower()
+        if self.last_text is not None and text.startswith(self.last_text):
+            candidates = self.last_rows
+        else:
+            candidates = range(len(self.keys))
+        keys = self.keys
+        rows = [row for row in candidates if text in keys[row]]
+        self.last_text, self.last_rows = text, rows
+        return rows
+
+
+class CheckableTableView(QTableView):
+    """Table for a CheckableTableModel with the dialogs' fixed row height."""
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.verticalHeader().setVisible(False)
+        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.verticalHeader().setDefaultSectionSize(ROW_HEIGHT)
+        self.horizontalHeader().setStretchLastSection(True)
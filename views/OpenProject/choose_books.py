@@ -1,12 +1,17 @@
-from PyQt6.QtWidgets import QDialog, QWidget, QHBoxLayout, QListWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QHeaderView, QSizePolicy, QCheckBox, QMessageBox
-from PyQt6.QtCore import Qt
-from database.db_methods import get_project_by_id, get_books_by_project, get_documents_by_book
+from PyQt6.QtWidgets import QDialog, QWidget, QHBoxLayout, QListWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QHeaderView, QSizePolicy, QCheckBox, QMessageBox, QLabel
+from PyQt6.QtCore import Qt, QTimer
+from database.db_methods import get_project_books, get_documents_by_books, load_project_snapshot
+from database.instrumentation import query_scope
+from views.worker import run_in_background, cancel_task
+from views.prefetch import Prefetcher, PREFETCH_DELAY_MS
 from views.OpenProject.choose_documents import ChooseDocuments
+from views.perf_hud import measured_init, mark_loaded
 
 
 class ChooseBooks(QDialog):
     """Dialog displaying project details and list of books with selection capability."""
 
+    @measured_init
     def __init__(self, project_id, book_data=None, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Project Details")
@@ -16,41 +21,20 @@ class ChooseBooks(QDialog):
 
         main_layout = QVBoxLayout()
 
-        # Load project details
+        # Only the project and its books are loaded here, off the GUI thread; the documents of the
+        # checked books are fetched together once Next is clicked
         self.project_id = project_id
-        self.project = get_project_by_id(project_id)
-        self.books = get_books_by_project(project_id)
-
-        if not self.project:
-            print(f"Error: No project found for ID {project_id}")
-            return
-
-        # Determine the number of rows needed
-        num_rows = max(1, len(self.books))
-
-        # Create Table with Dynamic Rows (One Book per Row)
-        self.project_table = QTableWidget(num_rows, 3)  # Now 3 columns
-        self.project_table.setHorizontalHeaderLabels(["Product Name", "Books", "Select"])
-
-        # Ensure the Project name only appears in the first row
-        name_item = QTableWidgetItem(self.project.name)
-        name_item.setTextAlignment(Qt.AlignmentFlag.AlignLeft)
-        name_item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled)  # Read-only format
-
-        self.project_table.setItem(0, 0, name_item)
-
-        # Add books to individual rows under the "Books" column
+        self.project = None
+        self.books = []
         self.checkboxes = []
-        for row, book in enumerate(self.books):
-            book_item = QTableWidgetItem(book.name)
-            book_item.setTextAlignment(Qt.AlignmentFlag.AlignLeft)
-            book_item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled)
 
-            checkbox = QCheckBox()
-            self.checkboxes.append(checkbox)
+        self.loading_label = QLabel("Loading project...")
+        self.loading_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-            self.project_table.setItem(row, 1, book_item)
-            self.project_table.setCellWidget(row, 2, checkbox)
+        # Create Table with Dynamic Rows (One Book per Row), filled once the books arrive
+        self.project_table = QTableWidget(0, 3)  # Now 3 columns
+        self.project_table.setHorizontalHeaderLabels(["Product Name", "Books", "Select"])
+        self.project_table.setVisible(False)
 
         # Enable Scrollbars to Prevent Cutting Off Rows
         self.project_table.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
@@ -65,10 +49,6 @@ class ChooseBooks(QDialog):
         self.project_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
         self.project_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
 
-        # Fix Row Height for Readability
-        for row in range(num_rows):
-            self.project_table.setRowHeight(row, 40)
-
         # Select All Button
         self.select_all_btn = QPushButton("Select All")
         self.select_all_btn.clicked.connect(self.select_all_books)
@@ -100,6 +80,7 @@ class ChooseBooks(QDialog):
         self.close_btn.setStyleSheet("font-size: 18px; padding: 10px; border-radius: 20px;")
 
         # Add the table and buttons to the layout
+        main_layout.addWidget(self.loading_label)
         main_layout.addWidget(self.project_table)
         button_layout = QHBoxLayout()
 
@@ -113,6 +94,78 @@ class ChooseBooks(QDialog):
 
         self.setLayout(main_layout)
 
+        self.set_loading(True)
+        self.load_task = run_in_background(get_project_books, project_id,
+                                           on_result=self.show_books, on_error=self.show_load_error)
+        self.documents_task = None
+
+        # While books are being checked, load their documents and details ahead of Next
+        self.prefetcher = Prefetcher()
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(PREFETCH_DELAY_MS)
+        self.prefetch_timer.timeout.connect(self.prefetch_checked_books)
+
+    def set_loading(self, loading):
+        for button in (self.select_all_btn, self.deselect_all_btn, self.next_btn):
+            button.setEnabled(not loading)
+
+    def show_load_error(self, error):
+        self.load_task = None
+        self.loading_label.setText(f"Could not load the project: {error}")
+
+    def show_books(self, result):
+        """Fill the table from the loaded project and book rows."""
+        self.load_task = None
+        self.project, self.books = result
+
+        if not self.project:
+            print(f"Error: No project found for ID {self.project_id}")
+            self.loading_label.setText("Project not found.")
+            return
+
+        # Determine the number of rows needed
+        num_rows = max(1, len(self.books))
+        self.project_table.setRowCount(num_rows)
+
+        # Ensure the Project name only appears in the first row
+        name_item = QTableWidgetItem(self.project.name)
+        name_item.setTextAlignment(Qt.AlignmentFlag.AlignLeft)
+        name_item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled)  # Read-only format
+
+        self.project_table.setItem(0, 0, name_item)
+
+        # Add books to individual rows under the "Books" column
+        for row, book in enumerate(self.books):
+            book_item = QTableWidgetItem(book.name)
+            book_item.setTextAlignment(Qt.AlignmentFlag.AlignLeft)
+            book_item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled)
+
+            checkbox = QCheckBox()
+            checkbox.toggled.connect(lambda: self.prefetch_timer.start())
+            self.checkboxes.append(checkbox)
+
+            self.project_table.setItem(row, 1, book_item)
+            self.project_table.setCellWidget(row, 2, checkbox)
+
+        # Fix Row Height for Readability
+        for row in range(num_rows):
+            self.project_table.setRowHeight(row, 40)
+
+        self.loading_label.setVisible(False)
+        self.project_table.setVisible(True)
+        self.set_loading(False)
+        mark_loaded(self)
+
+    def reject(self):
+        """Back: drop the loads if they are still running."""
+        cancel_task(self.load_task)
+        cancel_task(self.documents_task)
+        self.load_task = self.documents_task = None
+        self.prefetch_timer.stop()
+        self.prefetcher.cancel()
+        super().reject()
+
     def select_all_books(self):
         """Mark all checkboxes as checked."""
         for checkbox in self.checkboxes:
@@ -124,23 +177,73 @@ class ChooseBooks(QDialog):
             checkbox.setChecked(False)
 
 
+    def checked_book_ids(self):
+        return [book.id for book, checkbox in zip(self.books, self.checkboxes)
+                if checkbox.isChecked() and book.project_id == self.project_id]
+
+    def prefetch_checked_books(self):
+        """Load the snapshot of the checked books; a newer selection cancels the previous load."""
+        book_ids = self.checked_book_ids()
+        if not book_ids:
+            self.prefetcher.cancel("books")
+            return
+        with query_scope(type(self).__name__):
+            self.prefetcher.prefetch("books", load_project_snapshot, self.project_id, book_ids=book_ids)
+
     def collect_selected_books_to_new_page(self):
         self.selected_books = [book for book, checkbox in zip(self.books, self.checkboxes) if checkbox.isChecked()]
         if not self.selected_books:
             QMessageBox.warning(self, 'No Book Selected', 'Please select at least one book to continue.')
             return
 
-        # Prepare book_data for the next dialog
-        book_data = {}
-        for book in self.selected_books:
-            if book.project_id == self.project_id:  # Ensuring the project_id matches the current project
-                documents = get_documents_by_book(book.id)
-
-                # Save book_name and documents together
-                book_data[book.id] = {
-                    "book_name": book.name,
-                    "documents": documents
-                }
+        # Ensuring the project_id matches the current project
+        book_ids = self.checked_book_ids()
+
+        # Prefetched (or still prefetching) while the books were checked
+        self.prefetch_timer.stop()
+        self.set_loading(True)
+        if self.prefetcher.join("books", load_project_snapshot, self.project_id, book_ids=book_ids,
+                                on_result=lambda snapshot: self.open_snapshot(snapshot, book_ids)):
+            return
+
+        # Document lists prefetched by OpenProjectWindow
+        found, documents_by_book = get_documents_by_books.peek([book.id for book in self.books])
+        if found:
+            self.open_documents({book_id: documents_by_book[book_id] for book_id in book_ids})
+            return
+
+        # One query for the documents of every selected book
+        with query_scope(type(self).__name__):
+            self.documents_task = run_in_background(get_documents_by_books, book_ids,
+                                                    on_result=self.open_documents,
+                                                    on_error=self.show_documents_error)
+
+    def show_documents_error(self, error):
+        self.documents_task = None
+        self.set_loading(False)
+        QMessageBox.warning(self, 'Error', f'Could not load the documents: {error}')
+
+    def open_snapshot(self, snapshot, book_ids):
+        if snapshot is None:  # The prefetch failed
+            self.set_loading(False)
+            self.prefetcher.cancel("books")
+            self.collect_selected_books_to_new_page()
+            return
+        self.set_loading(False)
+        select_documents_dialog = ChooseDocuments(snapshot.book_data(book_ids), self.project_id, self,
+                                                  snapshot=snapshot)
+        select_documents_dialog.exec()
+
+    def open_documents(self, documents_by_book):
+        self.documents_task = None
+        self.set_loading(False)
+
+        # Prepare book_data for the next dialog: book_name and documents together
+        book_names = {book.id: book.name for book in self.selected_books}
+        book_data = {
+            book_id: {"book_name": book_names[book_id], "documents": documents}
+            for book_id, documents in documents_by_book.items()
+        }
 
         # Open select_documents dialog
         select_documents_dialog = ChooseDocuments(book_data, self.project_id, self)
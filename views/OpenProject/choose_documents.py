@@ -1,22 +1,27 @@
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QTableWidget, QTableWidgetItem, QCheckBox, QPushButton, QHeaderView, \
-    QMessageBox, QHBoxLayout, QSizePolicy, QLineEdit, QComboBox
-from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QPushButton, QHeaderView, QMessageBox, QHBoxLayout, QSizePolicy, \
+    QLineEdit, QComboBox
+from PyQt6.QtCore import QTimer
+
+from views.OpenProject.checkable_table import CheckableTableModel, CheckableTableView, SearchIndex, \
+    FILTER_DELAY_MS
 
 from views.OpenProject.choose_sections import ChooseSections
 from views.OpenProject.project_window import ProjectWindow
+from views.perf_hud import measured_init
 
 class ChooseDocuments(QDialog):
     """Dialog for selecting documents related to selected books."""
 
-    def __init__(self, book_data, project_id, parent=None):
+    @measured_init
+    def __init__(self, book_data, project_id, parent=None, snapshot=None):
         super().__init__(parent)
         self.setWindowTitle("Select Documents")
         self.resize(800, 600)
         self.setModal(True)
         self.selected_documents = []
         self.project_id = project_id
+        self.snapshot = snapshot  # ProjectSnapshot of the books, if the caller already has one
         self.book_data = book_data #book[book.id] = {"name":"", "documents":[]}
-        self.all_rows = []
 
         self.setObjectName("ChooseDocuments")  # For QSS styling
 
@@ -26,7 +31,7 @@ class ChooseDocuments(QDialog):
         filter_layout = QHBoxLayout()
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search by Document Name...")
-        self.search_input.textChanged.connect(self.apply_filters)
+        self.search_input.textChanged.connect(lambda: self.filter_timer.start())
         filter_layout.addWidget(self.search_input)
 
         self.release_state_combo = QComboBox()
@@ -37,91 +42,42 @@ class ChooseDocuments(QDialog):
 
         main_layout.addLayout(filter_layout)
 
-        # Create Table with Dynamic Rows (One Document per Row)
-        row_count = sum(len(docs) for docs in book_data.values())
-        self.project_table = QTableWidget(row_count, 7)
-        self.project_table.setHorizontalHeaderLabels([
-            "Book", "Document", "Description", "Revision", "Owner", "State", "Select"
-        ])
-        self.checkboxes = []
-        row = 0
+        # Filter once typing pauses rather than on every keystroke
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(FILTER_DELAY_MS)
+        self.filter_timer.timeout.connect(self.apply_filters)
 
+        # One row per document; the book name is shown on the first document of each book
+        rows, documents = [], []
         for book_id, book_info in self.book_data.items():
             book_name = book_info["book_name"]
-            documents = book_info["documents"]
-
-            for doc_index, doc in enumerate(documents):  # Now iterating over documents list
-                document_name = doc.name
-                doc_description = doc.description or ""
-                doc_revision = doc.revision or ""
-                doc_owner = doc.owner or ""
-                doc_state = doc.state or ""
-
-                if doc_index == 0:
-                    book_item = QTableWidgetItem(book_name)
-                    book_item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled)
-                    self.project_table.setItem(row, 0, book_item)
-                else:
-                    empty_item = QTableWidgetItem("")
-                    empty_item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled)
-                    self.project_table.setItem(row, 0, empty_item)
-
-                # Document Name
-                doc_item = QTableWidgetItem(document_name)
-                doc_item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled)
-                self.project_table.setItem(row, 1, doc_item)
-
-                # Document Description
-                desc_item = QTableWidgetItem(doc_description)
-                desc_item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled)
-                self.project_table.setItem(row, 2, desc_item)
-
-                # Document Revision
-                rev_item = QTableWidgetItem(doc_revision)
-                rev_item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled)
-                self.project_table.setItem(row, 3, rev_item)
-
-                # Document Owner
-                owner_item = QTableWidgetItem(doc_owner)
-                owner_item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled)
-                self.project_table.setItem(row, 4, owner_item)
-
-                # Document State
-                state_item = QTableWidgetItem(doc_state)
-                state_item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled)
-                self.project_table.setItem(row, 5, state_item)
-
-
-                # Add Checkbox
-                checkbox = QCheckBox()
-                self.checkboxes.append(checkbox)
-                self.project_table.setCellWidget(row, 6, checkbox)
-
-                self.project_table.setRowHeight(row, 40)
-                row += 1
-        header = self.project_table.horizontalHeader()
-
-        # Make 'Books' column fit contents and stay small
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
-
-        # Make 'Documents' column interactive for resizing
-        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Interactive)
-
-        # Make 'Description' column fit content size properly
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
-
-        # Make 'Revision', 'Owner', 'State' columns interactive
-        for i in range(3, 6):  # Columns 3 to 5
-            header.setSectionResizeMode(i, QHeaderView.ResizeMode.Interactive)
-
-        # Make 'Select' column interactive but limit its size
-        header.setSectionResizeMode(6, QHeaderView.ResizeMode.Interactive)
-        self.project_table.setColumnWidth(6, 50)  # Set initial width for 'Select' column to 50
+            for doc_index, doc in enumerate(book_info["documents"]):
+                rows.append((
+                    book_name if doc_index == 0 else "",
+                    doc.name,
+                    doc.description or "",
+                    doc.revision or "",
+                    doc.owner or "",
+                    doc.state or "",
+                ))
+                documents.append(doc)
+
+        self.document_model = CheckableTableModel(
+            ["Book", "Document", "Description", "Revision", "Owner", "State"], rows, documents, self
+        )
+        # Search keys are read once here, filtering only looks them up
+        self.title_index = SearchIndex(str(doc.title or "") for doc in documents)
+        self.state_keys = [str(doc.state or "").strip() for doc in documents]
+        self.project_table = CheckableTableView(self.document_model)
 
+        header = self.project_table.horizontalHeader()
+        # Fixed initial widths: sizing columns to their contents would measure every row
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        for column, width in enumerate([150, 200, 250, 80, 120, 100, 50]):
+            self.project_table.setColumnWidth(column, width)
 
-        self.project_table.setSizeAdjustPolicy(QTableWidget.SizeAdjustPolicy.AdjustToContents)
         self.project_table.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        self.project_table.horizontalHeader().setStretchLastSection(True)
         main_layout.addWidget(self.project_table)
 
         # Buttons Layout
@@ -166,65 +122,44 @@ class ChooseDocuments(QDialog):
         search_text = self.search_input.text().strip().lower()
         selected_state = self.release_state_combo.currentText().strip()
 
-        row = 0
-        for book_id, book_info in self.book_data.items():
-            documents = book_info["documents"]
-            for doc in documents:
-                # Безопасное извлечение
-                document_name = getattr(doc, "title", "") or ""
-                if callable(document_name):
-                    document_name = document_name()
-                document_name = str(document_name).strip().lower()
-
-                doc_state = getattr(doc, "state", "") or ""
-                if callable(doc_state):
-                    doc_state = doc_state()
-                doc_state = str(doc_state).strip()
-
-                # Проверка соответствия фильтрам
-                text_match = document_name.startswith(search_text)
-
-                state_match = selected_state == "All States" or doc_state == selected_state
+        if not search_text and selected_state == "All States":
+            self.document_model.set_visible_rows(None)
+            return
 
-                # Устанавливаем видимость строки
-                self.project_table.setRowHidden(row, not (text_match and state_match))
-                row += 1
+        # Document titles starting with the search text, in the selected state
+        rows = self.title_index.prefix_rows(search_text) if search_text else range(len(self.state_keys))
+        if selected_state != "All States":
+            rows = [row for row in rows if self.state_keys[row] == selected_state]
+        self.document_model.set_visible_rows(sorted(rows))  # Table order: book names head their rows
 
     def select_all_documents(self):
-        """Mark all checkboxes as checked."""
-        for checkbox in self.checkboxes:
-            checkbox.setChecked(True)
+        """Check every document."""
+        self.document_model.set_all_checked(True)
 
     def deselect_all_documents(self):
-        """Uncheck all checkboxes."""
-        for checkbox in self.checkboxes:
-            checkbox.setChecked(False)
+        """Uncheck every document."""
+        self.document_model.set_all_checked(False)
 
-    def collect_selected_documents(self):
-        selected_documents = {}
-        row = 0
+    def selected_document_ids(self):
+        """IDs of the checked documents, in table order."""
+        return [document.id for document in self.document_model.checked_items()]
 
-        for book_id, book_info in self.book_data.items():
-            book_name = book_info["book_name"]
-            documents = book_info["documents"]
-
-            selected_documents[book_id] = {
-                "book_name": book_name,
-                "documents": []
-            }
-            print(selected_documents)
-            for document in documents:
-                if self.checkboxes[row].isChecked():
-                    selected_documents[book_id]["documents"].append(document)  # Adding the full document object
-                row += 1
+    def collect_selected_documents(self):
+        selected_documents = {
+            book_id: {"book_name": book_info["book_name"], "documents": []}
+            for book_id, book_info in self.book_data.items()
+        }
+        for document in self.document_model.checked_items():
+            selected_documents[document.book_id]["documents"].append(document)  # Adding the full document object
 
         if not any(book["documents"] for book in selected_documents.values()):
             QMessageBox.warning(self, 'No Document Selected', 'Please select at least one document to continue.')
             return
 
+        self.selected_documents = selected_documents
 
         # Open the ProjectWindow with the selected documents
-        project_window = ProjectWindow(self.project_id, selected_documents, self)
+        project_window = ProjectWindow(self.project_id, selected_documents, self, snapshot=self.snapshot)
         project_window.exec()
 
     def get_selected_documents(self):
@@ -1,14 +1,21 @@
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QTableWidget, QTableWidgetItem, QCheckBox, QPushButton, QHeaderView, \
-    QMessageBox, QHBoxLayout, QSizePolicy, QLineEdit
-
-from database.db_methods import get_project_details, get_document_details
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QPushButton, QHeaderView, QMessageBox, QHBoxLayout, QSizePolicy, \
+    QLineEdit, QLabel
+from PyQt6.QtCore import Qt, QTimer
+
+from database.db_methods import load_project_snapshot
+from database.snapshot import selected_document_ids
+from views.OpenProject.checkable_table import CheckableTableModel, CheckableTableView, SearchIndex, \
+    FILTER_DELAY_MS
 from views.OpenProject.project_window import ProjectWindow
+from views.worker import run_in_background, cancel_task
+from views.perf_hud import measured_init, mark_loaded
 
 
 class ChooseSections(QDialog):
     """Dialog for selecting documents related to selected books."""
 
-    def __init__(self, selected_documents, project_id, parent=None):
+    @measured_init
+    def __init__(self, selected_documents, project_id, parent=None, snapshot=None):
         super().__init__(parent)
         self.setWindowTitle("Select Subsections")
         self.resize(800, 600)
@@ -24,90 +31,42 @@ class ChooseSections(QDialog):
         filter_layout = QHBoxLayout()
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search by Name...")
-        self.search_input.textChanged.connect(self.apply_filters)
+        self.search_input.textChanged.connect(lambda: self.filter_timer.start())
         filter_layout.addWidget(self.search_input)
 
         main_layout.addLayout(filter_layout)
-        # Load project details
-        self.selected_documents = selected_documents
-        structured_data = get_project_details(project_id, self.selected_documents)
-        project_name = structured_data["project"]["project_name"]
-        self.books_data = structured_data["books"]
-
-        # Fetch and attach document details
-        for book_id, book_data in self.books_data.items():
-            for document in book_data["documents"]:
-                document_id = document["document_id"]
-                document_details = get_document_details(project_id=project_id, book_id=book_id, document_id=document_id)
-                document["details"] = document_details
-
-                #  Ensure book_id and book_name are stored in each document
-                document["book_id"] = book_id
-                document["book_name"] = book_data["book_name"]
-
-                # Create Table with Dynamic Rows (One Document per Row)
-        self.table = QTableWidget(0, 4)  # Start with 0 rows
 
-        self.table.setHorizontalHeaderLabels([
-         "Sections", "Subsections", "Documents", "Select"
-        ])
-        self.checkboxes = []
-        rows = 0
+        # Filter once typing pauses rather than on every keystroke
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(FILTER_DELAY_MS)
+        self.filter_timer.timeout.connect(self.apply_filters)
 
-        self.sections = self.collect_sections(self.books_data)
-        last_section = None
-        last_subsection = None
-
-        for section, subsections in self.sections.items():
-            for subsection, docs in subsections.items():
-                for doc in docs:
-                    row = self.table.rowCount()
-                    self.table.insertRow(row)
-
-                    #Section Column
-                    if section != last_section:
-                        self.table.setItem(row, 0, QTableWidgetItem(section))
-                        last_section = section
-                    else:
-                        self.table.setItem(row, 0, QTableWidgetItem(""))
-
-                    # Subsection column
-                    if subsection != last_subsection:
-                        self.table.setItem(row, 1, QTableWidgetItem(subsection))
-                        last_subsection = subsection
-                    else:
-                        self.table.setItem(row, 1, QTableWidgetItem(""))
-
-                    self.table.setItem(row, 2, QTableWidgetItem(doc["doc"]))
-
-                    checkbox= QCheckBox()
-                    self.checkboxes.append((section, subsections, doc, checkbox))
-                    self.table.setCellWidget(row, 3, checkbox)
-                    rows += 1
+        # Load project details; ChooseDocuments hands over the snapshot ChooseBooks loaded
+        self.selected_documents = selected_documents
+        self.document_ids = selected_document_ids(self.selected_documents)
+        self.snapshot = None
+        self.books_data = {}
+        self.sections = {}
+        self.search_index = SearchIndex([])
+        self.document_model = CheckableTableModel(["Sections", "Subsections", "Documents"], [], [], self)
+        self.table = CheckableTableView(self.document_model)
+
+        self.loading_label = QLabel("Loading documents...")
+        self.loading_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.loading_label.setVisible(False)
+        main_layout.addWidget(self.loading_label)
 
         header = self.table.horizontalHeader()
-
-        # Make 'Section' column fit contents and stay small
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
-
-        # Make 'Subsection' column interactive for resizing
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        # Make 'Subsection' column take the free space
         header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
-
-        # Make 'Docs' column fit content size properly
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
-
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
-
+        self.table.setColumnWidth(0, 150)
+        self.table.setColumnWidth(2, 200)
         #fixed 'Select' row
         self.table.setColumnWidth(3, 50)
 
-        # Fix Row Height for Readability
-        for row in range(rows):
-            self.table.setRowHeight(row, 40)
-
-        self.table.setSizeAdjustPolicy(QTableWidget.SizeAdjustPolicy.AdjustToContents)
         self.table.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        self.table.horizontalHeader().setStretchLastSection(True)
         main_layout.addWidget(self.table)
 
         # Buttons Layout
@@ -148,32 +107,83 @@ class ChooseSections(QDialog):
         main_layout.addLayout(buttons_layout)
         self.setLayout(main_layout)
 
-    def apply_filters(self):
-        search_text = self.search_input.text().lower()
-        row = 0
+        self.load_task = None
+        if snapshot is None:
+            self.set_loading(True)
+            self.load_task = run_in_background(load_project_snapshot, project_id, document_ids=self.document_ids,
+                                               on_result=self.show_documents, on_error=self.show_load_error)
+        else:
+            self.show_documents(snapshot)
+
+    def set_loading(self, loading):
+        self.loading_label.setVisible(loading)
+        self.table.setVisible(not loading)
+        for button in (self.select_all_btn, self.deselect_all_btn, self.next_btn):
+            button.setEnabled(not loading)
+
+    def show_load_error(self, error):
+        self.load_task = None
+        self.loading_label.setText(f"Could not load the documents: {error}")
+
+    def show_documents(self, snapshot):
+        """Fill the table from the ProjectSnapshot."""
+        self.load_task = None
+        if snapshot is None:
+            self.loading_label.setText("Project not found.")
+            return
+        self.snapshot = snapshot
+        structured_data = self.snapshot.project_details(self.document_ids)  # Details are already attached
+        self.books_data = structured_data["books"]
+
+        for book_id, book_data in self.books_data.items():
+            for document in book_data["documents"]:
+                #  Ensure book_id and book_name are stored in each document
+                document["book_id"] = book_id
+                document["book_name"] = book_data["book_name"]
+
+        # One row per document, grouped by section and subsection
+        rows, documents = [], []
+        self.sections = self.collect_sections(self.books_data)
+        last_section = None
+        last_subsection = None
 
         for section, subsections in self.sections.items():
             for subsection, docs in subsections.items():
                 for doc in docs:
-                    subsection_match = search_text in subsection.lower()
-                    document_match = search_text in doc["title"].lower()
-
-                    if subsection_match or document_match:
-                        self.table.setRowHidden(row, False)
-                    else:
-                        self.table.setRowHidden(row, True)
+                    rows.append((
+                        section if section != last_section else "",
+                        subsection if subsection != last_subsection else "",
+                        doc["doc"],
+                    ))
+                    documents.append(doc)
+                    last_section, last_subsection = section, subsection
+
+        self.document_model.set_rows(rows, documents)
+        # Subsection and title of each row in one key, so one substring test covers both
+        self.search_index = SearchIndex(f"{doc['subsection']}\n{doc['title'] or ''}" for doc in documents)
+        self.set_loading(False)
+        mark_loaded(self)
+
+    def reject(self):
+        """Back: drop the load if it is still running."""
+        cancel_task(self.load_task)
+        self.load_task = None
+        super().reject()
 
-                    row += 1
+    def apply_filters(self):
+        search_text = self.search_input.text().strip().lower()
+        if not search_text:
+            self.document_model.set_visible_rows(None)
+            return
+        self.document_model.set_visible_rows(self.search_index.substring_rows(search_text))
 
     def select_all_subsections(self):
-        """Mark all checkboxes as checked."""
-        for _, _, _, checkbox in self.checkboxes:
-            checkbox.setChecked(True)
+        """Check every document."""
+        self.document_model.set_all_checked(True)
 
     def deselect_all_subsections(self):
-        """Mark all checkboxes as checked."""
-        for _, _, _, checkbox in self.checkboxes:
-            checkbox.setChecked(False)
+        """Uncheck every document."""
+        self.document_model.set_all_checked(False)
 
     @staticmethod
     def collect_sections(books_data):
@@ -195,29 +205,19 @@ class ChooseSections(QDialog):
         return sections
 
     def proceed(self):
-        selected_documents = {}
-        row = 0
-
-        for book_id, book_info in self.books_data.items():
-            book_name = book_info["book_name"]
-            documents = book_info["documents"]
-
-            selected_documents[book_id] = {
-                "book_name": book_name,
-                "documents": []
-            }
-            print(selected_documents)
-            for document in documents:
-                if self.checkboxes[row].isChecked():
-                    selected_documents[book_id]["documents"].append(document)  # Adding the full document object
-                row += 1
+        selected_documents = {
+            book_id: {"book_name": book_info["book_name"], "documents": []}
+            for book_id, book_info in self.books_data.items()
+        }
+        for document in self.document_model.checked_items():
+            selected_documents[document["book_id"]]["documents"].append(document)
 
         if not any(book["documents"] for book in selected_documents.values()):
             QMessageBox.warning(self, "No selections", "Please select at least one document.")
             return
 
         self.selected = selected_documents
-        project_window = ProjectWindow(self.project_id, selected_documents, self)
+        project_window = ProjectWindow(self.project_id, selected_documents, self, snapshot=self.snapshot)
         project_window.exec()
 
     def get_selected(self):
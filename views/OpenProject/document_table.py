@@ -0,0 +1,405 @@
+import weakref
+
+from PyQt6.QtWidgets import QTableView, QStyledItemDelegate, QLineEdit, QHeaderView, QAbstractItemView, QSizePolicy
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QMimeData, QByteArray
+
+from views.drag_and_drop import DocumentRowWidget
+
+BASE_HEADERS = ["Document", "Title", "State", "Owner", "Release Date"]
+BASE_KEYS = ["doc", "title", "state", "owner", "release_date"]
+ROW_HEIGHT = 40
+MAX_VISIBLE_ROWS = 15  # Longer subsections scroll inside their own table
+DOCUMENT_ROW_MIME = "application/x-documentrow"
+
+
+def column_width(header):
+    if header.lower() == "title":
+        return 350
+    if header.lower() in ("document", "doc", "name"):
+        return 200
+    return 150
+
+
+class DocumentTableModel(QAbstractTableModel):
+    """Documents of one subsection: five read-only columns followed by editable milestone columns."""
+
+    # Open models by id(), so a drop can find the table its rows were dragged from
+    models = weakref.WeakValueDictionary()
+
+    def __init__(self, documents, milestone_keys, parent=None):
+        super().__init__(parent)
+        DocumentTableModel.models[id(self)] = self
+        self.milestone_keys = list(milestone_keys)
+        self.documents = list(documents)
+        # Milestone values per row, taken from the first detail row that has the key
+        self.milestone_values = [self.extract_milestones(document) for document in self.documents]
+        # Edited cells not saved yet: (document_id, milestone): (saved value, new value, saved version)
+        self.changes = {}
+
+    def extract_milestones(self, document):
+        values = {}
+        details = document.get("details", [])
+        for milestone in self.milestone_keys:
+            for detail in details:
+                if milestone in detail:
+                    values[milestone] = detail[milestone]
+                    break
+        return values
+
+    # --- Qt model interface ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.documents)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(BASE_HEADERS) + len(self.milestone_keys)
+
+    def headers(self):
+        return BASE_HEADERS + self.milestone_keys
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.headers()[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            if column < len(BASE_KEYS):
+                value = self.documents[row].get(BASE_KEYS[column], "")
+                if BASE_KEYS[column] == "release_date":
+                    return DocumentRowWidget.format_release_date(value)
+                return "" if value is None else str(value)
+            value = self.milestone_values[row].get(self.milestone_keys[column - len(BASE_KEYS)])
+            return "" if value is None else str(value)
+
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.ItemIsDropEnabled  # Drops between rows
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsDragEnabled
+        if index.column() >= len(BASE_KEYS):
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.EditRole or not index.isValid() or index.column() < len(BASE_KEYS):
+            return False
+        key = self.milestone_keys[index.column() - len(BASE_KEYS)]
+        values = self.milestone_values[index.row()]
+        old = values.get(key)
+        if (old or "") == (value or ""):
+            return False  # Unchanged cells are neither marked dirty nor saved
+        values[key] = value
+
+        document = self.documents[index.row()]
+        document_id = document.get("document_id")
+        if document_id is not None:  # Rows imported from CSV are not in the database
+            version = document.get("milestone_versions", {}).get(key)
+            saved, _, version = self.changes.get((document_id, key), (old, None, version))
+            if (saved or "") == (value or ""):
+                del self.changes[(document_id, key)]  # Edited back to the saved value
+            else:
+                self.changes[(document_id, key)] = (saved, value, version)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+        return True
+
+    # --- Dirty tracking ---
+    def pending_changes(self):
+        """(document_id, milestone, value, version) for every cell edited since it was last saved.
+
+        version is the one the edit started from, for the compare-and-swap in save_milestone_values.
+        """
+        return [(document_id, key, value, version)
+                for (document_id, key), (_, value, version) in self.changes.items()]
+
+    def rows_of_document(self, document_id):
+        return [row for row, document in enumerate(self.documents) if document.get("document_id") == document_id]
+
+    def rows_by_document(self):
+        rows = {}
+        for row, document in enumerate(self.documents):
+            rows.setdefault(document.get("document_id"), []).append(row)
+        return rows
+
+    # --- Patching rows with changes saved elsewhere (see ProjectWindow.refresh) ---
+    def apply_remote_values(self, values):
+        """Take (document_id, milestone, value, version) cells newer than the ones shown.
+
+        Cells with an unsaved local edit are left alone; saving them reports the conflict.
+        """
+        rows = self.rows_by_document()
+        for document_id, key, value, version in values:
+            if (document_id, key) in self.changes:
+                continue
+            for row in rows.get(document_id, ()):
+                versions = self.documents[row].setdefault("milestone_versions", {})
+                if versions.get(key) is not None and versions[key] >= version:
+                    continue
+                versions[key] = version
+                if value is None:
+                    self.milestone_values[row].pop(key, None)
+                else:
+                    self.milestone_values[row][key] = value
+                if key in self.milestone_keys:
+                    index = self.index(row, len(BASE_KEYS) + self.milestone_keys.index(key))
+                    self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+
+    def update_documents(self, records):
+        """Take the fields of newer DocumentSnapshot versions into the rows of those documents."""
+        rows = self.rows_by_document()
+        for record in records:
+            for row in rows.get(record.id, ()):
+                document = self.documents[row]
+                if document.get("version", 0) >= record.version:
+                    continue
+                document.update({
+                    "version": record.version, "doc": record.name, "title": record.title,
+                    "cur_rev": record.revision, "description": record.description, "state": record.state,
+                    "owner": record.owner, "release_date": record.releasedate, "author": record.author,
+                    "approved_date": record.approveddate, "release_type": record.releasetype,
+                })
+                self.dataChanged.emit(self.index(row, 0), self.index(row, len(BASE_KEYS) - 1),
+                                      [Qt.ItemDataRole.DisplayRole])
+
+    def take_document(self, document_id):
+        """Remove the rows of a document; returns them as (document, milestone values) pairs and
+        the document's unsaved changes, for insert_document."""
+        rows = self.rows_of_document(document_id)
+        taken = [(self.documents[row], self.milestone_values[row]) for row in rows]
+        return taken, self.remove_rows(rows)
+
+    def insert_document(self, document, values=None, changes=None):
+        """Insert a document at its place by relation_order, with the values shown so far."""
+        order = document.get("relation_order", 0)
+        row = next((row for row, other in enumerate(self.documents)
+                    if other.get("relation_order", 0) > order), len(self.documents))
+        self.insert_rows(row, [(document, values if values is not None else self.extract_milestones(document))],
+                         changes)
+
+    def mark_saved(self, saved, versions):
+        """Forget the changes that were saved and note their new versions.
+
+        saved holds the changes handed to the save and versions its MilestoneSaveResult.versions;
+        cells edited again meanwhile stay dirty, based on the saved version.
+        """
+        for document_id, key, value, _ in saved:
+            if (document_id, key) not in versions:
+                continue  # Conflict, see resolve_conflict
+            version = versions[(document_id, key)]
+            for row in self.rows_of_document(document_id):
+                self.documents[row].setdefault("milestone_versions", {})[key] = version
+            change = self.changes.get((document_id, key))
+            if change is None:
+                continue
+            if change[1] == value:
+                del self.changes[(document_id, key)]
+            else:
+                self.changes[(document_id, key)] = (value, change[1], version)
+
+    def resolve_conflict(self, conflict, keep_mine):
+        """Settle a MilestoneConflict: keep the local value and save it over theirs, or take theirs."""
+        key = (conflict.document_id, conflict.milestone)
+        change = self.changes.get(key)
+        if change is None:
+            return
+        if keep_mine:
+            self.changes[key] = (conflict.their_value, change[1], conflict.their_version)
+            return
+        del self.changes[key]
+        column = len(BASE_KEYS) + self.milestone_keys.index(conflict.milestone) \
+            if conflict.milestone in self.milestone_keys else None
+        for row in self.rows_of_document(conflict.document_id):
+            self.documents[row].setdefault("milestone_versions", {})[conflict.milestone] = conflict.their_version
+            self.milestone_values[row][conflict.milestone] = conflict.their_value
+            if column is not None:
+                index = self.index(row, column)
+                self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+
+    # --- Drag and drop: reorder rows, or move them to another subsection's table ---
+    def supportedDropActions(self):
+        return Qt.DropAction.MoveAction
+
+    def mimeTypes(self):
+        return [DOCUMENT_ROW_MIME]
+
+    def mimeData(self, indexes):
+        rows = sorted({index.row() for index in indexes})
+        mime_data = QMimeData()
+        payload = f"{id(self)}:{','.join(map(str, rows))}"  # Source model, then its rows
+        mime_data.setData(DOCUMENT_ROW_MIME, QByteArray(payload.encode()))
+        return mime_data
+
+    def dropMimeData(self, data, action, row, column, parent):
+        if action != Qt.DropAction.MoveAction or not data.hasFormat(DOCUMENT_ROW_MIME):
+            return False
+        if row == -1:
+            row = parent.row() if parent.isValid() else self.rowCount()
+        source_id, _, rows = bytes(data.data(DOCUMENT_ROW_MIME)).decode().partition(":")
+        rows = [int(value) for value in rows.split(",") if value]
+        source = DocumentTableModel.models.get(int(source_id))
+        if source is None:
+            return False
+        if source is not self:
+            moved = [(source.documents[row], source.milestone_values[row]) for row in rows]
+            self.insert_rows(row, moved, source.remove_rows(rows))
+            return False  # Both tables are updated; stop the source view from removing rows
+        moving = [self.documents[source] for source in rows]
+
+        # Insert every moved row in front of the first row below the drop point that stays put
+        anchor = next((document for document in self.documents[row:]
+                       if not any(document is moved for moved in moving)), None)
+        for document in moving:
+            source = self.row_of(document)
+            target = self.row_of(anchor) if anchor is not None else self.rowCount()
+            self.move_row(source, target)
+        return False  # The move is already done; stop the view from removing the source rows
+
+    # --- Operations used by ProjectWindow ---
+    def row_of(self, document):
+        return next(row for row, candidate in enumerate(self.documents) if candidate is document)
+
+    def move_row(self, source, target):
+        """Move the row at source so it ends up in front of the row currently at target."""
+        if source == target or source + 1 == target:
+            return False
+        self.beginMoveRows(QModelIndex(), source, source, QModelIndex(), target)
+        document = self.documents.pop(source)
+        values = self.milestone_values.pop(source)
+        insert_at = target - 1 if target > source else target
+        self.documents.insert(insert_at, document)
+        self.milestone_values.insert(insert_at, values)
+        self.endMoveRows()
+        return True
+
+    def remove_rows(self, rows):
+        """Remove rows; returns the unsaved changes of documents left without a row, which are
+        no longer saved from this table."""
+        for row in sorted(set(rows), reverse=True):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.documents[row]
+            del self.milestone_values[row]
+            self.endRemoveRows()
+        shown = {document.get("document_id") for document in self.documents}
+        dropped = {key: change for key, change in self.changes.items() if key[0] not in shown}
+        for key in dropped:
+            del self.changes[key]
+        return dropped
+
+    def insert_rows(self, row, moved, changes=None):
+        """Insert (document, milestone values) pairs taken from another table in front of row,
+        with the unsaved changes remove_rows returned for them."""
+        if not moved:
+            return
+        self.changes.update(changes or {})
+        self.beginInsertRows(QModelIndex(), row, row + len(moved) - 1)
+        for offset, (document, values) in enumerate(moved):
+            self.documents.insert(row + offset, document)
+            self.milestone_values.insert(row + offset, values)
+        self.endInsertRows()
+
+    def append_documents(self, documents):
+        if not documents:
+            return
+        first = len(self.documents)
+        self.beginInsertRows(QModelIndex(), first, first + len(documents) - 1)
+        for document in documents:
+            self.documents.append(document)
+            self.milestone_values.append(self.extract_milestones(document))
+        self.endInsertRows()
+
+    def add_milestone_column(self, key):
+        if key in self.milestone_keys:
+            return False
+        column = self.columnCount()
+        self.beginInsertColumns(QModelIndex(), column, column)
+        self.milestone_keys.append(key)
+        self.endInsertColumns()
+        return True
+
+
+class MilestoneDelegate(QStyledItemDelegate):
+    """Line edit for milestone cells, created only while a cell is being edited."""
+
+    def createEditor(self, parent, option, index):
+        editor = QLineEdit(parent)
+        editor.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        editor.setStyleSheet("""
+            QLineEdit {
+                border: 1px solid #695e93;
+                background-color: white;
+                color: #333;
+                padding: 5px;
+                font-size: 14px;
+            }
+        """)
+        return editor
+
+
+class DocumentTableView(QTableView):
+    """Table of a subsection's documents; only the visible rows are painted."""
+
+    def __init__(self, model: DocumentTableModel, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.setItemDelegate(MilestoneDelegate(self))
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.DoubleClicked
+                             | QAbstractItemView.EditTrigger.SelectedClicked
+                             | QAbstractItemView.EditTrigger.EditKeyPressed
+                             | QAbstractItemView.EditTrigger.AnyKeyPressed)
+
+        # Drag rows to reorder them, or onto another subsection's table to move them there
+        self.setDragEnabled(True)
+        self.setAcceptDrops(True)
+        self.setDropIndicatorShown(True)
+        self.setDragDropMode(QAbstractItemView.DragDropMode.DragDrop)
+        self.setDefaultDropAction(Qt.DropAction.MoveAction)
+        self.setDragDropOverwriteMode(False)
+
+        self.verticalHeader().setVisible(False)
+        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.verticalHeader().setDefaultSectionSize(ROW_HEIGHT)
+        self.horizontalHeader().setFixedHeight(ROW_HEIGHT)
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Fixed)
+
+        self.setStyleSheet("""
+            QTableView {
+                gridline-color: #695e93;
+                font-size: 14px;
+                background: white;
+                color: #333333;
+            }
+            QHeaderView::section {
+                background-color: rgba(105, 94, 147, 0.9);
+                color: white;
+                font-weight: bold;
+                border-right: 1px solid white;
+                font-size: 14px;
+            }
+        """)
+
+        model.columnsInserted.connect(self.update_geometry)
+        model.rowsInserted.connect(self.update_geometry)
+        model.rowsRemoved.connect(self.update_geometry)
+        self.update_geometry()
+
+    def update_geometry(self, *args):
+        """Fixed column widths, and a height that fits the rows up to MAX_VISIBLE_ROWS."""
+        headers = self.model().headers()
+        for column, header in enumerate(headers):
+            self.setColumnWidth(column, column_width(header))
+        visible_rows = min(self.model().rowCount(), MAX_VISIBLE_ROWS)
+        frame = 2 * self.frameWidth()
+        self.setFixedHeight(ROW_HEIGHT * (visible_rows + 1) + frame)
+        self.setMinimumWidth(min(sum(column_width(header) for header in headers) + frame, 1600))
+
+    def selected_rows(self):
+        return sorted({index.row() for index in self.selectionModel().selectedIndexes()})
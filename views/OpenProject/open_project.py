@@ -1,16 +1,30 @@
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QComboBox, QPushButton
-from PyQt6.QtCore import Qt
-from database.db_methods import get_project_by_name, get_all_project_names
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QLineEdit, QListWidget, QListWidgetItem, QPushButton
+from PyQt6.QtCore import Qt, QTimer
+from database.db_methods import get_project_by_id, get_all_project_names
+from views.OpenProject.checkable_table import SearchIndex, FILTER_DELAY_MS
 from views.OpenProject.choose_books import ChooseBooks
+from database.instrumentation import query_scope
+from views.worker import run_in_background, cancel_task
+from views.prefetch import Prefetcher, prefetch_project
+from views.perf_hud import measured_init
+
+PROJECT_MATCH_LIMIT = 50  # Matches listed while typing; more text narrows them down
+
+
 class OpenProjectWindow(QDialog):
     """Dialog for opening an existing project."""
 
+    @measured_init
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Open Project")
         self.setFixedSize(600, 400)
         self.setObjectName("projectWindow")
         self.setModal(True)  #  Ensures the dialog stays on top
+        self.projects_task = None
+        self.details_task = None
+        self.selected_project_id = None
+        self.prefetcher = Prefetcher()  # Books and documents of the highlighted project, for ChooseBooks
 
         # Layout
         layout = QVBoxLayout()
@@ -18,20 +32,30 @@ class OpenProjectWindow(QDialog):
         # Label
         layout.addWidget(QLabel("🔍 Select a project to open."))
 
-        # Dropdown menu to select project
-        self.project_dropdown = QComboBox()
-        self.project_dropdown.setObjectName("searchBox")
-        self.project_dropdown.setPlaceholderText("Select a project...")
+        # Search box listing the projects whose name starts with the typed text
+        self.search_input = QLineEdit()
+        self.search_input.setObjectName("searchBox")
+        self.search_input.textChanged.connect(lambda: self.search_timer.start())
+        self.search_input.returnPressed.connect(self.select_first_match)
+        layout.addWidget(self.search_input)
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(FILTER_DELAY_MS)
+        self.search_timer.timeout.connect(self.show_matches)
+
+        # Each item carries its project ID (Qt.ItemDataRole.UserRole)
+        self.project_list = QListWidget()
+        layout.addWidget(self.project_list)
         self.load_projects()
-        layout.addWidget(self.project_dropdown)
 
         # Label to display project details
         self.project_details = QLabel("Project details will appear here")
         self.project_details.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.project_details)
 
-        # Connect dropdown selection to function
-        self.project_dropdown.currentIndexChanged.connect(self.display_project_details)
+        # Connect list selection to function
+        self.project_list.currentItemChanged.connect(self.display_project_details)
 
         #  Initially hidden "Open Project" button
         self.open_btn = QPushButton("Open Project")
@@ -55,32 +79,104 @@ class OpenProjectWindow(QDialog):
             print("Stylesheet not found! Running without styles.")
 
     def load_projects(self):
-        """Load all project names into the drop-down."""
-        self.project_map = get_all_project_names()  # Fetch dictionary {name: id}
-        if self.project_map:
-            self.project_dropdown.addItems(self.project_map.keys())  # Show only names
+        """Load all project names into the search index, off the GUI thread."""
+        self.project_map = {}
+        self.project_names = []
+        self.project_index = SearchIndex([])
+        self.search_input.setPlaceholderText("Loading projects...")
+        self.search_input.setEnabled(False)
+        self.projects_task = run_in_background(get_all_project_names, on_result=self.show_projects,
+                                               on_error=self.show_projects_error)
 
-        else:
-            self.project_dropdown.addItem("No projects available")
+    def show_projects(self, project_map):
+        self.projects_task = None
+        self.project_map = project_map  # Dictionary {name: id}
+        self.project_names = list(self.project_map)
+        self.project_index = SearchIndex(self.project_names)  # Sorted once; typing only bisects it
+        self.search_input.setPlaceholderText("Type a project name...")
+        self.search_input.setEnabled(True)
+        self.show_matches()
+        self.search_input.setFocus()
+
+    def show_projects_error(self, error):
+        self.projects_task = None
+        self.search_input.setPlaceholderText("Type a project name...")
+        self.search_input.setEnabled(True)
+        self.project_list.clear()
+        item = QListWidgetItem(f"Could not load the projects: {error}")
+        item.setFlags(Qt.ItemFlag.NoItemFlags)
+        self.project_list.addItem(item)
+
+    def show_matches(self):
+        """List the first PROJECT_MATCH_LIMIT projects starting with the search text, by name."""
+        self.search_timer.stop()
+        if not self.project_map:
+            self.project_list.clear()
+            item = QListWidgetItem("No projects available")
+            item.setFlags(Qt.ItemFlag.NoItemFlags)
+            self.project_list.addItem(item)
+            return
 
-    def display_project_details(self):
+        rows = self.project_index.prefix_rows(self.search_input.text(), limit=PROJECT_MATCH_LIMIT)
+        current = self.project_list.currentItem()
+        current_id = current.data(Qt.ItemDataRole.UserRole) if current is not None else None
+
+        self.project_list.blockSignals(True)  # Keep the selection if it is still listed
+        self.project_list.clear()
+        for row in rows:
+            name = self.project_names[row]
+            item = QListWidgetItem(name)
+            item.setData(Qt.ItemDataRole.UserRole, self.project_map[name])
+            self.project_list.addItem(item)
+            if self.project_map[name] == current_id:
+                self.project_list.setCurrentItem(item)
+        self.project_list.blockSignals(False)
+        if current_id is not None and self.project_list.currentItem() is None:
+            self.display_project_details(None)
+
+    def select_first_match(self):
+        """Enter in the search box picks the first match."""
+        self.show_matches()
+        if self.project_list.count() and self.project_list.item(0).flags() & Qt.ItemFlag.ItemIsEnabled:
+            self.project_list.setCurrentRow(0)
+
+    def display_project_details(self, item, previous=None):
         """Display selected project details."""
-        selected_project_name = self.project_dropdown.currentText()
-        if selected_project_name and selected_project_name != "No projects available":
-            project = get_project_by_name(selected_project_name)  # Fetch project details
-            if project:
-                self.project_details.setText(f" {project.name}\n {project.description}")
-                self.open_btn.setVisible(True)
-                self.selected_project_id = project.id  # Store project_id
-            else:
-                self.project_details.setText(" Project not found.")
-                self.open_btn.setVisible(False)
-                self.selected_project_id = None
+        project_id = item.data(Qt.ItemDataRole.UserRole) if item is not None else None
+        # A newer selection makes the pending lookup irrelevant
+        cancel_task(self.details_task)
+        self.details_task = None
+        if project_id is not None:
+            self.project_details.setText("Loading project details...")
+            self.open_btn.setVisible(False)
+            with query_scope(type(self).__name__):
+                self.details_task = run_in_background(get_project_by_id, project_id,
+                                                      on_result=self.show_project_details)
+                self.prefetcher.prefetch("project", prefetch_project, project_id)
         else:
+            self.prefetcher.cancel()
             self.project_details.setText("Project details will appear here")
             self.open_btn.setVisible(False)
             self.selected_project_id = None
 
+    def show_project_details(self, project):
+        self.details_task = None
+        if project:
+            self.project_details.setText(f" {project.name}\n {project.description}")
+            self.open_btn.setVisible(True)
+            self.selected_project_id = project.id  # Store project_id
+        else:
+            self.project_details.setText(" Project not found.")
+            self.open_btn.setVisible(False)
+            self.selected_project_id = None
+
+    def reject(self):
+        """Close: drop any lookups that are still running."""
+        cancel_task(self.projects_task)
+        cancel_task(self.details_task)
+        self.projects_task = self.details_task = None
+        self.prefetcher.cancel()
+        super().reject()
 
     def open_project_window(self):
         """Opens the project details as a dialog."""
@@ -1,23 +1,36 @@
 import csv
+import logging
 import os
 from PyQt6.QtGui import QCursor
 from PyQt6.QtGui import QIcon, QAction
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QTableWidgetItem, QSizePolicy, \
     QMenu, QScrollArea, QWidget, QInputDialog, QSpacerItem, QHBoxLayout, QSplitter, QFileDialog, QMessageBox
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6 import QtWidgets
-from database.db_methods import  get_project_details, get_document_details
+from database.db_methods import load_project_snapshot, add_milestone, save_milestone_values, get_project_changes
+from database.snapshot import selected_document_ids
+from sqlalchemy.orm.exc import StaleDataError
 from functools import partial
 from PyQt6.QtWidgets import QToolButton
-from views.drag_and_drop import DraggableFrame, DroppableContainer, DroppableDocumentContainer, DocumentRowWidget, \
-    HeaderRowWidget, \
-    HeaderRowWidget, DraggableSubsectionFrame
+from views.drag_and_drop import DraggableFrame, DroppableContainer
+from views.OpenProject.document_table import DocumentTableModel, DocumentTableView
+from views.worker import run_in_background, cancel_task, wait_for_task
+from views.perf_hud import measured_init, mark_loaded
+from views.profiling import profile_block
+
+AUTOSAVE_DELAY_MS = 2000  # Edits are saved together once typing pauses this long; 0 turns autosave off
+SAVE_ATTEMPTS = 3  # Saves on close retried when another save got in between
+MAX_LISTED_CONFLICTS = 15
+REFRESH_INTERVAL_MS = 60000  # How often other people's changes are fetched; 0 leaves it to Actions > Refresh
+
+logger = logging.getLogger("dms.ui")
 
 
 class ProjectWindow(QDialog):
     """Dialog displaying project details with product name, sections, and books/documents."""
 
-    def __init__(self, project_id, selected_documents, parent=None):
+    @measured_init
+    def __init__(self, project_id, selected_documents, parent=None, snapshot=None):
         super().__init__(parent)
         self.setWindowTitle("Project Details")
         self.resize(1000, 800)
@@ -26,11 +39,27 @@ class ProjectWindow(QDialog):
         self.removed_sections = set()
         self.removed_subsections = set()
 
-        self.columns_to_exclude = {"project_id", "relation_id", "document_id", "document_detail_id", "active"}
-
         self.base_headers = ["Document", "Title", "State", "Owner", "Release Date"]
 
         self.section_containers = {}  # Add this in __init__ if not already present
+        self.document_tables = []  # One DocumentTableView per subsection
+
+        # Edited milestone cells are collected and written in one batch (see save_changes)
+        self.save_task = None
+        self.saving = []  # Changes the running save is writing
+        self.milestone_tasks = set()  # Milestones added with Add Milestone that are being saved
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(AUTOSAVE_DELAY_MS)
+        self.save_timer.timeout.connect(self.save_changes)
+
+        # Changes saved elsewhere are fetched by updated_at and patched into the tables (see refresh)
+        self.subsection_tables = {}  # (section, subsection): DocumentTableView
+        self.changes_since = None
+        self.refresh_task = None
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
 
         # Create a scrollable main layout
         scroll_area = QScrollArea(self)
@@ -42,19 +71,42 @@ class ProjectWindow(QDialog):
 
         scroll_area.setWidget(scroll_content)  # scrollable content is now DroppableContainer itself
 
-        # Load project details
+        # Add scroll area to the main layout
+        layout = QVBoxLayout(self)
+        layout.addWidget(scroll_area)
+        self.main_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+
+        # Load project details; ChooseBooks usually hands over the snapshot it already loaded
+        self.project_id = project_id
         self.selected_documents = selected_documents
-        structured_data = get_project_details(project_id, self.selected_documents)
+        self.document_ids = selected_document_ids(self.selected_documents)
+        self.snapshot = None
+        self.load_task = None
+        if snapshot is None:
+            self.loading_label = QLabel("Loading project...")
+            self.loading_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.main_layout.addWidget(self.loading_label)
+            self.load_task = run_in_background(load_project_snapshot, project_id, document_ids=self.document_ids,
+                                               on_result=self.show_project, on_error=self.show_load_error)
+        else:
+            self.loading_label = None
+            self.show_project(snapshot)
+
+    def show_project(self, snapshot):
+        """Build the page from the ProjectSnapshot."""
+        self.load_task = None
+        if self.loading_label is not None:
+            self.loading_label.deleteLater()
+            self.loading_label = None
+        if snapshot is None:
+            QMessageBox.warning(self, "Error", f"Project {self.project_id} not found.")
+            return
+
+        self.snapshot = snapshot
+        structured_data = self.snapshot.project_details(self.document_ids)  # Details are already attached
         project_name = structured_data["project"]["project_name"]
         books_data = structured_data["books"]
 
-        # Fetch and attach document details
-        for book_id, book_data in books_data.items():
-            for document in book_data["documents"]:
-                document_id = document["document_id"]
-                document_details = get_document_details(project_id=project_id, book_id=book_id, document_id=document_id)
-                document["details"] = document_details  # Attach details to the document
-
         # Project Title
         self.project_label = QLabel(f"<h1>{project_name}</h1>")
         self.project_label.setStyleSheet("color: #4D4D4D; margin-left: 370px;")
@@ -66,15 +118,177 @@ class ProjectWindow(QDialog):
 
         # Display sections and documents
         self.display_sections(books_data)
-
-        # Apply the scrollable content to the scroll area
-        scroll_area.setWidget(scroll_content)
-
-
-        # Add scroll area to the main layout
-        layout = QVBoxLayout(self)
-        layout.addWidget(scroll_area)
-        self.main_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+        mark_loaded(self)
+        self.changes_since = snapshot.as_of
+        if REFRESH_INTERVAL_MS > 0:
+            self.refresh_timer.start()
+
+    def show_load_error(self, error):
+        self.load_task = None
+        self.loading_label.setText(f"Could not load the project: {error}")
+
+    def reject(self):
+        """Back/Exit: drop the load if it is still running and save edits that are not saved yet."""
+        cancel_task(self.load_task)
+        self.load_task = None
+        self.refresh_timer.stop()
+        cancel_task(self.refresh_task)
+        self.refresh_task = None
+        wait_for_task(self.save_task)  # Its cells are not saved yet; whatever failed is saved below
+        self.save_task = None
+        self.saving = []
+        self.save_timer.stop()
+        if not self.save_pending_changes():
+            return
+        super().reject()
+
+    def pending_changes(self):
+        """Edited milestone cells of every table that are not saved (or being saved) yet."""
+        saving = set(self.saving)
+        return [change for table in self.document_tables for change in table.model().pending_changes()
+                if change not in saving]
+
+    def schedule_save(self, *args):
+        """Restart the autosave timer, so a burst of edits ends up in one save."""
+        if AUTOSAVE_DELAY_MS > 0:
+            self.save_timer.start()
+
+    def save_changes(self):
+        """Write the edited milestone cells in the background, as one transaction."""
+        if self.save_task is not None:
+            self.save_timer.start()  # Saved once the running save is done
+            return
+        changes = self.pending_changes()
+        if not changes:
+            return
+        self.saving = changes
+        self.save_task = run_in_background(save_milestone_values, self.project_id, changes,
+                                           on_result=lambda result: self.save_finished(changes, result),
+                                           on_error=self.save_failed)
+
+    def save_pending_changes(self):
+        """Save what is left right away, e.g. on close; False if something could not be saved."""
+        for _ in range(SAVE_ATTEMPTS):
+            changes = self.pending_changes()
+            if not changes:
+                return True
+            try:
+                result = save_milestone_values(self.project_id, changes)
+            except StaleDataError:
+                continue  # Someone saved in between; the next attempt sees their versions
+            except Exception as error:
+                QMessageBox.warning(self, "Error", f"Could not save the changes: {error}")
+                return False
+            self.changes_saved(changes, result)
+        if not self.pending_changes():
+            return True  # The last attempt saved everything
+        QMessageBox.warning(self, "Error", "Could not save the changes: the project keeps changing.")
+        return False
+
+    def save_finished(self, changes, result):
+        self.save_task = None
+        self.saving = []
+        self.changes_saved(changes, result)
+
+    def save_failed(self, error):
+        self.save_task = None
+        self.saving = []
+        if isinstance(error, StaleDataError):
+            self.save_timer.start()  # Someone saved in between; saving again reports the conflicts
+            return
+        QMessageBox.warning(self, "Error", f"Could not save the changes: {error}")
+
+    def changes_saved(self, changes, result):
+        for table in self.document_tables:
+            table.model().mark_saved(changes, result.versions)
+        if result.conflicts:
+            keep_mine = self.ask_keep_mine(result.conflicts)
+            for table in self.document_tables:
+                for conflict in result.conflicts:
+                    table.model().resolve_conflict(conflict, keep_mine)
+            if keep_mine:
+                self.schedule_save()
+
+    def ask_keep_mine(self, conflicts):
+        """Ask whether to overwrite the cells someone else changed meanwhile (True) or take theirs."""
+        names = {document.get("document_id"): document.get("doc")
+                 for table in self.document_tables for document in table.model().documents}
+        lines = [f"{names.get(conflict.document_id, conflict.document_id)} {conflict.milestone}: "
+                 f"yours \"{conflict.value or ''}\", theirs \"{conflict.their_value or ''}\""
+                 for conflict in conflicts[:MAX_LISTED_CONFLICTS]]
+        if len(conflicts) > MAX_LISTED_CONFLICTS:
+            lines.append(f"... and {len(conflicts) - MAX_LISTED_CONFLICTS} more")
+        box = QMessageBox(QMessageBox.Icon.Question, "Milestones changed meanwhile",
+                          "Someone else saved these milestones while you were editing them:\n\n"
+                          + "\n".join(lines), parent=self)
+        keep_button = box.addButton("Keep mine", QMessageBox.ButtonRole.AcceptRole)
+        box.addButton("Take theirs", QMessageBox.ButtonRole.RejectRole)
+        box.exec()
+        return box.clickedButton() is keep_button
+
+    def refresh(self):
+        """Fetch the rows changed since the last load or refresh in the background."""
+        if self.snapshot is None or self.refresh_task is not None:
+            return
+        self.refresh_task = run_in_background(get_project_changes, self.project_id, self.changes_since,
+                                              on_result=self.apply_changes, on_error=self.refresh_failed)
+
+    def refresh_failed(self, error):
+        self.refresh_task = None
+        logger.warning("Refreshing project %s failed, the next poll tries again: %s", self.project_id, error)
+
+    def apply_changes(self, changes):
+        """Patch a ProjectChanges into the tables row by row; the section widgets stay as they are."""
+        self.refresh_task = None
+        self.changes_since = changes.as_of
+        selected = set(self.document_ids)
+        models = [table.model() for table in self.document_tables]
+
+        for name in changes.milestones:  # Milestones added by someone else
+            for model in models:
+                model.add_milestone_column(name)
+
+        documents = [record for record in changes.documents if record.id in selected]
+        if documents:
+            for model in models:
+                model.update_documents(documents)
+
+        for document_id, placements in changes.placements.items():
+            if document_id in selected:
+                self.place_document(document_id, placements)
+
+        values = [value for value in changes.milestone_values if value[0] in selected]
+        if values:
+            for model in models:
+                model.apply_remote_values(values)
+
+    def place_document(self, document_id, placements):
+        """Give a document one row per placement, in the table of its subsection at its relation_order.
+
+        Placements in subsections that are not shown are skipped; reopening the project picks them up.
+        """
+        targets = [(self.subsection_tables.get((placement.section, placement.subsection)), placement)
+                   for placement in placements]
+        targets = [(table, placement) for table, placement in targets if table is not None]
+        shown = sorted((id(table), table.model().documents[row].get("relation_order"))
+                       for table in self.document_tables for row in table.model().rows_of_document(document_id))
+        if shown == sorted((id(table), placement.relation_order) for table, placement in targets):
+            return  # Already where it belongs
+
+        taken, changes = [], {}
+        for table in self.document_tables:
+            rows, unsaved = table.model().take_document(document_id)
+            taken.extend(rows)
+            changes.update(unsaved)
+        if not taken:
+            return  # Not shown in this window
+        document, values = taken[0]
+        for table, placement in targets:
+            table.model().insert_document(
+                dict(document, section=placement.section, subsection=placement.subsection,
+                     relation_order=placement.relation_order),
+                dict(values), changes)
+            changes = None  # Saved from one table only
 
     def create_action_menu(self):
         self.action_menu = QToolButton(self)
@@ -109,6 +323,8 @@ class ProjectWindow(QDialog):
         menu.addAction("Open in Excel").triggered.connect(self.open_in_excel)
         menu.addAction("Open in MyWorkshop").triggered.connect(self.open_in_myworkshop)
         menu.addAction("Add New Section").triggered.connect(self.add_section)
+        menu.addAction("Save").triggered.connect(self.save_changes)
+        menu.addAction("Refresh").triggered.connect(self.refresh)
         menu.addAction("Exit").triggered.connect(self.reject)
 
         self.action_menu.setMenu(menu)
@@ -172,69 +388,15 @@ class ProjectWindow(QDialog):
                     )
                 )
 
-                # --- DOCUMENT CONTAINER ---
-                document_container = DroppableDocumentContainer()
-                document_container.layout.setSpacing(0)
-                document_container.layout.setContentsMargins(0, 0, 0, 0)
-
+                # --- DOCUMENT TABLE ---
+                document_table = self.create_document_table(documents, list(self.snapshot.milestones))
+                self.subsection_tables[(section_name, subsection_name)] = document_table
 
                 # --- ADD BUTTON ---
-                add_button = QToolButton()
-                add_button.setIcon(QIcon.fromTheme("list-add"))
-                add_button.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
-
-                menu = QMenu()
-
-                milestone_action = QAction("Add Milestone", self)
-                milestone_action.triggered.connect(partial(self.add_milestone, document_container))
-                menu.addAction(milestone_action)
-
-                document_action = QAction("Add Document(s)", self)
-                document_action.triggered.connect(partial(self.add_documents, document_container))
-                menu.addAction(document_action)
-                #add_button.clicked.connect(partial(self.add_milestone, document_container))
-                #add_button.setToolTip("Add milestone")
-                add_button.setStyleSheet("""
-                    QToolButton {
-                        margin-left: 10px;
-                        border-radius: 5px;
-                    }
-                    QToolButton::menu-indicator {
-                        image: none;  /* Убираем стрелку вниз */
-                    }
-                """)
-
-                add_button.setMenu(menu)
-                add_button.setToolTip("Add milestone or documents")
-
+                add_button = self.create_add_button(document_table)
                 subsection_layout.addWidget(add_button)
 
-
-                subsection_layout.addWidget(document_container)
-
-                # --- FIND ALL MILESTONE COLUMNS ---
-                all_milestone_columns = set()
-                for document in documents:
-                    for detail in document.get("details", []):
-                        all_milestone_columns.update(
-                            [col for col in detail.keys() if col not in self.columns_to_exclude]
-                        )
-                all_milestone_columns = list(all_milestone_columns)
-
-                # --- HEADER ROW ---
-                headers = ["Document", "Title", "State", "Owner", "Release Date"] + all_milestone_columns
-                header_widget = HeaderRowWidget(headers)
-                document_container.layout.addWidget(header_widget)
-
-                # --- DOCUMENT ROWS ---
-                for document in documents:
-                    doc_widget = DocumentRowWidget(document, all_milestone_columns)
-                    doc_widget.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
-                    doc_widget.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-                    doc_widget.customContextMenuRequested.connect(
-                        lambda pos, w=doc_widget: self.show_document_context_menu(pos, w)
-                    )
-                    document_container.layout .addWidget(doc_widget)
+                subsection_layout.addWidget(document_table)
 
                 subsection_container.layout.addWidget(subsection_frame)
 
@@ -307,23 +469,50 @@ class ProjectWindow(QDialog):
         )
         subsection_layout.addWidget(subsection_label)
 
-        # --- DOCUMENT CONTAINER ---
-        document_container = DroppableDocumentContainer()
-        document_container.layout.setSpacing(0)
-        document_container.layout.setContentsMargins(0, 0, 0, 0)
+        # --- DOCUMENT TABLE ---
+        document_table = self.create_document_table([], self.milestone_columns())
+        self.subsection_tables[(section_name, subsection_name)] = document_table
 
         # --- ADD BUTTON ---
+        add_button = self.create_add_button(document_table)
+        subsection_layout.addWidget(add_button)
+        subsection_layout.addWidget(document_table)
+
+        # Добавляем весь subsection в соответствующую секцию
+        if section_name in self.section_containers:
+            self.section_containers[section_name].layout.addWidget(subsection_frame)
+        else:
+            QMessageBox.warning(self, "Error", f"Section container for '{section_name}' not found.")
+
+    def milestone_columns(self):
+        """The milestone columns the tables show: the loaded ones plus those added since."""
+        if self.document_tables:
+            return list(self.document_tables[0].model().milestone_keys)
+        return list(self.snapshot.milestones) if self.snapshot is not None else []
+
+    def create_document_table(self, documents, milestone_columns):
+        """Model-backed table for a subsection's documents; rows are painted only when visible."""
+        model = DocumentTableModel(documents, milestone_columns, self)
+        model.dataChanged.connect(self.schedule_save)
+        document_table = DocumentTableView(model)
+        document_table.customContextMenuRequested.connect(
+            lambda pos, table=document_table: self.show_document_context_menu(pos, table)
+        )
+        self.document_tables.append(document_table)
+        return document_table
+
+    def create_add_button(self, document_table):
         add_button = QToolButton()
         add_button.setIcon(QIcon.fromTheme("list-add"))
         add_button.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
 
-        menu = QMenu()
+        menu = QMenu(add_button)
         milestone_action = QAction("Add Milestone", self)
-        milestone_action.triggered.connect(partial(self.add_milestone, document_container))
+        milestone_action.triggered.connect(partial(self.add_milestone, document_table))
         menu.addAction(milestone_action)
 
         document_action = QAction("Add Document(s)", self)
-        document_action.triggered.connect(partial(self.add_documents, document_container))
+        document_action.triggered.connect(partial(self.add_documents, document_table))
         menu.addAction(document_action)
 
         add_button.setMenu(menu)
@@ -334,83 +523,64 @@ class ProjectWindow(QDialog):
                 border-radius: 5px;
             }
             QToolButton::menu-indicator {
-                image: none;
+                image: none;  /* Убираем стрелку вниз */
             }
         """)
-        subsection_layout.addWidget(add_button)
-        subsection_layout.addWidget(document_container)
-
-        # --- HEADER ROW ---
-        headers = ["Document", "Title", "State", "Owner", "Release Date"]
-        header_widget = HeaderRowWidget(headers)
-        document_container.layout.addWidget(header_widget)
-
-        # Добавляем весь subsection в соответствующую секцию
-        if section_name in self.section_containers:
-            self.section_containers[section_name].layout.addWidget(subsection_frame)
-        else:
-            QMessageBox.warning(self, "Error", f"Section container for '{section_name}' not found.")
+        return add_button
 
-    def add_milestone(self, document_container: DroppableDocumentContainer):
+    def add_milestone(self, document_table: DocumentTableView):
         new_key, ok = QInputDialog.getText(self, "Add Milestone", "Enter milestone name:")
         if not ok or not new_key.strip():
             return
 
-        new_key = new_key.strip()
-
-        # 1. Добавим в заголовок
-        if isinstance(document_container.layout.itemAt(0).widget(), HeaderRowWidget):
-            header_widget: HeaderRowWidget = document_container.layout.itemAt(0).widget()
-            header_widget.add_column(new_key)
+        # Milestones belong to the project: one row in its dictionary, a column in every table
+        name = new_key.strip()
+        for table in self.document_tables:
+            table.model().add_milestone_column(name)
+        task = run_in_background(add_milestone, self.project_id, name,
+                                 on_result=lambda added: self.milestone_tasks.discard(task),
+                                 on_error=lambda error: self.milestone_added_failed(task, error))
+        self.milestone_tasks.add(task)
 
-        # 2. Добавим в каждую строку (DocumentRowWidget)
-        for i in range(1, document_container.layout.count()):
-            widget = document_container.layout.itemAt(i).widget()
-            if isinstance(widget, DocumentRowWidget):
-                widget.add_milestone_column(new_key)
+    def milestone_added_failed(self, task, error):
+        self.milestone_tasks.discard(task)
+        QMessageBox.warning(self, "Error", f"Could not save milestone: {error}")
 
-    def add_documents(self, document_container):
+    def add_documents(self, document_table: DocumentTableView):
         files, _ = QFileDialog.getOpenFileNames(self, "Select CSV Documents", "", "CSV files (*.csv)")
         if not files:
             return
 
-        milestone_columns = []
-        if document_container.layout.count() > 0:
-            header_widget = document_container.layout.itemAt(0).widget()
-            if isinstance(header_widget, HeaderRowWidget):
-                milestone_columns = header_widget.get_columns()
+        errors = []  # Reported after parsing, so the profile does not include the message boxes
+        with profile_block("ProjectWindow.add_documents"):
+            for file_path in files:
+                try:
+                    with open(file_path, "r") as file:
+                        reader = csv.reader(file)
+
+                        next(reader, None)  # Skip the header row
+
+                        documents = []
+                        for row in reader:
+                            if len(row) < 6 or all(not str(v).strip() for v in row):
+                                continue  # Too short or empty
+
+                            documents.append({
+                                "doc": row[0],
+                                "title": row[1] if len(row) > 2 else "",
+                                "owner": row[2] if len(row) > 3 else "",  # Assuming 'Owner' is the fourth column
+                                "state": row[3] if len(row) > 4 else "",  # Assuming 'State' is the fifth column
+                                "release_date": row[4] if len(row) > 5 else "",
+                                "details": []
+                            })
+                        document_table.model().append_documents(documents)
+
+                except Exception as e:
+                    errors.append(f"Could not read file: {file_path}, {e}")
+
+        for error in errors:
+            QMessageBox.warning(self, "Error", error)
 
-        for file_path in files:
-            print(file_path)  # Ensure file path is correctly printed
-            try:
-                with open(file_path, "r") as file:
-                    reader = csv.reader(file)
-
-                    headers = next(reader, None)  # Skip the header row
-                    print(f"Headers: {headers}")  # Debugging statement
-
-                    for row in reader:
-                        print(f"Row: {row}")  # Debugging statement
-                        if len(row) < 6 or all(not str(v).strip() for v in row):
-                            print("Skipping row too short or empty")
-                            continue
-
-                        print(f"row[0] {row[0]}")
-                        print(f"row[1] {row[1]}")
-                        document = {
-                            "doc": row[0],
-                            "title": row[1] if len(row) > 2 else "",
-                            "owner": row[2] if len(row) > 3 else "",  # Assuming 'Owner' is the fourth column
-                            "state": row[3] if len(row) > 4 else "",  # Assuming 'State' is the fifth column
-                            "release_date": row[4] if len(row) > 5 else "",
-                            "details": []
-                        }
-                        print(f"Document: {document}")  # Debugging statement
-                        doc_widget = DocumentRowWidget(document, milestone_columns)
-                        document_container.layout.addWidget(doc_widget)
-
-            except Exception as e:
-                QMessageBox.warning(self, "Error", f"Could not read file: {file_path}, {e}")
     def edit_label(self, event, label):
         """Edit a label when clicked."""
         current_text = label.text().strip()
@@ -485,11 +655,18 @@ class ProjectWindow(QDialog):
         global_pos = label_widget.mapToGlobal(pos)
         menu.exec(global_pos)
 
-    def show_document_context_menu(self, pos, doc_widget):
+    def show_document_context_menu(self, pos, document_table):
+        index = document_table.indexAt(pos)
+        if not index.isValid():
+            return
+        rows = document_table.selected_rows()
+        if index.row() not in rows:
+            rows = [index.row()]
+
         menu = QMenu(self)
         delete_action = QAction("Delete Document", self)
         delete_action.triggered.connect(
-            lambda: self.confirm_removal(lambda: self.remove_document(doc_widget))
+            lambda: self.confirm_removal(lambda: self.remove_documents(document_table, rows))
         )
         menu.addAction(delete_action)
         menu.exec(QCursor.pos())
@@ -511,18 +688,9 @@ class ProjectWindow(QDialog):
         widget.setParent(None)
         widget.deleteLater()
 
-    def remove_document(self, doc_widget):
-        parent = self.parentWidget()
-        while parent and not isinstance(parent.layout(), QVBoxLayout):
-            parent = parent.parentWidget()
-
-        if parent:
-            layout = parent.layout()
-            if layout:
-                layout.removeWidget(self)
-
-        doc_widget.setParent(None)
-        doc_widget.deleteLater()
+    @staticmethod
+    def remove_documents(document_table, rows):
+        document_table.model().remove_rows(rows)
 
     def confirm_removal(self, on_confirm:callable):
         reply = QMessageBox.question(
@@ -3,10 +3,12 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QCursor
 from views.OpenProject.open_project import OpenProjectWindow
 from views.CreateProject.create_project import CreateProjectWindow
+from views.perf_hud import measured_init
 
 class MainWindow(QMainWindow):
     """Main menu with 'Open Project' and 'Create Project' buttons and a theme toggle switch."""
 
+    @measured_init
     def __init__(self):
         super().__init__()
         self.setWindowTitle("FileNest - Main Menu")
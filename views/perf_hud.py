@@ -0,0 +1,117 @@
+import os
+import time
+from functools import wraps
+
+from PyQt6.QtWidgets import QLabel, QWidget
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QShortcut, QKeySequence
+
+from database.instrumentation import query_stats, query_scope
+from views.profiling import profile_block
+
+# DMS_HUD=1 shows the overlay on every window; otherwise Ctrl+Shift+F12 toggles it per window
+HUD_ENABLED = os.getenv("DMS_HUD", "").strip().lower() in ("1", "true", "yes", "on")
+HUD_SHORTCUT = "Ctrl+Shift+F12"
+HUD_REFRESH_MS = 1000
+
+
+class PerfHud(QLabel):
+    """Small overlay in the top-right corner of a window with its query and build statistics."""
+
+    def __init__(self, window, scope, baseline=None):
+        super().__init__(window)
+        self.host = window
+        self.scope = scope
+        # Totals of earlier windows of the same class, subtracted from what is shown
+        self.baseline = baseline or query_stats.summary(scope)
+        self.setObjectName("perfHud")
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setStyleSheet("""
+            QLabel#perfHud {
+                background-color: rgba(0, 0, 0, 0.7);
+                color: #7CFC00;
+                font-family: monospace;
+                font-size: 11px;
+                padding: 6px;
+                border-radius: 4px;
+            }
+        """)
+        self.timer = QTimer(self)
+        self.timer.setInterval(HUD_REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+        self.setVisible(False)
+
+    def stats(self):
+        summary = query_stats.summary(self.scope)
+        return {
+            "queries": summary["queries"] - self.baseline["queries"],
+            "db_ms": summary["total_ms"] - self.baseline["total_ms"],
+            "rows": summary["rows"] - self.baseline["rows"],
+            "widgets": len(self.host.findChildren(QWidget)),
+            "construct_ms": getattr(self.host, "construction_ms", None),
+            "loaded_ms": getattr(self.host, "loaded_ms", None),
+        }
+
+    def refresh(self):
+        stats = self.stats()
+        lines = [
+            self.scope,
+            f"queries  {stats['queries']:>8}",
+            f"db time  {stats['db_ms']:>8.1f} ms",
+            f"rows     {stats['rows']:>8}",
+            f"widgets  {stats['widgets']:>8}",
+        ]
+        if stats["construct_ms"] is not None:
+            lines.append(f"build    {stats['construct_ms']:>8.1f} ms")
+        if stats["loaded_ms"] is not None:
+            lines.append(f"loaded   {stats['loaded_ms']:>8.1f} ms")
+        self.setText("\n".join(lines))
+        self.adjustSize()
+        self.move(max(0, self.host.width() - self.width() - 8), 8)
+        self.raise_()
+
+    def toggle(self):
+        self.set_active(not self.isVisible())
+
+    def set_active(self, active):
+        self.setVisible(active)
+        if active:
+            self.refresh()
+            self.timer.start()
+        else:
+            self.timer.stop()
+
+
+def attach_hud(window, scope=None, baseline=None):
+    """Give a window its (hidden) overlay and the shortcut that toggles it."""
+    window.perf_hud = PerfHud(window, scope or type(window).__name__, baseline)
+    shortcut = QShortcut(QKeySequence(HUD_SHORTCUT), window)
+    shortcut.activated.connect(window.perf_hud.toggle)
+    if HUD_ENABLED:
+        window.perf_hud.set_active(True)
+    return window.perf_hud
+
+
+def measured_init(init):
+    """Decorator for window constructors: time them, attribute their queries and attach the HUD.
+
+    With DMS_PROFILE set the constructor is profiled as well (see views/profiling.py).
+    """
+    @wraps(init)
+    def wrapper(self, *args, **kwargs):
+        scope = type(self).__name__
+        baseline = query_stats.summary(scope)
+        started = time.perf_counter()
+        self.construction_started = started
+        with query_scope(scope), profile_block(f"{scope}.__init__"):
+            init(self, *args, **kwargs)
+        self.construction_ms = (time.perf_counter() - started) * 1000
+        attach_hud(self, scope, baseline)
+    return wrapper
+
+
+def mark_loaded(window):
+    """Note when a window that loads in the background has been filled in."""
+    started = getattr(window, "construction_started", None)
+    if started is not None:
+        window.loaded_ms = (time.perf_counter() - started) * 1000
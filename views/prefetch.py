@@ -0,0 +1,77 @@
+import logging
+
+from database.db_methods import get_project_books, get_documents_by_books
+from views.worker import run_in_background, cancel_task
+
+logger = logging.getLogger("dms.ui")
+
+PREFETCH_DELAY_MS = 300  # Selection has to settle this long before a prefetch starts
+
+
+def prefetch_project(project_id):
+    """Load the books and document lists of a project into the project cache."""
+    project, books = get_project_books(project_id)
+    if project is not None:
+        get_documents_by_books([book.id for book in books])
+
+
+class Prefetcher:
+    """Runs db_methods calls in the background before a dialog needs their results.
+
+    Each name holds one call: starting a different call under the same name cancels the pending
+    one, because the selection it was made for has changed. The last result per name is kept
+    until the next call, so what is held stays bounded by the number of names.
+    """
+
+    def __init__(self):
+        self.tasks = {}  # name: (call, task)
+        self.results = {}  # name: (call, result)
+        self.waiting = {}  # name: [on_result callbacks of join()]
+
+    def prefetch(self, name, func, *args, **kwargs):
+        """Start func(*args, **kwargs) under name unless that same call is pending or done."""
+        call = (func, args, kwargs)
+        if name in self.tasks and self.tasks[name][0] == call:
+            return
+        if name in self.results and self.results[name][0] == call:
+            return
+        self.cancel(name)
+        task = run_in_background(func, *args, on_result=lambda result: self.finished(name, call, result),
+                                 on_error=lambda error: self.failed(name, call, error), **kwargs)
+        self.tasks[name] = (call, task)
+
+    def finished(self, name, call, result):
+        self.tasks.pop(name, None)
+        self.results[name] = (call, result)
+        for on_result in self.waiting.pop(name, []):
+            on_result(result)
+
+    def failed(self, name, call, error):
+        self.tasks.pop(name, None)
+        logger.warning("Prefetch %s failed, the dialog loads it itself: %s", name, error)
+        for on_result in self.waiting.pop(name, []):
+            on_result(None)  # Callers fall back to loading the data themselves
+
+    def join(self, name, func, *args, on_result, **kwargs):
+        """Hand the result of a prefetched call to on_result; False if the call was not prefetched.
+
+        on_result runs at once if the result is in, or when the pending call finishes.
+        """
+        call = (func, args, kwargs)
+        if name in self.results and self.results[name][0] == call:
+            on_result(self.results[name][1])
+            return True
+        if name in self.tasks and self.tasks[name][0] == call:
+            self.waiting.setdefault(name, []).append(on_result)
+            return True
+        return False
+
+    def cancel(self, name=None):
+        """Cancel the pending call of name, or of every name, and forget the results."""
+        names = list(self.tasks.keys() | self.results.keys()) if name is None else [name]
+        for name in names:
+            call_task = self.tasks.pop(name, None)
+            if call_task is not None:
+                cancel_task(call_task[1])
+            self.results.pop(name, None)
+            self.waiting.pop(name, None)
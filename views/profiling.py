@@ -0,0 +1,70 @@
+import cProfile
+import os
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+# DMS_PROFILE=cpu,mem turns the hooks on: "cpu" writes cProfile .prof files (open them with
+# snakeviz or pstats), "mem" writes the top tracemalloc allocations. Output goes to DMS_PROFILE_DIR.
+PROFILE_MODES = {mode.strip().lower() for mode in os.getenv("DMS_PROFILE", "").split(",") if mode.strip()}
+PROFILES_DIR = os.getenv("DMS_PROFILE_DIR",
+                         os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "profiles"))
+TOP_ALLOCATIONS = 30
+
+_active = threading.local()  # cProfile cannot run two profilers at once, so nested blocks are skipped
+
+
+def profile_path(name, suffix):
+    os.makedirs(PROFILES_DIR, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    return os.path.join(PROFILES_DIR, f"{timestamp}_{name}{suffix}")
+
+
+def write_allocations(snapshot, peak, path, name):
+    statistics = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ]).statistics("lineno")
+    with open(path, "w") as file:
+        file.write(f"{name}: peak {peak / 1024:.1f} KiB, "
+                   f"{sum(stat.size for stat in statistics) / 1024:.1f} KiB still allocated\n\n")
+        for stat in statistics[:TOP_ALLOCATIONS]:
+            file.write(f"{stat.size / 1024:>10.1f} KiB {stat.count:>8} blocks  {stat.traceback}\n")
+
+
+@contextmanager
+def profile_block(name):
+    """Profile the block when DMS_PROFILE is set; does nothing otherwise.
+
+    Only the calling thread is profiled: queries the block hands to views.worker tasks run on the
+    thread pool and are not in the profile; their timings are in the query stats
+    (database/instrumentation.py) instead.
+    """
+    if not PROFILE_MODES or getattr(_active, "name", None):
+        yield
+        return
+
+    _active.name = name
+    profiler = cProfile.Profile() if "cpu" in PROFILE_MODES else None
+    started_tracing = "mem" in PROFILE_MODES and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if "mem" in PROFILE_MODES:
+        tracemalloc.reset_peak()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile_path(name, ".prof"))
+        if "mem" in PROFILE_MODES:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+            write_allocations(snapshot, peak, profile_path(name, ".mem.txt"), name)
+        _active.name = None
+
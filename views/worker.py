@@ -0,0 +1,92 @@
+import logging
+import threading
+
+from PyQt6.QtCore import QCoreApplication, QObject, QRunnable, QThreadPool, pyqtSignal
+
+from database.instrumentation import current_scope, query_scope
+
+logger = logging.getLogger("dms.ui")
+
+
+class TaskSignals(QObject):
+    """Signals of a BackgroundTask; they are delivered on the GUI thread."""
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(object)
+
+
+class BackgroundTask(QRunnable):
+    """Runs a db_methods call on the global thread pool.
+
+    A running SQL query cannot be interrupted, so cancel() takes the task off the queue if it has
+    not started yet and otherwise makes sure its result is dropped instead of delivered.
+    """
+
+    def __init__(self, func, *args, **kwargs):
+        super().__init__()
+        self.setAutoDelete(False)  # The owning dialog keeps the reference
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = TaskSignals()
+        self.cancelled = False
+        self.done = threading.Event()
+        self.scope = current_scope()  # Queries count towards the dialog that started the task
+
+    def run(self):
+        try:
+            if self.cancelled:
+                return
+            try:
+                with query_scope(self.scope):
+                    result = self.func(*self.args, **self.kwargs)
+            except Exception as error:
+                if not self.cancelled:
+                    self.signals.failed.emit(error)
+                return
+            if not self.cancelled:
+                self.signals.finished.emit(result)
+        finally:
+            self.done.set()
+
+    def cancel(self):
+        self.cancelled = True
+        QThreadPool.globalInstance().tryTake(self)
+
+
+def run_in_background(func, *args, on_result, on_error=None, **kwargs):
+    """Start func(*args, **kwargs) off the GUI thread and call on_result with its return value.
+
+    The callbacks run on the GUI thread and are skipped once the returned task is cancelled,
+    even if the result was already queued for delivery.
+    """
+    task = BackgroundTask(func, *args, **kwargs)
+    task.signals.finished.connect(lambda result: None if task.cancelled else on_result(result))
+    if on_error is not None:
+        task.signals.failed.connect(lambda error: None if task.cancelled else on_error(error))
+    else:
+        task.signals.failed.connect(lambda error: logger.error("Background task %s failed: %s",
+                                                               getattr(func, "__name__", func), error))
+    QThreadPool.globalInstance().start(task)
+    return task
+
+
+def cancel_task(task):
+    """Cancel a task returned by run_in_background; None and finished tasks are ignored."""
+    if task is not None:
+        task.cancel()
+
+
+def wait_for_task(task):
+    """Block until a task returned by run_in_background has run and deliver its result.
+
+    Cancelled tasks are not waited for, they may never run.
+    """
+    if task is not None and not task.cancelled:
+        task.done.wait()
+        QCoreApplication.processEvents()
+
+
+def wait_for_background_tasks():
+    """Block until the pool is idle and deliver the queued results (used by tests and benchmarks)."""
+    QThreadPool.globalInstance().waitForDone()
+    QCoreApplication.processEvents()